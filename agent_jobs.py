@@ -0,0 +1,224 @@
+import subprocess
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+TIMED_OUT = "timeout"
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED, TIMED_OUT)
+
+
+class JobQueueFull(Exception):
+    """Raised when the job queue already holds ``max_pending`` queued jobs."""
+
+
+class Job:
+    """One agent run: its command, lifecycle timestamps, exit code and log file."""
+
+    def __init__(self, key: str, command: Sequence[str], cwd: Optional[str], log_dir: Path):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.command = list(command)
+        self.cwd = cwd
+        self.log_path = Path(log_dir) / f"{self.id}.log"
+        self.status = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.exit_code: Optional[int] = None
+        self.error: Optional[str] = None
+        self.cancel_requested = False
+        self._process: Optional[subprocess.Popen] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "key": self.key,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration": self.duration,
+            "exit_code": self.exit_code,
+            "error": self.error
+        }
+
+
+class JobManager:
+    """
+    Runs agent commands on a bounded worker pool without blocking request threads.
+
+    Submitting returns immediately. Jobs that share a key (the target repository)
+    are single-flight: while one is queued or running, submitting the same key
+    returns the existing job instead of starting a second agent. Each job's combined
+    stdout/stderr is written to its own log file and, optionally, mirrored into a
+    shared log so the dashboard tail keeps showing agent output.
+
+    Args:
+        log_dir (Path): Directory for per-job log files.
+        max_workers (int): Jobs that may run at the same time.
+        max_pending (int): Queued jobs allowed before submit() raises JobQueueFull.
+        timeout (float): Seconds before a running job is killed.
+        history (int): Finished jobs kept for status lookups.
+        mirror_log (Optional[Path]): Shared log that also receives job output.
+    """
+
+    def __init__(self, log_dir: Path, max_workers: int = 1, max_pending: int = 10, timeout: float = 300.0,
+                 history: int = 100, mirror_log: Optional[Path] = None):
+        self.log_dir = Path(log_dir)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.history = history
+        self.mirror_log = mirror_log
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent-job")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: Dict[str, Job] = {}
+
+    def submit(self, key: str, command: Sequence[str], cwd: Optional[str] = None) -> Tuple[Job, bool]:
+        """
+        Queue a job unless one with the same key is already queued or running.
+
+        Returns:
+            Tuple[Job, bool]: The job and whether it was newly created.
+
+        Raises:
+            JobQueueFull: If ``max_pending`` jobs are already waiting.
+        """
+        with self._lock:
+            existing = self._active.get(key)
+            if existing is not None:
+                return existing, False
+            pending = sum(1 for job in self._active.values() if job.status == QUEUED)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} agent runs already queued")
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            job = Job(key, command, cwd, self.log_dir)
+            self._active[key] = job
+            self._jobs[job.id] = job
+            self._trim_history()
+        self._executor.submit(self._run, job)
+        return job, True
+
+    def _trim_history(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.history, 0)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[Job]:
+        with self._lock:
+            return list(reversed(self._jobs.values()))
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued job or terminate a running one. Returns False if already finished."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return False
+            job.cancel_requested = True
+            process = job._process
+        if process is not None:
+            process.terminate()
+        return True
+
+    def read_log(self, job_id: str, max_bytes: int = 64 * 1024) -> Optional[str]:
+        """Return the last ``max_bytes`` of a job's log, or None for an unknown job."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        try:
+            with open(job.log_path, "rb") as f:
+                f.seek(0, 2)
+                size = f.tell()
+                f.seek(max(size - max_bytes, 0))
+                return f.read().decode("utf-8", errors="replace")
+        except OSError:
+            return ""
+
+    def _finish(self, job: Job, status: str, exit_code: Optional[int] = None, error: Optional[str] = None):
+        with self._lock:
+            job.status = status
+            job.exit_code = exit_code
+            job.error = error
+            job.finished_at = time.time()
+            job._process = None
+            if self._active.get(job.key) is job:
+                del self._active[job.key]
+
+    def _run(self, job: Job):
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        timed_out = threading.Event()
+        try:
+            with open(job.log_path, "w", encoding="utf-8") as job_log:
+                mirror = open(self.mirror_log, "a", encoding="utf-8") if self.mirror_log else None
+                try:
+                    with self._lock:
+                        job.status = RUNNING
+                        job.started_at = time.time()
+                        job._process = subprocess.Popen(
+                            job.command, cwd=job.cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, encoding="utf-8", errors="replace"
+                        )
+                    process = job._process
+                    if job.cancel_requested:
+                        process.terminate()
+
+                    def kill():
+                        timed_out.set()
+                        process.kill()
+
+                    timer = threading.Timer(self.timeout, kill)
+                    timer.daemon = True
+                    timer.start()
+                    try:
+                        for line in process.stdout:
+                            job_log.write(line)
+                            job_log.flush()
+                            if mirror:
+                                mirror.write(line)
+                                mirror.flush()
+                        exit_code = process.wait()
+                    finally:
+                        timer.cancel()
+                finally:
+                    if mirror:
+                        mirror.close()
+        except Exception as e:
+            self._finish(job, FAILED, error=str(e))
+            return
+
+        if timed_out.is_set():
+            self._finish(job, TIMED_OUT, exit_code, error=f"Timed out after {self.timeout:.0f}s")
+        elif job.cancel_requested:
+            self._finish(job, CANCELLED, exit_code)
+        else:
+            self._finish(job, SUCCEEDED if exit_code == 0 else FAILED, exit_code)
+
+    def shutdown(self, cancel_running: bool = True):
+        if cancel_running:
+            for job in self.list():
+                self.cancel(job.id)
+        self._executor.shutdown(wait=True)
@@ -1,20 +1,128 @@
+import json
+import math
 import os
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Response, request, jsonify, stream_with_context
 from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from logging_utils import setup_logger
-import openai
-import re
-from textblob import TextBlob
+from log_stream import format_event
+from batch_processing import BatchError, batch_response, parse_documents, run_batch
+from conversation_store import ConversationStore
+from llm_client import LLMClient, Overloaded
+import metrics
+from response_cache import MemoryCache, ResponseCache, SQLiteCache, make_key
+import sentiment_service
+import text_stats
 
-app = Flask(__name__)
+bp = Blueprint("api", __name__)
 LOG_PATH = Path(os.getenv("TARGET_REPO_PATH", os.getcwd())) / "autonomous_agent.log"
 logger = setup_logger("api_server", str(LOG_PATH), level=os.getenv("API_LOG_LEVEL", "INFO"))
+sentiment_service.preload()
+ANALYZE_SENTIMENT_THRESHOLD = 0.2
+
+CONTENT_MODEL_PARAMS = {"model": "gpt-3.5-turbo", "max_tokens": 256, "temperature": 0.7}
+CHAT_MODEL_PARAMS = {"model": "gpt-3.5-turbo", "max_tokens": 256, "temperature": 0.7}
+CONTENT_CACHE = ResponseCache(
+    MemoryCache(
+        max_entries=int(os.getenv("CONTENT_CACHE_SIZE", "512")),
+        ttl=float(os.getenv("CONTENT_CACHE_TTL", "3600"))
+    ),
+    disk=SQLiteCache(os.getenv("CONTENT_CACHE_DB"), ttl=float(os.getenv("CONTENT_CACHE_DISK_TTL", "86400")))
+    if os.getenv("CONTENT_CACHE_DB") else None
+)
+
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "1500"))
+CONVERSATIONS = ConversationStore(
+    max_sessions=int(os.getenv("CHAT_MAX_SESSIONS", "1000")),
+    idle_ttl=float(os.getenv("CHAT_SESSION_TTL", "1800"))
+)
+LLM_CLIENT = LLMClient.from_env()
+
+metrics.instrument(bp)
+metrics.REGISTRY.callback(
+    "content_cache_lookups_total", "Content cache lookups by outcome.", "counter",
+    lambda: {(outcome,): CONTENT_CACHE.stats()[outcome] for outcome in ("hits", "misses", "coalesced", "errors")},
+    ("outcome",)
+)
+metrics.REGISTRY.callback(
+    "content_cache_entries", "Entries held by each content cache level.", "gauge",
+    lambda: {("memory",): CONTENT_CACHE.stats()["memory_entries"], ("disk",): CONTENT_CACHE.stats()["disk_entries"]},
+    ("level",)
+)
+metrics.REGISTRY.callback(
+    "llm_client_state", "LLM client in-flight and queued calls, and cumulative rejections and retries.", "gauge",
+    lambda: {(name,): value for name, value in LLM_CLIENT.stats().items()},
+    ("state",)
+)
+
+def complete_prompt(prompt: str, **params) -> str:
+    """Send a single-message chat completion upstream and return the stripped text."""
+    return LLM_CLIENT.complete(prompt, **params)
+
+def stream_prompt(prompt: str, **params) -> Iterator[str]:
+    """Open a streaming single-message chat completion; returns an iterator of text deltas."""
+    return LLM_CLIENT.stream(prompt, **params)
+
+def complete_messages(messages: List[Dict[str, str]], **params) -> str:
+    """Send a multi-turn chat completion upstream and return the stripped text."""
+    return LLM_CLIENT.chat(messages, **params)
+
+def stream_messages(messages: List[Dict[str, str]], **params) -> Iterator[str]:
+    """Open a streaming multi-turn chat completion; returns an iterator of text deltas."""
+    return LLM_CLIENT.stream_chat(messages, **params)
+
+def upstream_error_response(e: Exception):
+    """Map an upstream failure to a JSON error; a full LLM client queue becomes 429 with Retry-After."""
+    if isinstance(e, Overloaded):
+        logger.warning("Shedding request: %s", e)
+        return jsonify({"error": "Server busy, please retry."}), 429, {"Retry-After": str(math.ceil(e.retry_after))}
+    logger.error("OpenAI error: %s", e)
+    return jsonify({"error": str(e)}), 500
 
-@app.route("/api/generate-content", methods=["POST"])
+def wants_stream(data: dict) -> bool:
+    """True if the client asked for SSE via {"stream": true} or an Accept: text/event-stream header."""
+    return bool(data.get("stream")) or "text/event-stream" in request.headers.get("Accept", "")
+
+def sse_response(tokens: Iterator[str], result_key: str, on_complete: Optional[Callable[[str], None]] = None,
+                 extra: Optional[Dict[str, Any]] = None):
+    """
+    Relay tokens to the client as server-sent events.
+
+    Emits one "token" event per upstream delta, then a "done" event whose payload has the
+    same shape as the non-streaming JSON response, or an "error" event if upstream fails.
+
+    Args:
+        tokens (Iterator[str]): Text deltas; consumed lazily so the first one is sent as soon as it arrives.
+        result_key (str): Key of the full text in the "done" payload ("response" or "result").
+        on_complete (Optional[Callable]): Called with the full text after a successful stream.
+        extra (Optional[Dict]): Additional fields for the "done" payload.
+    """
+    def generate():
+        parts = []
+        try:
+            for token in tokens:
+                parts.append(token)
+                yield format_event(json.dumps({"token": token}), event="token")
+            result = "".join(parts).strip()
+            if on_complete is not None:
+                on_complete(result)
+            yield format_event(json.dumps({result_key: result, **(extra or {})}), event="done")
+        except Exception as e:
+            logger.error("OpenAI streaming error: %s", e)
+            yield format_event(json.dumps({"error": str(e)}), event="error")
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@bp.route("/api/generate-content", methods=["POST"])
 def generate_content():
     """
     Generate creative content (headline, paragraph, ideas, summary) using OpenAI API.
-    Expects JSON: { "type": "headline"|"paragraph"|"ideas"|"summary", "topic": "..." }
+    Expects JSON: { "type": "headline"|"paragraph"|"ideas"|"summary", "topic": "...", "stream": false }
+    With "stream": true (or Accept: text/event-stream) the result is sent as SSE token events.
     """
     data = request.get_json()
     if not data or "type" not in data or "topic" not in data:
@@ -33,50 +141,100 @@ def generate_content():
     if not prompt:
         return jsonify({"error": "Invalid content type."}), 400
 
+    key = make_key(prompt, **CONTENT_MODEL_PARAMS)
+    if wants_stream(data):
+        cached = CONTENT_CACHE.lookup(key)
+        if cached is not None:
+            return sse_response(iter([cached]), "result")
+        try:
+            tokens = stream_prompt(prompt, **CONTENT_MODEL_PARAMS)
+        except Exception as e:
+            return upstream_error_response(e)
+        return sse_response(tokens, "result", on_complete=lambda result: CONTENT_CACHE.set(key, result))
+
     try:
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
-            raise ValueError("OpenAI API key not set.")
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=256,
-            temperature=0.7,
+        # Identical (type, topic) requests share one upstream call and its cached answer.
+        result = CONTENT_CACHE.get_or_compute(
+            key,
+            lambda: complete_prompt(prompt, **CONTENT_MODEL_PARAMS)
         )
-        result = response.choices[0].message.content.strip()
-        logger.info(f"Generated content for type={content_type}, topic={topic}")
+        logger.info("Generated content for type=%s, topic=%s", content_type, topic)
         return jsonify({"result": result})
     except Exception as e:
-        logger.error(f"OpenAI error: {e}")
-        return jsonify({"error": str(e)}), 500
+        return upstream_error_response(e)
 
-@app.route("/api/chat", methods=["POST"])
+@bp.route("/api/cache-stats", methods=["GET"])
+def cache_stats():
+    """
+    Content generation cache counters.
+    Returns: { "hits", "misses", "coalesced", "errors", "hit_ratio", "memory_entries", "disk_entries" }
+    """
+    return jsonify(CONTENT_CACHE.stats())
+
+@bp.route("/api/chat", methods=["POST"])
 def chat():
     """
-    AI chat endpoint. Expects JSON: { "message": "..." }
-    Returns: { "response": "..." }
+    AI chat endpoint. Expects JSON: { "message": "...", "conversation_id": "...", "stream": false }
+    Omit conversation_id to start a new conversation; earlier turns of a known one are sent
+    upstream as context, trimmed to CHAT_CONTEXT_TOKENS with older turns summarized.
+    Returns: { "response": "...", "conversation_id": "..." }, or SSE token events when streaming is requested.
     """
     data = request.get_json()
     if not data or "message" not in data:
         return jsonify({"error": "Missing message."}), 400
+    conversation_id = data.get("conversation_id")
+    if conversation_id is not None and (not isinstance(conversation_id, str) or len(conversation_id) > 64):
+        return jsonify({"error": "Invalid conversation_id."}), 400
     user_message = data["message"]
+    conversation, _ = CONVERSATIONS.get_or_create(conversation_id)
+    messages = conversation.build_messages(user_message, budget=CHAT_CONTEXT_TOKENS)
     try:
-        openai.api_key = os.getenv("OPENAI_API_KEY")
-        if not openai.api_key:
-            raise ValueError("OpenAI API key not set")
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": user_message}],
-            max_tokens=256,
-            temperature=0.7,
-        )
-        ai_response = response.choices[0].message.content.strip()
-        return jsonify({"response": ai_response})
+        if wants_stream(data):
+            return sse_response(
+                stream_messages(messages, **CHAT_MODEL_PARAMS), "response",
+                on_complete=lambda reply: conversation.record_exchange(user_message, reply),
+                extra={"conversation_id": conversation.id}
+            )
+        ai_response = complete_messages(messages, **CHAT_MODEL_PARAMS)
+        conversation.record_exchange(user_message, ai_response)
+        return jsonify({"response": ai_response, "conversation_id": conversation.id})
     except Exception as e:
-        logger.error(f"OpenAI error: {e}")
-        return jsonify({"error": str(e)}), 500
+        return upstream_error_response(e)
+
+@bp.route("/api/conversations/<conversation_id>", methods=["DELETE"])
+def delete_conversation(conversation_id):
+    """Forget a conversation's history."""
+    if not CONVERSATIONS.delete(conversation_id):
+        return jsonify({"error": "Conversation not found."}), 404
+    return jsonify({"deleted": conversation_id})
+
+def _text_statistics(stats: Dict[str, Any], polarity: float) -> dict:
+    return {
+        "word_count": stats["word_count"],
+        "char_count": stats["char_count"],
+        "para_count": stats["para_count"],
+        "read_time": stats["read_time"],
+        "sentiment": sentiment_service.label(polarity, ANALYZE_SENTIMENT_THRESHOLD).capitalize(),
+        "complexity": stats["complexity"]
+    }
+
+def text_statistics(text: str) -> dict:
+    """Word/character/paragraph counts, reading time, sentiment label and complexity for one text."""
+    polarity, _ = sentiment_service.get_engine().scores(text)
+    return _text_statistics(text_stats.analyze(text), polarity)
 
-@app.route("/api/analyze-text", methods=["POST"])
+def text_statistics_many(texts: List[str]) -> List[dict]:
+    """
+    text_statistics for a batch: the counts run on the process pool, the sentiment
+    through the shared engine's memo in this process.
+    """
+    scores = sentiment_service.get_engine().score_many(texts)
+    return [
+        stats if "error" in stats else _text_statistics(stats, polarity)
+        for stats, (polarity, _) in zip(run_batch(text_stats.analyze, texts), scores)
+    ]
+
+@bp.route("/api/analyze-text", methods=["POST"])
 def analyze_text():
     """
     Analyze text for statistics and sentiment.
@@ -88,39 +246,26 @@ def analyze_text():
         return jsonify({"error": "Missing text."}), 400
     text = data["text"]
     try:
-        words = re.findall(r'\b\w+\b', text)
-        word_count = len(words)
-        char_count = len(text)
-        para_count = len([p for p in text.split('\n') if p.strip()])
-        read_time = round(word_count / 200, 2)  # 200 wpm
-        blob = TextBlob(text)
-        sentiment = blob.sentiment.polarity
-        if sentiment > 0.2:
-            sentiment_label = "Positive"
-        elif sentiment < -0.2:
-            sentiment_label = "Negative"
-        else:
-            sentiment_label = "Neutral"
-        # Flesch Reading Ease (simple version)
-        sentences = re.split(r'[.!?]+', text)
-        sentences = [s for s in sentences if s.strip()]
-        syllable_count = sum(len(re.findall(r'[aeiouy]+', w, re.I)) for w in words)
-        sentence_count = max(len(sentences), 1)
-        flesch = 206.835 - 1.015 * (word_count / sentence_count) - 84.6 * (syllable_count / max(word_count,1))
-        if flesch >= 60:
-            complexity = "Easy"
-        elif flesch >= 30:
-            complexity = "Medium"
-        else:
-            complexity = "Hard"
-        return jsonify({
-            "word_count": word_count,
-            "char_count": char_count,
-            "para_count": para_count,
-            "read_time": read_time,
-            "sentiment": sentiment_label,
-            "complexity": complexity
-        })
+        return jsonify(text_statistics(text))
     except Exception as e:
-        logger.error(f"Text analysis error: {e}")
+        logger.error("Text analysis error: %s", e)
         return jsonify({"error": str(e)}), 500
+
+@bp.route("/api/analyze-text/batch", methods=["POST"])
+def analyze_text_batch():
+    """
+    Analyze many texts in one request; the counts are fanned out over a process pool.
+    Expects a JSON array (or NDJSON lines) of strings or { "id": ..., "text": "..." }.
+    Returns: { "results": [{ "index", "id"?, ...stats... } | { "index", "error" }] } or NDJSON in input order.
+    """
+    try:
+        documents = parse_documents()
+    except BatchError as e:
+        logger.warning("Rejected text analysis batch: %s", e)
+        return jsonify({"error": str(e)}), e.status
+    logger.info("Analyzing batch of %d texts", len(documents))
+    return batch_response(text_statistics_many, documents, many=True)
+
+app = Flask(__name__)
+app.register_blueprint(bp)
+app.register_blueprint(metrics.bp)
@@ -0,0 +1,76 @@
+import importlib
+import logging
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+from flask import Flask
+
+logger = logging.getLogger(__name__)
+
+# component name -> (module, url prefix). Modules are only imported for the
+# components that are enabled, so a process serving just the API never loads the
+# dashboards' job pool, log index or SQLite execution log.
+COMPONENTS: Dict[str, Tuple[str, Optional[str]]] = {
+    "api": ("api_server", None),
+    "sentiment": ("sentiment_analysis_api", None),
+    "sentiment_legacy": ("new_feature", None),
+    "dashboard": ("web_dashboard", None),
+    "executions": ("autonomous_agent", "/executions"),
+    "metrics": ("metrics", None),
+    "frontend": ("assets", "/app"),
+}
+
+
+def create_app(components: Optional[Sequence[str]] = None) -> Flask:
+    """
+    Build one Flask app that serves every enabled component's blueprint.
+
+    All components share one process, so TextBlob's lexicon, the sentiment memo,
+    the LLM connection pool and the loggers are loaded once instead of once per
+    app. The execution log dashboard is mounted under /executions because its
+    routes overlap the repository dashboard's.
+
+    Args:
+        components (Optional[Sequence[str]]): Names from COMPONENTS; defaults to the
+            comma-separated APP_COMPONENTS env var, or all of them.
+
+    Returns:
+        Flask: The application (a WSGI callable).
+    """
+    if components is None:
+        components = [name.strip() for name in os.getenv("APP_COMPONENTS", ",".join(COMPONENTS)).split(",")
+                      if name.strip()]
+    unknown = [name for name in components if name not in COMPONENTS]
+    if unknown:
+        raise ValueError(f"Unknown components: {', '.join(unknown)}; choose from {', '.join(COMPONENTS)}")
+
+    app = Flask(__name__)
+    app.secret_key = os.getenv("DASHBOARD_SECRET_KEY", "supersecret")
+    for name in components:
+        module_name, url_prefix = COMPONENTS[name]
+        module = importlib.import_module(module_name)
+        app.register_blueprint(module.bp, url_prefix=url_prefix)
+    return app
+
+
+def serve(app: Flask, host: str = "0.0.0.0", port: int = 8000):
+    """
+    Serve ``app`` with waitress when it is installed, else Flask's threaded server.
+
+    WEB_THREADS sets the worker threads of the single process. For several
+    processes run a pre-fork server instead, e.g.
+    ``gunicorn "app_factory:create_app()"``, which reads WEB_CONCURRENCY.
+    """
+    threads = int(os.getenv("WEB_THREADS", "8"))
+    try:
+        from waitress import serve as waitress_serve
+    except ImportError:
+        logger.warning("waitress is not installed; falling back to the Flask development server.")
+        app.run(host=host, port=port, threaded=True)
+        return
+    waitress_serve(app, host=host, port=port, threads=threads)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    serve(create_app(), host=os.getenv("HOST", "0.0.0.0"), port=int(os.getenv("PORT", "8000")))
@@ -0,0 +1,307 @@
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import Blueprint, Response, jsonify, request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip alone is still served
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).resolve().parent
+DIST_DIR = Path(os.getenv("ASSETS_DIR", str(ROOT / "dist")))
+ENTRY_PAGE = "index.html"
+SOURCES = ("styles.css", "script.js")
+IMAGE_DIRS = ("screenshots",)
+COMPRESSIBLE = (".css", ".js", ".html", ".json", ".svg")
+# Preferred first when the client accepts several with equal q.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_STRING = r'"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+_CSS_TOKENS = re.compile(rf"({_STRING})|/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s*([{};,>])\s*")
+# Characters after which "/" starts a regular expression rather than a division.
+_REGEX_PRECEDERS = set("(,=:[!&|?{};+-*%<>~^") | {""}
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and insignificant whitespace; string literals are left untouched."""
+    parts: List[str] = []
+    last = 0
+    for match in _CSS_TOKENS.finditer(css):
+        parts.append(_minify_css_code(css[last:match.start()]))
+        if match.group(1):
+            parts.append(match.group(1))
+        last = match.end()
+    parts.append(_minify_css_code(css[last:]))
+    return "".join(parts).strip()
+
+
+def _minify_css_code(code: str) -> str:
+    code = re.sub(r"\s+", " ", code)
+    code = _CSS_SPACE.sub(r"\1", code)
+    code = re.sub(r":\s+", ":", code)
+    return code.replace(";}", "}")
+
+
+def minify_js(js: str) -> str:
+    """
+    Conservative JavaScript minifier: removes comments, indentation and blank lines.
+
+    Line breaks are kept so automatic semicolon insertion behaves exactly as in the
+    source, and strings, template literals and regular expressions are copied as is.
+    """
+    out: List[str] = []
+    i, n = 0, len(js)
+    at_line_start = True
+    last_significant = ""
+    while i < n:
+        ch = js[i]
+        if ch in "\"'`":
+            end = i + 1
+            while end < n and js[end] != ch:
+                end += 2 if js[end] == "\\" else 1
+            out.append(js[i:end + 1])
+            i = end + 1
+            at_line_start = False
+            last_significant = ch
+        elif js.startswith("//", i):
+            end = js.find("\n", i)
+            i = n if end == -1 else end
+        elif js.startswith("/*", i):
+            end = js.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+        elif ch == "/" and last_significant in _REGEX_PRECEDERS:
+            end, in_class = i + 1, False
+            while end < n and (js[end] != "/" or in_class) and js[end] != "\n":
+                if js[end] == "\\":
+                    end += 1
+                elif js[end] == "[":
+                    in_class = True
+                elif js[end] == "]":
+                    in_class = False
+                end += 1
+            while end + 1 < n and js[end + 1].isalpha():  # flags
+                end += 1
+            out.append(js[i:end + 1])
+            i = end + 1
+            at_line_start = False
+            last_significant = "/"
+        elif ch == "\n":
+            if not at_line_start:
+                while out and out[-1] in (" ", "\t"):
+                    out.pop()
+                out.append("\n")
+                at_line_start = True
+            i += 1
+        elif ch in " \t\r":
+            if not at_line_start and out and out[-1] not in (" ", "\n"):
+                out.append(" ")
+            i += 1
+        else:
+            out.append(ch)
+            at_line_start = False
+            last_significant = ch if not ch.isalnum() and ch not in "_$" else "a"
+            i += 1
+    return "".join(out).strip() + "\n"
+
+
+def fingerprint(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:10]
+
+
+def _hashed_name(name: str, digest: str) -> str:
+    stem, dot, ext = name.rpartition(".")
+    return f"{stem}.{digest}.{ext}" if dot else f"{name}.{digest}"
+
+
+def _write_variants(out_dir: Path, name: str, data: bytes) -> Dict[str, str]:
+    """Write ``name`` plus any precompressed variants smaller than it; return encoding -> file."""
+    (out_dir / name).parent.mkdir(parents=True, exist_ok=True)
+    (out_dir / name).write_bytes(data)
+    variants: Dict[str, str] = {}
+    if not name.endswith(COMPRESSIBLE):
+        return variants
+    compressed = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressed["br"] = brotli.compress(data, quality=11)
+    for encoding, suffix in ENCODINGS:
+        body = compressed.get(encoding)
+        if body is not None and len(body) < len(data):
+            (out_dir / (name + suffix)).write_bytes(body)
+            variants[encoding] = name + suffix
+    return variants
+
+
+def build(src_dir: Path = ROOT, out_dir: Path = DIST_DIR) -> Dict[str, Any]:
+    """
+    Build the frontend into ``out_dir`` (replacing it) and return the manifest.
+
+    CSS and JS are minified, every asset is named after a hash of its content
+    (styles.css -> styles.3f2a9c1b7e.css), gzip (and brotli, when the ``brotli``
+    package is installed) variants are written next to each compressible file, and
+    index.html is rewritten to the hashed names. Run as ``python assets.py``.
+
+    Returns:
+        Dict[str, Any]: {"files": {logical name: {"path", "etag", "size", "encodings"}}}
+        where ``path`` is the hashed file name (the page keeps its own name).
+    """
+    src_dir, out_dir = Path(src_dir), Path(out_dir)
+    if out_dir.exists():
+        shutil.rmtree(out_dir)
+    out_dir.mkdir(parents=True)
+    files: Dict[str, Dict[str, Any]] = {}
+
+    def emit(logical: str, data: bytes, hashed: bool = True):
+        digest = fingerprint(data)
+        path = _hashed_name(logical, digest) if hashed else logical
+        files[logical] = {"path": path, "etag": digest, "size": len(data),
+                          "encodings": _write_variants(out_dir, path, data)}
+
+    for name in SOURCES:
+        text = (src_dir / name).read_text(encoding="utf-8")
+        minified = minify_css(text) if name.endswith(".css") else minify_js(text)
+        emit(name, minified.encode("utf-8"))
+    for directory in IMAGE_DIRS:
+        for path in sorted((src_dir / directory).glob("*")):
+            if path.is_file():
+                emit(f"{directory}/{path.name}", path.read_bytes())
+
+    page = (src_dir / ENTRY_PAGE).read_text(encoding="utf-8")
+    for logical, entry in files.items():
+        page = re.sub(rf'((?:href|src)=["\'](?:\./)?){re.escape(logical)}(["\'])', rf"\g<1>{entry['path']}\2", page)
+    emit(ENTRY_PAGE, page.encode("utf-8"), hashed=False)
+
+    manifest = {"files": files}
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    return manifest
+
+
+class AssetStore:
+    """
+    Serves a build from memory: the manifest and each file's bytes are loaded on
+    first use and reloaded when manifest.json changes, so a rebuild needs no restart.
+
+    The ``bp`` blueprint serves hashed files with a one-year immutable Cache-Control,
+    index.html and unhashed names revalidated through ETags, and the precompressed
+    variant picked from Accept-Encoding, so nothing is compressed per request.
+    """
+
+    def __init__(self, dist_dir: Path = DIST_DIR):
+        self.dist_dir = Path(dist_dir)
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._routes: Dict[str, Tuple[Dict[str, Any], bool]] = {}
+        self._bodies: Dict[str, bytes] = {}
+
+    def _refresh(self):
+        try:
+            mtime = (self.dist_dir / "manifest.json").stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime == self._mtime:
+            return
+        with self._lock:
+            routes: Dict[str, Tuple[Dict[str, Any], bool]] = {}
+            if mtime is not None:
+                manifest = json.loads((self.dist_dir / "manifest.json").read_text(encoding="utf-8"))
+                for logical, entry in manifest["files"].items():
+                    routes[logical] = (entry, False)
+                    routes[entry["path"]] = (entry, entry["path"] != logical)
+            self._routes, self._bodies, self._mtime = routes, {}, mtime
+
+    @property
+    def has_build(self) -> bool:
+        """Whether ``dist_dir`` currently holds a build."""
+        self._refresh()
+        return self._mtime is not None
+
+    def lookup(self, name: str) -> Optional[Tuple[Dict[str, Any], bool]]:
+        """Return (manifest entry, is_hashed_name) for a requested file name."""
+        self._refresh()
+        return self._routes.get(name)
+
+    def read(self, path: str) -> bytes:
+        body = self._bodies.get(path)
+        if body is None:
+            body = self._bodies[path] = (self.dist_dir / path).read_bytes()
+        return body
+
+
+def choose_encoding(accept_encoding: str, available: Dict[str, str]) -> Optional[str]:
+    """Best precompressed encoding in ``available`` allowed by an Accept-Encoding header."""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            accepted[token.strip().lower()] = q
+    best, best_q = None, 0.0
+    for encoding, _ in ENCODINGS:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+STORE = AssetStore()
+bp = Blueprint("assets", __name__)
+
+
+def asset_response(name: str):
+    found = STORE.lookup(name)
+    if found is None:
+        if not STORE.has_build:
+            logger.warning("Asset %s requested but %s has no build; run python assets.py", name, STORE.dist_dir)
+        return jsonify({"error": "Not found."}), 404
+    entry, hashed = found
+    encoding = choose_encoding(request.headers.get("Accept-Encoding", ""), entry["encodings"])
+    etag = f'"{entry["etag"]}-{encoding}"' if encoding else f'"{entry["etag"]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": IMMUTABLE if hashed else REVALIDATE,
+        "Vary": "Accept-Encoding",
+    }
+    mimetype = mimetypes.guess_type(entry["path"])[0] or "application/octet-stream"
+    if etag in {tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")}:
+        return Response(status=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    body = STORE.read(entry["encodings"][encoding] if encoding else entry["path"])
+    return Response(body, mimetype=mimetype, headers=headers)
+
+
+@bp.route("/", methods=["GET"])
+def index():
+    return asset_response(ENTRY_PAGE)
+
+
+@bp.route("/<path:filename>", methods=["GET"])
+def asset(filename: str):
+    return asset_response(filename)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    result = build()
+    for logical, info in sorted(result["files"].items()):
+        sizes = ", ".join(f"{enc} {(DIST_DIR / path).stat().st_size}" for enc, path in info["encodings"].items())
+        logger.info("%s -> %s (%d bytes%s)", logical, info["path"], info["size"], f"; {sizes}" if sizes else "")
@@ -1,93 +1,460 @@
-import sqlite3
+import atexit
+import logging
+import os
+import sys
 import threading
-from typing import Optional, Dict, Any, List
+import time
+from typing import Optional, Dict, Any, Iterator, List
 import datetime
+from pathlib import Path
+from execution_retention import RetentionManager, RetentionPolicy, default_archive_dir, read_archived
+from execution_schema import migrate
+from log_index import RUN_MARKER
+from memory_store import MemoryStore
+from metrics import REGISTRY, timed
+from repo_status import DEFAULT_REPO_PATH, HEARTBEAT_FILENAME, AgentHeartbeat
+from sqlite_pool import ConnectionPool
+from write_behind import BatchWriter
+
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_duration_seconds", "ExecutionLog SQLite time per query, including connection wait.", ("query",)
+)
+DB_QUERY_ERRORS = REGISTRY.counter("db_query_errors_total", "ExecutionLog SQLite queries that raised.", ("query",))
+
+logger = logging.getLogger("autonomous_agent")
+
+# Must match web_dashboard.py, which reads the heartbeat and tails the log in this repo.
+REPO_PATH = Path(os.getenv("TARGET_REPO_PATH", DEFAULT_REPO_PATH))
+LOG_PATH = REPO_PATH / "autonomous_agent.log"
+AGENT_INTERVAL = float(os.getenv("AGENT_INTERVAL", "300"))
+
+
+def _bound(fn, a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return fn(a, b)
 
 class ExecutionLog:
     _instance = None
     _lock = threading.Lock()
 
-    def __new__(cls, db_path: str = "execution_log.db"):
+    def __new__(cls, db_path: str = "execution_log.db", **options):
         with cls._lock:
             if cls._instance is None:
                 cls._instance = super().__new__(cls)
-                cls._instance._init_db(db_path)
+                cls._instance._init_db(db_path, **options)
             return cls._instance
 
-    def _init_db(self, db_path: str):
+    @classmethod
+    def standalone(cls, db_path: str, **options) -> "ExecutionLog":
+        """
+        Open an ExecutionLog that is not the shared process-wide instance.
+
+        For tools such as benchmarks that need their own database while the shared
+        log stays untouched. Takes the same options as ExecutionLog(); close() it when done.
+        """
+        log = super().__new__(cls)
+        log._init_db(db_path, **options)
+        return log
+
+    def _init_db(self, db_path: str, write_behind: Optional[bool] = None, batch_size: int = 500,
+                 flush_interval: float = 0.5, max_queue: int = 10000,
+                 synchronous: Optional[str] = None, cache_size: Optional[int] = None,
+                 mmap_size: Optional[int] = None, max_readers: int = 8,
+                 retention_max_age_days: Optional[float] = None, retention_max_rows: Optional[int] = None,
+                 retention_interval: float = 3600.0, archive_dir: Optional[str] = None):
+        """
+        Open the connection pool and start the optional batch writer and retention thread.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+            synchronous (Optional[str]): PRAGMA synchronous. Defaults to the
+                EXECUTION_LOG_SYNCHRONOUS env var, then NORMAL.
+            cache_size (Optional[int]): PRAGMA cache_size. Defaults to the
+                EXECUTION_LOG_CACHE_SIZE env var, then -8000 (8 MiB).
+            mmap_size (Optional[int]): PRAGMA mmap_size in bytes. Defaults to the
+                EXECUTION_LOG_MMAP_SIZE env var, then 0.
+            max_readers (int): Idle read-only connections kept in the pool.
+            write_behind (Optional[bool]): Queue rows and insert them in batches on a
+                background thread. Defaults to the EXECUTION_LOG_WRITE_BEHIND env var.
+            batch_size (int): Rows per batched insert.
+            flush_interval (float): Seconds a queued row may wait before being written.
+            max_queue (int): Queued rows after which log_execution blocks.
+            retention_max_age_days (Optional[float]): Archive executions older than this.
+                Defaults to the EXECUTION_LOG_RETENTION_DAYS env var.
+            retention_max_rows (Optional[int]): Keep at most this many live executions.
+                Defaults to the EXECUTION_LOG_MAX_ROWS env var.
+            retention_interval (float): Seconds between background retention passes.
+            archive_dir (Optional[str]): Directory for per-month archive databases.
+                Defaults to "<db name>_archive" next to the database.
+        """
         self.db_path = db_path
-        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.pool = ConnectionPool(
+            db_path,
+            synchronous=synchronous or os.getenv("EXECUTION_LOG_SYNCHRONOUS", "NORMAL"),
+            cache_size=cache_size if cache_size is not None else int(os.getenv("EXECUTION_LOG_CACHE_SIZE", "-8000")),
+            mmap_size=mmap_size if mmap_size is not None else int(os.getenv("EXECUTION_LOG_MMAP_SIZE", "0")),
+            max_readers=max_readers
+        )
         self._create_tables()
+        if write_behind is None:
+            write_behind = os.getenv("EXECUTION_LOG_WRITE_BEHIND", "").lower() in ("1", "true", "yes")
+        self._writer = None
+        if write_behind:
+            self._writer = BatchWriter(
+                self.insert_many,
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+                max_queue=max_queue,
+                name="execution-log-writer"
+            )
+
+        self.archive_dir = Path(archive_dir) if archive_dir else default_archive_dir(db_path)
+        if retention_max_age_days is None and os.getenv("EXECUTION_LOG_RETENTION_DAYS"):
+            retention_max_age_days = float(os.getenv("EXECUTION_LOG_RETENTION_DAYS"))
+        if retention_max_rows is None and os.getenv("EXECUTION_LOG_MAX_ROWS"):
+            retention_max_rows = int(os.getenv("EXECUTION_LOG_MAX_ROWS"))
+        self.retention = RetentionManager(
+            self,
+            RetentionPolicy(max_age_days=retention_max_age_days, max_rows=retention_max_rows),
+            interval=retention_interval
+        )
+        if self.retention.policy.enabled:
+            self.retention.start()
+        if self._writer is not None or self.retention.policy.enabled:
+            atexit.register(self.close)
 
     def _create_tables(self):
-        with self.conn:
-            self.conn.execute("""
-                CREATE TABLE IF NOT EXISTS executions (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TEXT NOT NULL,
-                    status TEXT NOT NULL,
-                    files_changed TEXT,
-                    improvement_type TEXT,
-                    copilot_response_time REAL,
-                    error_message TEXT
-                )
-            """)
+        with self.pool.writer() as conn:
+            self.schema_version = migrate(conn)
+
+    _INSERT_SQL = """
+        INSERT INTO executions (timestamp, status, files_changed, improvement_type, copilot_response_time, error_message)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """
+
+    def insert_many(self, rows: List[tuple]):
+        """
+        Insert many executions in one transaction, bypassing the write-behind queue.
+
+        Args:
+            rows (List[tuple]): (timestamp, status, files_changed, improvement_type,
+                copilot_response_time, error_message) tuples.
+        """
+        with timed(DB_QUERY_SECONDS, DB_QUERY_ERRORS, query="insert_many"), self.pool.writer() as conn:
+            conn.executemany(self._INSERT_SQL, rows)
 
     def log_execution(self, status: str, files_changed: Optional[str], improvement_type: Optional[str],
                       copilot_response_time: Optional[float], error_message: Optional[str]):
-        with self.conn:
-            self.conn.execute("""
-                INSERT INTO executions (timestamp, status, files_changed, improvement_type, copilot_response_time, error_message)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                datetime.datetime.utcnow().isoformat(),
-                status,
-                files_changed,
-                improvement_type,
-                copilot_response_time,
-                error_message
-            ))
-
-    def get_recent_executions(self, limit: int = 100) -> List[Dict[str, Any]]:
-        cur = self.conn.cursor()
-        cur.execute("""
-            SELECT timestamp, status, files_changed, improvement_type, copilot_response_time, error_message
-            FROM executions
-            ORDER BY id DESC
-            LIMIT ?
-        """, (limit,))
-        rows = cur.fetchall()
-        return [
-            {
-                "timestamp": row[0],
-                "status": row[1],
-                "files_changed": row[2],
-                "improvement_type": row[3],
-                "copilot_response_time": row[4],
-                "error_message": row[5]
+        row = (
+            datetime.datetime.utcnow().isoformat(),
+            status,
+            files_changed,
+            improvement_type,
+            copilot_response_time,
+            error_message
+        )
+        if self._writer is not None:
+            # Blocks while the queue is full so a stalled disk can't grow memory unbounded.
+            self._writer.put(row)
+            return
+        with timed(DB_QUERY_SECONDS, DB_QUERY_ERRORS, query="insert"), self.pool.writer() as conn:
+            conn.execute(self._INSERT_SQL, row)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until all queued rows are committed. No-op without write-behind."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self):
+        """Flush pending rows, close the connection pool and release the singleton."""
+        with ExecutionLog._lock:
+            self.retention.stop()
+            if self._writer is not None:
+                self._writer.close()
+            self.pool.close()
+            if ExecutionLog._instance is self:
+                ExecutionLog._instance = None
+
+    EXECUTION_FIELDS = ("id", "timestamp", "status", "files_changed", "improvement_type",
+                        "copilot_response_time", "error_message")
+    _SELECT_SQL = f"SELECT {', '.join(EXECUTION_FIELDS)} FROM executions"
+
+    @staticmethod
+    def _filter_clauses(status: Optional[str] = None, improvement_type: Optional[str] = None,
+                        since: Optional[str] = None, until: Optional[str] = None):
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if improvement_type is not None:
+            clauses.append("improvement_type = ?")
+            params.append(improvement_type)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        return clauses, params
+
+    def _to_dict(self, row) -> Dict[str, Any]:
+        return dict(zip(self.EXECUTION_FIELDS, row))
+
+    def get_recent_executions(self, limit: int = 100, include_archived: bool = False) -> List[Dict[str, Any]]:
+        """
+        Return the newest executions. With include_archived, rows moved out by the
+        retention policy fill the remainder of the limit, newest month first.
+        """
+        executions = self.get_executions_page(limit=limit)["executions"]
+        if include_archived and len(executions) < limit:
+            executions.extend(read_archived(self.archive_dir, self.EXECUTION_FIELDS, limit - len(executions)))
+        return executions
+
+    def get_executions_page(self, limit: int = 100, before: Optional[int] = None, after: Optional[int] = None,
+                            status: Optional[str] = None, improvement_type: Optional[str] = None,
+                            since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Return one page of executions, newest first, using id keyset pagination.
+
+        Paging is a primary-key range scan, so the cost of a page does not depend on
+        how deep into the table it is.
+
+        Args:
+            limit (int): Maximum rows in the page.
+            before (Optional[int]): Only rows with id < before (older page).
+            after (Optional[int]): Only rows with id > after (newer page).
+            status, improvement_type (Optional[str]): Exact-match filters.
+            since, until (Optional[str]): ISO-8601 timestamp range, since inclusive.
+
+        Returns:
+            Dict[str, Any]: ``executions`` plus ``next_cursor`` (pass as ``before`` for
+            older rows) and ``prev_cursor`` (pass as ``after`` for newer rows); a cursor
+            is None when there is nothing further in that direction.
+        """
+        clauses, params = self._filter_clauses(status, improvement_type, since, until)
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(before)
+        if after is not None:
+            clauses.append("id > ?")
+            params.append(after)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        # Newer pages are read upwards from the cursor and flipped back to newest-first.
+        order = "ASC" if after is not None and before is None else "DESC"
+        with timed(DB_QUERY_SECONDS, DB_QUERY_ERRORS, query="executions_page"), self.pool.reader() as conn:
+            rows = conn.execute(
+                f"{self._SELECT_SQL}{where} ORDER BY id {order} LIMIT ?", (*params, limit + 1)
+            ).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if order == "ASC":
+            rows.reverse()
+            has_newer, has_older = has_more, bool(rows)
+        else:
+            has_newer, has_older = after is not None or before is not None, has_more
+        return {
+            "executions": [self._to_dict(row) for row in rows],
+            "next_cursor": rows[-1][0] if rows and has_older else None,
+            "prev_cursor": rows[0][0] if rows and has_newer else None
+        }
+
+    def iter_executions(self, status: Optional[str] = None, improvement_type: Optional[str] = None,
+                        since: Optional[str] = None, until: Optional[str] = None,
+                        chunk_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Yield matching executions oldest first in constant memory.
+
+        Rows are fetched in id-keyed chunks and the reader connection is returned to
+        the pool between chunks, so a slow consumer never pins a read transaction.
+        """
+        clauses, params = self._filter_clauses(status, improvement_type, since, until)
+        clauses.append("id > ?")
+        sql = f"{self._SELECT_SQL} WHERE {' AND '.join(clauses)} ORDER BY id ASC LIMIT ?"
+        last_id = 0
+        while True:
+            with timed(DB_QUERY_SECONDS, DB_QUERY_ERRORS, query="iter_chunk"), self.pool.reader() as conn:
+                rows = conn.execute(sql, (*params, last_id, chunk_size)).fetchall()
+            for row in rows:
+                yield self._to_dict(row)
+            if len(rows) < chunk_size:
+                return
+            last_id = rows[-1][0]
+
+    def change_token(self) -> tuple:
+        """
+        (newest id, live row count) from the primary key and the execution_stats
+        rollup; it changes whenever a row is inserted, deleted or archived, and costs
+        two index lookups. Rows still queued by write-behind are not counted yet.
+        """
+        with timed(DB_QUERY_SECONDS, DB_QUERY_ERRORS, query="change_token"), self.pool.reader() as conn:
+            return conn.execute(
+                "SELECT (SELECT MAX(id) FROM executions),"
+                " (SELECT COALESCE(SUM(count), 0) FROM execution_stats WHERE dimension = 'status')"
+            ).fetchone()
+
+    def get_stats(self, include_archived: bool = False) -> Dict[str, Any]:
+        """
+        Return execution counts and response times from the execution_stats rollup.
+
+        The rollup is maintained by triggers on insert and delete, so this is a handful
+        of primary-key lookups regardless of how many executions are stored. With
+        include_archived, totals also cover rows moved out by the retention policy.
+        """
+        sql = "SELECT dimension, key, count, response_count, response_sum, response_min, response_max FROM execution_stats"
+        if include_archived:
+            sql += " UNION ALL " + sql.replace("execution_stats", "execution_stats_archived")
+        with timed(DB_QUERY_SECONDS, DB_QUERY_ERRORS, query="stats"), self.pool.reader() as conn:
+            rows = conn.execute(sql).fetchall()
+
+        merged: Dict[tuple, list] = {}
+        for dimension, key, count, r_count, r_sum, r_min, r_max in rows:
+            current = merged.get((dimension, key))
+            if current is None:
+                merged[(dimension, key)] = [count, r_count, r_sum, r_min, r_max]
+                continue
+            current[0] += count
+            current[1] += r_count
+            current[2] += r_sum
+            current[3] = _bound(min, current[3], r_min)
+            current[4] = _bound(max, current[4], r_max)
+
+        by_status: Dict[str, Dict[str, Any]] = {}
+        by_improvement_type: Dict[str, Dict[str, Any]] = {}
+        response_count = 0
+        response_sum = 0.0
+        for (dimension, key), (count, r_count, r_sum, r_min, r_max) in merged.items():
+            if count <= 0:
+                continue
+            entry = {
+                "count": count,
+                "avg_copilot_response_time": r_sum / r_count if r_count else None,
+                "min_copilot_response_time": r_min,
+                "max_copilot_response_time": r_max
             }
-            for row in rows
-        ]
-
-    def get_stats(self) -> Dict[str, Any]:
-        cur = self.conn.cursor()
-        cur.execute("SELECT COUNT(*) FROM executions WHERE status = 'success'")
-        success_count = cur.fetchone()[0]
-        cur.execute("SELECT COUNT(*) FROM executions WHERE status = 'failure'")
-        failure_count = cur.fetchone()[0]
-        cur.execute("SELECT AVG(copilot_response_time) FROM executions WHERE copilot_response_time IS NOT NULL")
-        avg_response = cur.fetchone()[0]
+            if dimension == "status":
+                by_status[key] = entry
+                response_count += r_count
+                response_sum += r_sum
+            else:
+                by_improvement_type[key] = entry
+
         return {
-            "success_count": success_count,
-            "failure_count": failure_count,
-            "avg_copilot_response_time": avg_response
+            "success_count": by_status.get("success", {}).get("count", 0),
+            "failure_count": by_status.get("failure", {}).get("count", 0),
+            "avg_copilot_response_time": response_sum / response_count if response_count else None,
+            "by_status": by_status,
+            "by_improvement_type": by_improvement_type
         }
 
-import os
-from flask import Flask, render_template_string, send_from_directory
-from execution_log import ExecutionLog
 
-app = Flask(__name__)
+class AutonomousAgent:
+    """
+    Goal-driven agent with a bounded, indexed long-term memory.
+
+    ``memory`` is a MemoryStore: a list of remembered strings, oldest first, that
+    also supports relevance search and evicts once over capacity.
+
+    Args:
+        name (str): Agent name; also the namespace of its persisted memories.
+        goal (str): What the agent is working toward.
+        memory_capacity (Optional[int]): Memories kept; defaults to the
+            AGENT_MEMORY_CAPACITY env var, then 1000. 0 means unbounded.
+        eviction (Optional[str]): "lru" or "importance"; defaults to
+            AGENT_MEMORY_EVICTION, then "lru".
+        memory_db (Optional[str]): SQLite file to persist memories to (for example
+            execution_log.db); defaults to AGENT_MEMORY_DB, else memory only.
+        recall_k (int): Related memories consulted per act().
+    """
+
+    def __init__(self, name: str, goal: str, memory_capacity: Optional[int] = None,
+                 eviction: Optional[str] = None, memory_db: Optional[str] = None, recall_k: int = 3):
+        self.name = name
+        self.goal = goal
+        self.recall_k = recall_k
+        self.memory = MemoryStore(
+            capacity=memory_capacity if memory_capacity is not None else int(os.getenv("AGENT_MEMORY_CAPACITY", "1000")),
+            eviction=eviction or os.getenv("AGENT_MEMORY_EVICTION", "lru"),
+            db_path=memory_db or os.getenv("AGENT_MEMORY_DB") or None,
+            namespace=name
+        )
+
+    def add_to_memory(self, item: str, importance: float = 1.0):
+        self.memory.add(item, importance)
+
+    def clear_memory(self):
+        self.memory.clear()
+
+    def recall(self, query: str, k: Optional[int] = None) -> List[str]:
+        """Memories most relevant to ``query``, best first."""
+        return self.memory.search(query, k or self.recall_k)
+
+    def act(self, observation: str) -> str:
+        """
+        Respond to ``observation`` using related memories, then remember it.
+
+        Returns:
+            str: A description of the step taken.
+        """
+        related = self.recall(observation)
+        response = f"{self.name} working toward '{self.goal}' received: {observation}"
+        if related:
+            response += " | related memories: " + "; ".join(related)
+        self.add_to_memory(observation)
+        return response
+
+
+def _heartbeat() -> AgentHeartbeat:
+    return AgentHeartbeat(os.getenv("AGENT_HEARTBEAT_PATH", REPO_PATH / HEARTBEAT_FILENAME))
+
+
+def run_step(agent: AutonomousAgent, log: Optional["ExecutionLog"] = None) -> str:
+    """
+    One agent step: announce the run, act on the goal and record the outcome.
+
+    The run marker line is what web_dashboard indexes to show the last run time.
+    """
+    log = log or ExecutionLog()
+    logger.info("%s - Time: %s", RUN_MARKER, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    started = time.perf_counter()
+    try:
+        result = agent.act(f"run started at {datetime.datetime.now().isoformat()}")
+    except Exception as e:
+        log.log_execution("failure", None, "agent_step", time.perf_counter() - started, str(e))
+        raise
+    log.log_execution("success", None, "agent_step", time.perf_counter() - started, None)
+    logger.info("%s", result)
+    return result
+
+
+def once(agent: AutonomousAgent, log: Optional["ExecutionLog"] = None) -> str:
+    """Run a single step while the heartbeat marks the agent as running."""
+    with _heartbeat():
+        return run_step(agent, log)
+
+
+def run(agent: AutonomousAgent, interval: float = AGENT_INTERVAL, log: Optional["ExecutionLog"] = None):
+    """Run steps every ``interval`` seconds until interrupted, heartbeat included."""
+    with _heartbeat():
+        while True:
+            try:
+                run_step(agent, log)
+            except Exception:
+                logger.exception("Agent step failed")
+            time.sleep(interval)
+
+
+from flask import Blueprint, Flask, Response, send_from_directory, request, jsonify, stream_with_context
+from execution_analytics import ExecutionAnalytics
+from execution_export import EXPORT_FORMATS, export
+from page_cache import PageCache
+import metrics
+
+bp = Blueprint("executions", __name__)
 
 DASHBOARD_TEMPLATE = """
 <!DOCTYPE html>
@@ -137,32 +504,106 @@ DASHBOARD_TEMPLATE = """
 </html>
 """
 
-@app.route("/")
+DASHBOARD_PAGE = PageCache(DASHBOARD_TEMPLATE)
+
+@bp.route("/")
 def dashboard():
     log = ExecutionLog()
-    executions = log.get_recent_executions(100)
-    stats = log.get_stats()
-    return render_template_string(DASHBOARD_TEMPLATE, executions=executions, stats=stats)
+    return DASHBOARD_PAGE.respond(
+        (log.db_path, *log.change_token()),
+        lambda: {"executions": log.get_recent_executions(100), "stats": log.get_stats()}
+    )
 
-if __name__ == "__main__":
-    app.run(port=8080, debug=True)
+@bp.route("/api/analytics")
+def analytics():
+    """
+    Time-bucketed execution analytics.
+    Query params: granularity=minute|hour|day, improvement_type, since, until (ISO-8601 UTC)
+    Returns: { "granularity": "...", "buckets": [ {bucket, counts, avg/p50/p90/p99}, ... ] }
+    """
+    granularity = request.args.get("granularity", "hour")
+    try:
+        buckets = ExecutionAnalytics(ExecutionLog()).buckets(
+            granularity=granularity,
+            improvement_type=request.args.get("improvement_type"),
+            since=request.args.get("since"),
+            until=request.args.get("until")
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"granularity": granularity, "buckets": buckets})
 
-[...existing code...]
+def _execution_filters() -> Dict[str, Optional[str]]:
+    return {
+        "status": request.args.get("status"),
+        "improvement_type": request.args.get("improvement_type"),
+        "since": request.args.get("since"),
+        "until": request.args.get("until")
+    }
 
-# --- Add these imports at the top ---
-from execution_log import ExecutionLog
+@bp.route("/api/executions")
+def executions_page():
+    """
+    Keyset-paginated executions, newest first.
+    Query params: limit (max 1000), before, after, status, improvement_type, since, until
+    Returns: { "executions": [...], "next_cursor": id|null, "prev_cursor": id|null }
+    """
+    try:
+        limit = min(max(int(request.args.get("limit", 100)), 1), 1000)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer."}), 400
+    cursors = {}
+    for name in ("before", "after"):
+        value = request.args.get(name)
+        if value is None:
+            continue
+        try:
+            cursors[name] = int(value)
+        except ValueError:
+            return jsonify({"error": f"{name} must be an integer."}), 400
+    if len(cursors) == 2:
+        return jsonify({"error": "Pass either before or after, not both."}), 400
+    before, after = cursors.get("before"), cursors.get("after")
+    page = ExecutionLog().get_executions_page(limit=limit, before=before, after=after, **_execution_filters())
+    return jsonify(page)
 
-# --- In the main agent logic, after each commit attempt (success or failure), add: ---
-# Example usage:
-# log = ExecutionLog()
-# log.log_execution(
-#     status="success" or "failure",
-#     files_changed="comma,separated,files",
-#     improvement_type="feature|refactor|docs|etc",
-#     copilot_response_time=seconds_float,
-#     error_message="error details if any"
-# )
+@bp.route("/api/executions/export")
+def executions_export():
+    """
+    Stream every matching execution, oldest first, as NDJSON or CSV in constant memory.
+    Query params: format=ndjson|csv, status, improvement_type, since, until
+    """
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}"}), 400
+    log = ExecutionLog()
+    body = export(log.iter_executions(**_execution_filters()), fmt, ExecutionLog.EXECUTION_FIELDS)
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={"Content-Disposition": f"attachment; filename=executions.{fmt}"}
+    )
 
-# Place this in the appropriate try/except/finally blocks where commits are made.
+app = Flask(__name__)
+app.register_blueprint(bp)
+app.register_blueprint(metrics.bp)
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "serve"
+    if command in ("once", "run"):
+        from logging_utils import setup_logger
+        # The dashboard's log index and live tail read this file.
+        setup_logger("autonomous_agent", str(LOG_PATH))
+        agent = AutonomousAgent(os.getenv("AGENT_NAME", "commit-agent"),
+                                os.getenv("AGENT_GOAL", "keep the repository improving"))
+        if command == "once":
+            try:
+                once(agent)
+            except Exception:
+                logger.exception("Agent step failed")
+                sys.exit(1)
+        else:
+            run(agent)
+    else:
+        app.run(port=8080, debug=True)
 
-# --- End of addition ---
\ No newline at end of file
@@ -0,0 +1,173 @@
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from flask import Response, jsonify, request, stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+MAX_BATCH_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000"))
+MAX_BATCH_BYTES = int(os.getenv("BATCH_MAX_BYTES", str(5 * 1024 * 1024)))
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+
+
+class BatchError(Exception):
+    """A batch request that cannot be processed at all; ``status`` is the HTTP code to return."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+def get_executor() -> Optional[Executor]:
+    """
+    Shared process pool for CPU-bound batch work, created on first use.
+
+    BATCH_WORKERS sets the pool size (default: CPU count); 0 disables the pool and
+    items are processed in the request thread. Workers are started with "spawn"
+    (BATCH_START_METHOD) rather than fork: the pool is created inside a threaded
+    server, and a forked child can inherit locks other threads held mid-fork.
+    Batch functions should therefore live in light modules, as every worker imports
+    the module its function is defined in.
+    """
+    global _executor
+    workers = int(os.getenv("BATCH_WORKERS", str(os.cpu_count() or 1)))
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            context = multiprocessing.get_context(os.getenv("BATCH_START_METHOD", "spawn"))
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+        return _executor
+
+
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+
+
+def _document(item: Any) -> Tuple[Any, Any]:
+    if isinstance(item, dict):
+        return item.get("id"), item.get("text")
+    return None, item
+
+
+def parse_documents(max_items: Optional[int] = None, max_bytes: Optional[int] = None) -> List[Tuple[Any, Any]]:
+    """
+    Read the documents of a batch request as (id, text) pairs.
+
+    Accepts a JSON array (or {"texts": [...]}) or an NDJSON body with one document
+    per line. A document is a string or {"id": ..., "text": "..."}. Malformed
+    documents are kept and reported per item rather than failing the batch.
+
+    Raises:
+        BatchError: 413 if the body or item count exceeds the limits, 400 if it cannot be parsed.
+    """
+    max_items = MAX_BATCH_ITEMS if max_items is None else max_items
+    max_bytes = MAX_BATCH_BYTES if max_bytes is None else max_bytes
+    if request.content_length is not None and request.content_length > max_bytes:
+        raise BatchError(f"Batch body exceeds {max_bytes} bytes.", 413)
+    body = request.get_data(cache=False)
+    if len(body) > max_bytes:
+        raise BatchError(f"Batch body exceeds {max_bytes} bytes.", 413)
+
+    if request.mimetype == NDJSON_MIMETYPE:
+        items = []
+        for line in body.decode("utf-8", errors="replace").splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append({"text": None})
+            if len(items) > max_items:
+                break
+    else:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            raise BatchError("Body must be a JSON array or NDJSON.")
+        if isinstance(items, dict):
+            items = items.get("texts")
+        if not isinstance(items, list):
+            raise BatchError("Body must be a JSON array or NDJSON.")
+
+    if len(items) > max_items:
+        raise BatchError(f"Batch exceeds {max_items} items.", 413)
+    return [_document(item) for item in items]
+
+
+def _apply(fn: Callable[[str], Dict[str, Any]], text: Any) -> Dict[str, Any]:
+    if not isinstance(text, str):
+        return {"error": "Missing text."}
+    try:
+        return fn(text)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+def run_batch(fn: Callable[[str], Dict[str, Any]], texts: List[Any], chunksize: int = 16) -> Iterator[Dict[str, Any]]:
+    """
+    Apply ``fn`` to every text on the process pool and yield results in input order.
+
+    ``fn`` must be a picklable module-level function. An exception or a non-string
+    text only turns that item into {"error": ...}.
+    """
+    executor = get_executor()
+    call = partial(_apply, fn)
+    if executor is None or len(texts) <= 1:
+        return map(call, texts)
+    return executor.map(call, texts, chunksize=chunksize)
+
+
+def apply_many(fn: Callable[[List[str]], List[Dict[str, Any]]], texts: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Apply a whole-batch ``fn`` to the valid texts in the calling thread.
+
+    Non-string texts become {"error": "Missing text."}; if ``fn`` raises, every
+    valid item carries the error.
+    """
+    valid = [text for text in texts if isinstance(text, str)]
+    try:
+        outputs = iter(fn(valid))
+    except Exception as e:
+        outputs = iter([{"error": str(e)}] * len(valid))
+    return [next(outputs) if isinstance(text, str) else {"error": "Missing text."} for text in texts]
+
+
+def batch_response(fn: Callable[..., Any], documents: List[Tuple[Any, Any]], many: bool = False):
+    """
+    Run a batch and return it as NDJSON lines streamed in input order, or as JSON.
+
+    NDJSON is used when the request body was NDJSON or the client accepts
+    application/x-ndjson; otherwise the response is {"results": [...]}. Each result
+    carries its "index" (and "id" if the document had one).
+
+    Args:
+        fn: Per-text function run on the process pool, or with ``many`` a function
+            taking the list of texts and returning their results, run in this process.
+        documents: (id, text) pairs from parse_documents().
+        many (bool): Call ``fn`` once for the whole batch (see apply_many).
+    """
+    def results() -> Iterator[Dict[str, Any]]:
+        texts = [text for _, text in documents]
+        outputs = apply_many(fn, texts) if many else run_batch(fn, texts)
+        for index, ((doc_id, _), output) in enumerate(zip(documents, outputs)):
+            item = {"index": index}
+            if doc_id is not None:
+                item["id"] = doc_id
+            item.update(output)
+            yield item
+
+    if request.mimetype == NDJSON_MIMETYPE or NDJSON_MIMETYPE in request.headers.get("Accept", ""):
+        lines = (json.dumps(item) + "\n" for item in results())
+        return Response(stream_with_context(lines), mimetype=NDJSON_MIMETYPE)
+    return jsonify({"results": list(results())})
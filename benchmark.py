@@ -0,0 +1,388 @@
+"""
+Benchmark and load-test harness.
+
+    python benchmark.py                                  # every suite, JSON on stdout
+    python benchmark.py --suites db --rows 10000,1000000
+    python benchmark.py --output bench.json --baseline baseline.json
+    python benchmark.py --output baseline.json           # record a new baseline
+
+Suites:
+    micro  text statistics and sentiment scoring, per call
+    db     ExecutionLog inserts, then get_stats / get_recent_executions at each --rows size
+    http   concurrent requests against the combined app, with a local stub in place of OpenAI
+
+Every result reports p50/p99/mean in microseconds and throughput. With --baseline,
+results whose p50 or p99 grew by more than --tolerance are listed under
+"regressions" and the exit status is 1.
+"""
+import argparse
+import datetime
+import json
+import logging
+import math
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+SUITES = ("micro", "db", "http")
+SHORT_TEXT = "What a wonderful day. The sun is out!"
+LONG_TEXT = ("The quick brown fox jumps over the lazy dog. It was not amused, but it stayed calm.\n\n"
+             "Readability metrics reward short sentences and short words. ") * 40
+
+
+def summarize(samples: Sequence[float], elapsed: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Summarize per-call durations (seconds).
+
+    Args:
+        samples (Sequence[float]): One duration per operation.
+        elapsed (Optional[float]): Wall time for all of them, for throughput under
+            concurrency; defaults to their sum.
+
+    Returns:
+        Dict[str, Any]: n, p50_us, p99_us, mean_us, max_us and ops_per_sec.
+    """
+    ordered = sorted(samples)
+    n = len(ordered)
+    if not n:
+        return {"n": 0}
+
+    def percentile(p: float) -> float:
+        # Nearest-rank, so p99 of a short run is its slowest sample rather than an interpolation.
+        return ordered[min(n - 1, max(0, math.ceil(p / 100 * n) - 1))] * 1e6
+
+    total = elapsed if elapsed is not None else sum(ordered)
+    return {
+        "n": n,
+        "p50_us": round(percentile(50), 3),
+        "p99_us": round(percentile(99), 3),
+        "mean_us": round(sum(ordered) / n * 1e6, 3),
+        "max_us": round(ordered[-1] * 1e6, 3),
+        "ops_per_sec": round(n / total, 1) if total > 0 else None
+    }
+
+
+def measure(fn: Callable[[], Any], iterations: int, warmup: int = 10) -> Dict[str, Any]:
+    """Call ``fn`` ``warmup`` times untimed, then time each of ``iterations`` calls."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    clock = time.perf_counter
+    for _ in range(iterations):
+        start = clock()
+        fn()
+        samples.append(clock() - start)
+    return summarize(samples)
+
+
+def run_micro(iterations: int) -> Dict[str, Any]:
+    import text_stats
+    from sentiment_service import SentimentEngine
+
+    memoized = SentimentEngine().warm_up()
+    uncached = SentimentEngine(cache_size=0).warm_up()
+    return {
+        "text_stats.short": measure(lambda: text_stats.analyze(SHORT_TEXT), iterations),
+        "text_stats.long": measure(lambda: text_stats.analyze(LONG_TEXT), iterations),
+        "sentiment.uncached.short": measure(lambda: uncached.scores(SHORT_TEXT), iterations),
+        "sentiment.uncached.long": measure(lambda: uncached.scores(LONG_TEXT), max(1, iterations // 10)),
+        "sentiment.memoized.long": measure(lambda: memoized.scores(LONG_TEXT), iterations),
+    }
+
+
+def _seed(log: Any, rows: int, chunk: int = 50000):
+    statuses = ("success", "failure")
+    kinds = ("refactor", "docs", "tests", "performance")
+    stamp = datetime.datetime.utcnow().isoformat()
+    done = 0
+    while done < rows:
+        batch = min(chunk, rows - done)
+        log.insert_many([
+            (stamp, statuses[i % 2], "a.py", kinds[i % 4], 0.5 + (i % 100) / 100, None)
+            for i in range(done, done + batch)
+        ])
+        done += batch
+
+
+def run_db(rows: Sequence[int], iterations: int, inserts: int) -> Dict[str, Any]:
+    """
+    ExecutionLog insert throughput, then read timings at each table size.
+
+    Every log is a standalone instance on a temporary database, so a shared log
+    open in the same process is neither written to nor closed.
+    """
+    from autonomous_agent import ExecutionLog
+
+    results: Dict[str, Any] = {}
+    tmpdir = tempfile.mkdtemp(prefix="bench-db-")
+    try:
+        for write_behind in (False, True):
+            name = "write_behind" if write_behind else "direct"
+            log = ExecutionLog.standalone(os.path.join(tmpdir, f"insert-{name}.db"), write_behind=write_behind,
+                                          archive_dir=os.path.join(tmpdir, "archive"))
+            start = time.perf_counter()
+            samples = []
+            for i in range(inserts):
+                t0 = time.perf_counter()
+                log.log_execution("success", "a.py", "refactor", 0.5, None)
+                samples.append(time.perf_counter() - t0)
+            log.flush()
+            results[f"db.log_execution.{name}"] = summarize(samples, time.perf_counter() - start)
+            log.close()
+
+        for count in rows:
+            log = ExecutionLog.standalone(os.path.join(tmpdir, f"read-{count}.db"), write_behind=False,
+                                          archive_dir=os.path.join(tmpdir, "archive"))
+            start = time.perf_counter()
+            _seed(log, count)
+            results[f"db.seed.{count}"] = {"n": count, "seconds": round(time.perf_counter() - start, 3)}
+            results[f"db.get_stats.{count}"] = measure(log.get_stats, iterations)
+            results[f"db.get_recent_executions.{count}"] = measure(
+                lambda: log.get_recent_executions(limit=100), iterations
+            )
+            log.close()
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+class StubOpenAIHandler(BaseHTTPRequestHandler):
+    """Answers /chat/completions like OpenAI, after ``server.latency`` seconds."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        words = payload["messages"][-1]["content"].split() or ["ok"]
+        if payload.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for word in words:
+                chunk = {"choices": [{"delta": {"content": word + " "}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+            return
+        data = json.dumps({"choices": [{"message": {"content": " ".join(words)}}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StubOpenAIHandler)
+        self.latency = latency
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+def _http_cases() -> Dict[str, Callable[[int], Dict[str, Any]]]:
+    """Endpoint name -> function of the request number returning requests.request kwargs."""
+    return {
+        "analyze-text": lambda i: {"method": "POST", "url": "/api/analyze-text", "json": {"text": LONG_TEXT}},
+        "sentiment-analysis": lambda i: {"method": "POST", "url": "/api/sentiment-analysis",
+                                         "json": {"text": f"{SHORT_TEXT} #{i}"}},
+        # Distinct prompts so every request reaches the stub rather than the response cache.
+        "generate-content": lambda i: {"method": "POST", "url": "/api/generate-content",
+                                       "json": {"type": "paragraph", "topic": f"benchmarks, take {i}"}},
+        "generate-content-stream": lambda i: {"method": "POST", "url": "/api/generate-content",
+                                              "json": {"type": "ideas", "topic": f"load tests, take {i}",
+                                                       "stream": True}},
+        "chat": lambda i: {"method": "POST", "url": "/api/chat", "json": {"message": f"Hello number {i}"}},
+        "status": lambda i: {"method": "GET", "url": "/api/status"},
+    }
+
+
+# Environment variables run_http sets for the app; restored when it returns.
+_HTTP_ENV = ("TARGET_REPO_PATH", "OPENAI_API_KEY", "OPENAI_API_BASE", "LLM_MAX_CONCURRENCY", "LLM_MAX_QUEUE",
+             "API_LOG_LEVEL")
+
+
+def run_http(requests_per_endpoint: int, concurrency: int, stub_latency: float,
+             endpoints: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    Serve the combined app on a local port (threaded werkzeug server) and drive each
+    endpoint with ``concurrency`` client threads. The load generator shares the
+    process, so absolute numbers are pessimistic; compare runs against each other.
+    """
+    import requests
+    from werkzeug.serving import make_server
+    from autonomous_agent import ExecutionLog
+
+    # The routes use the process-wide log; refuse to write benchmark rows into one already open.
+    if ExecutionLog._instance is not None:
+        raise RuntimeError("run_http needs its own execution log; close the shared ExecutionLog first")
+
+    saved_env = {name: os.environ.get(name) for name in _HTTP_ENV}
+    stub = StubOpenAIServer(stub_latency)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    tmpdir = tempfile.mkdtemp(prefix="bench-http-")
+    os.environ.setdefault("TARGET_REPO_PATH", tmpdir)
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    os.environ["OPENAI_API_BASE"] = stub.url
+    os.environ.setdefault("LLM_MAX_CONCURRENCY", str(max(8, concurrency)))
+    os.environ.setdefault("LLM_MAX_QUEUE", str(max(32, concurrency * 4)))
+    # Per-request INFO lines would dominate the timings.
+    os.environ.setdefault("API_LOG_LEVEL", "WARNING")
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+
+    from app_factory import create_app
+    results: Dict[str, Any] = {}
+    server = log = None
+    try:
+        # Opened before the app so its routes use this throwaway database, which is closed below.
+        log = ExecutionLog(os.path.join(tmpdir, "execution_log.db"), archive_dir=os.path.join(tmpdir, "archive"))
+        server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f"http://127.0.0.1:{server.server_port}"
+        local = threading.local()
+
+        def call(build: Callable[[int], Dict[str, Any]], i: int):
+            session = getattr(local, "session", None)
+            if session is None:
+                session = local.session = requests.Session()
+            options = build(i)
+            options["url"] = base + options["url"]
+            start = time.perf_counter()
+            response = session.request(timeout=30, **options)
+            response.content  # streamed bodies count until the last event
+            return time.perf_counter() - start, response.status_code
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for name, build in _http_cases().items():
+                if endpoints and name not in endpoints:
+                    continue
+                list(pool.map(lambda i: call(build, i), range(min(concurrency, requests_per_endpoint))))
+                start = time.perf_counter()
+                outcomes = list(pool.map(lambda i: call(build, i), range(requests_per_endpoint)))
+                summary = summarize([seconds for seconds, _ in outcomes], time.perf_counter() - start)
+                summary["errors"] = sum(1 for _, status in outcomes if status >= 400)
+                summary["concurrency"] = concurrency
+                results[f"http.{name}"] = summary
+    finally:
+        if server is not None:
+            server.shutdown()
+        if log is not None:
+            log.close()
+        stub.shutdown()
+        for name, value in saved_env.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        shutil.rmtree(tmpdir, ignore_errors=True)
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    List results that got slower than ``baseline`` by more than ``tolerance``.
+
+    Only p50 and p99 of results present in both runs are compared.
+
+    Returns:
+        List[Dict[str, Any]]: {"name", "metric", "baseline", "current", "change"} per regression.
+    """
+    regressions = []
+    for name, result in current.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        for metric in ("p50_us", "p99_us"):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = new / old - 1
+            if change > tolerance:
+                regressions.append({"name": name, "metric": metric, "baseline": old, "current": new,
+                                    "change": round(change, 3)})
+    return regressions
+
+
+def run(suites: Sequence[str], rows: Sequence[int], iterations: int, inserts: int,
+        requests_per_endpoint: int, concurrency: int, stub_latency: float) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    if "micro" in suites:
+        results.update(run_micro(iterations))
+    if "db" in suites:
+        results.update(run_db(rows, iterations, inserts))
+    if "http" in suites:
+        results.update(run_http(requests_per_endpoint, concurrency, stub_latency))
+    return {
+        "meta": {
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "suites": list(suites),
+            "rows": list(rows),
+            "iterations": iterations,
+            "concurrency": concurrency
+        },
+        "results": results
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark text/sentiment functions, ExecutionLog and the HTTP API.")
+    parser.add_argument("--suites", default=",".join(SUITES), help="Comma-separated subset of: " + ", ".join(SUITES))
+    parser.add_argument("--rows", default="10000", help="Comma-separated table sizes for the db suite, e.g. 10000,1000000,10000000")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per micro/db benchmark")
+    parser.add_argument("--inserts", type=int, default=2000, help="log_execution calls per insert benchmark")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per HTTP endpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent HTTP clients")
+    parser.add_argument("--stub-latency", type=float, default=0.0, help="Seconds the OpenAI stub waits per call")
+    parser.add_argument("--output", help="Write JSON here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier --output file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Allowed p50/p99 slowdown before flagging, 0.1 = 10%%")
+    args = parser.parse_args(argv)
+
+    suites = [name.strip() for name in args.suites.split(",") if name.strip()]
+    unknown = [name for name in suites if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+    rows = [int(value) for value in args.rows.split(",") if value.strip()]
+
+    report = run(suites, rows, args.iterations, args.inserts, args.requests, args.concurrency, args.stub_latency)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["baseline"] = args.baseline
+        report["regressions"] = compare(report["results"], baseline.get("results", {}), args.tolerance)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if report.get("regressions"):
+        for item in report["regressions"]:
+            print(f"REGRESSION {item['name']} {item['metric']}: {item['baseline']} -> {item['current']} us "
+                  f"(+{item['change']:.0%})", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
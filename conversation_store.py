@@ -0,0 +1,200 @@
+import math
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+USER = "user"
+ASSISTANT = "assistant"
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+SUMMARY_PREFIX = "Earlier in this conversation: "
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token for English text)."""
+    return max(1, math.ceil(len(text) / 4))
+
+
+def _first_sentence(text: str, max_chars: int = 160) -> str:
+    sentence = _SENTENCE_END.split(" ".join(text.split()), 1)[0]
+    if len(sentence) > max_chars:
+        sentence = sentence[:max_chars - 3].rstrip() + "..."
+    return sentence
+
+
+class Turn:
+    __slots__ = ("role", "content", "tokens")
+
+    def __init__(self, role: str, content: str):
+        self.role = role
+        self.content = content
+        self.tokens = estimate_tokens(content)
+
+
+class Conversation:
+    """
+    Bounded history for one chat session.
+
+    Recent turns live in a ring buffer. Turns pushed out of it, or that no longer
+    fit the token budget when a prompt is built, are folded into a short extractive
+    summary (the first sentence of each turn), which itself is capped at
+    ``summary_tokens``. Building a prompt therefore costs O(max_turns) no matter how
+    long the conversation has been running.
+
+    Args:
+        conversation_id (str): Session key.
+        max_turns (int): Turns kept verbatim.
+        summary_tokens (int): Token cap for the summary of older turns.
+        clock (Callable): Time source for idle tracking.
+    """
+
+    def __init__(self, conversation_id: str, max_turns: int = 50, summary_tokens: int = 200,
+                 clock: Callable[[], float] = time.monotonic):
+        self.id = conversation_id
+        self.summary_tokens = summary_tokens
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._turns: Deque[Turn] = deque(maxlen=max_turns)
+        self._summary: Deque[str] = deque()
+        self._summary_size = 0
+        self.last_active = clock()
+
+    @property
+    def memory(self) -> List[str]:
+        """Verbatim turn contents, oldest first."""
+        with self._lock:
+            return [turn.content for turn in self._turns]
+
+    @property
+    def summary(self) -> str:
+        with self._lock:
+            return " ".join(self._summary)
+
+    def _fold(self, turn: Turn):
+        line = f"{'User' if turn.role == USER else 'Assistant'}: {_first_sentence(turn.content)}"
+        self._summary.append(line)
+        self._summary_size += estimate_tokens(line)
+        while self._summary_size > self.summary_tokens and len(self._summary) > 1:
+            self._summary_size -= estimate_tokens(self._summary.popleft())
+
+    def add_to_memory(self, content: str, role: str = USER):
+        """Append a turn, folding the oldest one into the summary when the buffer is full."""
+        with self._lock:
+            if len(self._turns) == self._turns.maxlen:
+                self._fold(self._turns[0])
+            self._turns.append(Turn(role, content))
+            self.last_active = self._clock()
+
+    def clear_memory(self):
+        with self._lock:
+            self._turns.clear()
+            self._summary.clear()
+            self._summary_size = 0
+
+    def build_messages(self, message: str, budget: int = 1500) -> List[Dict[str, str]]:
+        """
+        Chat messages for the next upstream call: summary, recent turns and ``message``.
+
+        Recent turns are included newest-first until ``budget`` tokens (counting the
+        new message and room for a full summary) would be exceeded; older turns are
+        compacted into the summary so later calls do not pay for them again.
+        """
+        with self._lock:
+            self.last_active = self._clock()
+            remaining = budget - estimate_tokens(message) - estimate_tokens(SUMMARY_PREFIX) - self.summary_tokens
+            keep = 0
+            for turn in reversed(self._turns):
+                if turn.tokens > remaining:
+                    break
+                remaining -= turn.tokens
+                keep += 1
+            while len(self._turns) > keep:
+                self._fold(self._turns.popleft())
+
+            messages = []
+            if self._summary:
+                messages.append({"role": "system", "content": SUMMARY_PREFIX + " ".join(self._summary)})
+            messages.extend({"role": turn.role, "content": turn.content} for turn in self._turns)
+            messages.append({"role": USER, "content": message})
+            return messages
+
+    def record_exchange(self, message: str, reply: str):
+        """Store a completed user message and assistant reply."""
+        self.add_to_memory(message, USER)
+        self.add_to_memory(reply, ASSISTANT)
+
+
+class ConversationStore:
+    """
+    In-memory conversation sessions bounded by count and idle time.
+
+    Sessions are kept in least-recently-used order. Creating one beyond
+    ``max_sessions`` evicts the least recently used, and every lookup first drops
+    sessions idle for longer than ``idle_ttl``; since LRU order is also idle order
+    that sweep only inspects the expired head of the list.
+
+    Args:
+        max_sessions (int): Sessions kept at once.
+        idle_ttl (float): Seconds without activity before a session is dropped.
+        max_turns (int): Verbatim turns per session.
+        summary_tokens (int): Token cap for each session's summary.
+        clock (Callable): Time source, injectable for tests.
+    """
+
+    def __init__(self, max_sessions: int = 1000, idle_ttl: float = 1800.0, max_turns: int = 50,
+                 summary_tokens: int = 200, clock: Callable[[], float] = time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_turns = max_turns
+        self.summary_tokens = summary_tokens
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, Conversation]" = OrderedDict()
+        self.evicted = 0
+
+    def _expire(self):
+        cutoff = self._clock() - self.idle_ttl
+        while self._sessions:
+            conversation = next(iter(self._sessions.values()))
+            if conversation.last_active > cutoff:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        with self._lock:
+            self._expire()
+            conversation = self._sessions.get(conversation_id)
+            if conversation is not None:
+                conversation.last_active = self._clock()
+                self._sessions.move_to_end(conversation_id)
+            return conversation
+
+    def get_or_create(self, conversation_id: Optional[str] = None) -> Tuple[Conversation, bool]:
+        """
+        Return the session for ``conversation_id``, creating it (with a fresh id if none is given).
+
+        Returns:
+            Tuple[Conversation, bool]: The session and whether it was newly created.
+        """
+        if conversation_id:
+            conversation = self.get(conversation_id)
+            if conversation is not None:
+                return conversation, False
+        conversation = Conversation(conversation_id or uuid.uuid4().hex, self.max_turns, self.summary_tokens,
+                                    self._clock)
+        with self._lock:
+            self._sessions[conversation.id] = conversation
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        return conversation, True
+
+    def delete(self, conversation_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(conversation_id, None) is not None
+
+    def __len__(self) -> int:
+        return len(self._sessions)
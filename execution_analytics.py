@@ -0,0 +1,101 @@
+from typing import Any, Dict, List, Optional
+
+# Length of the ISO-8601 timestamp prefix that identifies each bucket,
+# e.g. "2024-05-01T13:07" for a minute or "2024-05-01" for a day.
+GRANULARITIES = {
+    "minute": 16,
+    "hour": 13,
+    "day": 10,
+}
+
+# Percentiles use the nearest-rank method: the p-th percentile of n ordered values is
+# the value at rank ceil(p * n), i.e. the smallest value whose rank is >= p * n.
+# Everything is aggregated inside SQLite so only one row per bucket reaches Python.
+_BUCKETS_SQL = """
+    WITH filtered AS (
+        SELECT substr(timestamp, 1, :prefix) AS bucket, status, copilot_response_time AS rt
+        FROM executions
+        WHERE (:improvement_type IS NULL OR improvement_type = :improvement_type)
+          AND (:since IS NULL OR timestamp >= :since)
+          AND (:until IS NULL OR timestamp < :until)
+    ),
+    counts AS (
+        SELECT bucket,
+               COUNT(*) AS total,
+               SUM(status = 'success') AS success_count,
+               SUM(status = 'failure') AS failure_count,
+               AVG(rt) AS avg_rt
+        FROM filtered
+        GROUP BY bucket
+    ),
+    ranked AS (
+        SELECT bucket, rt,
+               ROW_NUMBER() OVER (PARTITION BY bucket ORDER BY rt) AS rn,
+               COUNT(*) OVER (PARTITION BY bucket) AS n
+        FROM filtered
+        WHERE rt IS NOT NULL
+    )
+    SELECT c.bucket, c.total, c.success_count, c.failure_count, c.avg_rt,
+           MIN(CASE WHEN r.rn >= 0.5 * r.n THEN r.rt END) AS p50,
+           MIN(CASE WHEN r.rn >= 0.9 * r.n THEN r.rt END) AS p90,
+           MIN(CASE WHEN r.rn >= 0.99 * r.n THEN r.rt END) AS p99
+    FROM counts c
+    LEFT JOIN ranked r ON r.bucket = c.bucket
+    GROUP BY c.bucket
+    ORDER BY c.bucket
+"""
+
+
+class ExecutionAnalytics:
+    """
+    Time-bucketed execution analytics computed in SQL on top of ExecutionLog.
+
+    Args:
+        log: The ExecutionLog whose connection pool is queried.
+    """
+
+    def __init__(self, log):
+        self.log = log
+
+    def buckets(
+        self,
+        granularity: str = "hour",
+        improvement_type: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Return per-bucket success/failure counts and response time percentiles.
+
+        Args:
+            granularity (str): "minute", "hour" or "day".
+            improvement_type (Optional[str]): Only include executions of this type.
+            since (Optional[str]): Inclusive lower bound, ISO-8601 UTC timestamp.
+            until (Optional[str]): Exclusive upper bound, ISO-8601 UTC timestamp.
+
+        Returns:
+            List[Dict[str, Any]]: One entry per non-empty bucket, oldest first.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+        params = {
+            "prefix": GRANULARITIES[granularity],
+            "improvement_type": improvement_type,
+            "since": since,
+            "until": until,
+        }
+        with self.log.pool.reader() as conn:
+            rows = conn.execute(_BUCKETS_SQL, params).fetchall()
+        return [
+            {
+                "bucket": row[0],
+                "total": row[1],
+                "success_count": row[2],
+                "failure_count": row[3],
+                "avg_copilot_response_time": row[4],
+                "p50_copilot_response_time": row[5],
+                "p90_copilot_response_time": row[6],
+                "p99_copilot_response_time": row[7]
+            }
+            for row in rows
+        ]
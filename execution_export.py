@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterable, Iterator, Sequence
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def to_ndjson(rows: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Yield one JSON document per row, newline-terminated."""
+    for row in rows:
+        yield json.dumps(row, separators=(",", ":")) + "\n"
+
+
+def to_csv(rows: Iterable[Dict[str, Any]], fields: Sequence[str]) -> Iterator[str]:
+    """Yield a CSV header followed by one line per row, reusing a single buffer."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(fields), extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+    for row in rows:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        yield buffer.getvalue()
+
+
+def _coalesce(chunks: Iterable[str], target_size: int = 64 * 1024) -> Iterator[str]:
+    # Group small per-row strings so the server writes ~64 KiB at a time.
+    pending, size = [], 0
+    for chunk in chunks:
+        pending.append(chunk)
+        size += len(chunk)
+        if size >= target_size:
+            yield "".join(pending)
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending)
+
+
+def export(rows: Iterable[Dict[str, Any]], fmt: str, fields: Sequence[str]) -> Iterator[str]:
+    """
+    Serialize rows lazily in the requested format.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): Rows to export, typically a generator.
+        fmt (str): "ndjson" or "csv".
+        fields (Sequence[str]): Column order for CSV output.
+
+    Returns:
+        Iterator[str]: Chunks suitable for a streaming response.
+    """
+    if fmt == "ndjson":
+        return _coalesce(to_ndjson(rows))
+    if fmt == "csv":
+        return _coalesce(to_csv(rows, fields))
+    raise ValueError(f"format must be one of {', '.join(EXPORT_FORMATS)}")
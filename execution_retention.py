@@ -0,0 +1,261 @@
+import datetime
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PREFIX = "executions-"
+
+_ARCHIVE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS archive.executions (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        status TEXT NOT NULL,
+        files_changed TEXT,
+        improvement_type TEXT,
+        copilot_response_time REAL,
+        error_message TEXT
+    )
+"""
+
+_ARCHIVE_STATS_SQL = """
+    INSERT INTO execution_stats_archived (dimension, key, count, response_count, response_sum, response_min, response_max)
+    SELECT {dimension}, {key}, COUNT(*), COUNT(copilot_response_time), COALESCE(SUM(copilot_response_time), 0),
+           MIN(copilot_response_time), MAX(copilot_response_time)
+    FROM main.executions WHERE {where} GROUP BY {key}
+    ON CONFLICT (dimension, key) DO UPDATE SET
+        count = count + excluded.count,
+        response_count = response_count + excluded.response_count,
+        response_sum = response_sum + excluded.response_sum,
+        response_min = MIN(COALESCE(response_min, excluded.response_min), COALESCE(excluded.response_min, response_min)),
+        response_max = MAX(COALESCE(response_max, excluded.response_max), COALESCE(excluded.response_max, response_max))
+"""
+
+
+class RetentionPolicy:
+    """
+    Limits on how much history stays in the live executions table.
+
+    Args:
+        max_age_days (Optional[float]): Archive rows older than this many days.
+        max_rows (Optional[int]): Keep at most this many newest rows live.
+    """
+
+    def __init__(self, max_age_days: Optional[float] = None, max_rows: Optional[int] = None):
+        if max_rows is not None and max_rows < 0:
+            raise ValueError("max_rows must not be negative")
+        self.max_age_days = max_age_days
+        self.max_rows = max_rows
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_age_days is not None or self.max_rows is not None
+
+
+def default_archive_dir(db_path: str) -> Optional[Path]:
+    """Archive directory next to the live database, e.g. execution_log_archive/."""
+    if db_path == ":memory:":
+        return None
+    path = Path(db_path)
+    return path.with_name(f"{path.stem}_archive")
+
+
+def list_archives(archive_dir: Optional[Path]) -> List[Path]:
+    """Per-month archive databases, newest month first."""
+    if archive_dir is None or not archive_dir.is_dir():
+        return []
+    return sorted(archive_dir.glob(f"{ARCHIVE_PREFIX}*.db"), reverse=True)
+
+
+def read_archived(archive_dir: Optional[Path], fields: Sequence[str], limit: int) -> List[Dict[str, Any]]:
+    """Return up to ``limit`` archived executions, newest first, across month partitions."""
+    rows: List[Dict[str, Any]] = []
+    for path in list_archives(archive_dir):
+        if len(rows) >= limit:
+            break
+        conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            fetched = conn.execute(
+                f"SELECT {', '.join(fields)} FROM executions ORDER BY id DESC LIMIT ?", (limit - len(rows),)
+            ).fetchall()
+        finally:
+            conn.close()
+        rows.extend(dict(zip(fields, row)) for row in fetched)
+    return rows
+
+
+def _next_month(month: str) -> str:
+    year, mon = int(month[:4]), int(month[5:7])
+    return f"{year + mon // 12:04d}-{mon % 12 + 1:02d}"
+
+
+class RetentionManager:
+    """
+    Moves executions that fall outside a RetentionPolicy into per-month archive
+    databases (``executions-YYYY-MM.db``) and reclaims the freed pages.
+
+    Rows are moved in chunks of at most ``chunk_size`` ids, and the writer is taken
+    per chunk so logging is never blocked for a whole pass. Each chunk is first
+    committed to its archive with INSERT OR IGNORE on the original id, then, in a
+    second transaction, deleted from the live table together with folding its
+    aggregates into execution_stats_archived. Only rows already present in the
+    archive are deleted, so a crash between the two steps leaves a row in both places
+    (never in neither) and re-running the pass finishes the move; stats across live
+    and archived data stay O(1).
+
+    Args:
+        log: The ExecutionLog to apply the policy to.
+        policy (RetentionPolicy): What to keep live.
+        archive_dir (Optional[Path]): Where archives are written. Defaults to log.archive_dir.
+        interval (float): Seconds between background passes.
+        vacuum_pages (int): Pages released per PRAGMA incremental_vacuum step.
+        chunk_size (int): Most rows moved per writer hold.
+    """
+
+    def __init__(self, log, policy: RetentionPolicy, archive_dir: Optional[Path] = None,
+                 interval: float = 3600.0, vacuum_pages: int = 2000, chunk_size: int = 5000):
+        self.log = log
+        self.policy = policy
+        self.archive_dir = archive_dir or log.archive_dir
+        self.interval = interval
+        self.vacuum_pages = vacuum_pages
+        self.chunk_size = chunk_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _where(self, conn: sqlite3.Connection):
+        clauses, params = [], []
+        if self.policy.max_age_days is not None:
+            cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=self.policy.max_age_days)
+            clauses.append("timestamp < ?")
+            params.append(cutoff.isoformat())
+        if self.policy.max_rows is not None:
+            row = conn.execute(
+                "SELECT id FROM executions ORDER BY id DESC LIMIT 1 OFFSET ?", (self.policy.max_rows,)
+            ).fetchone()
+            if row is not None:
+                clauses.append("id <= ?")
+                params.append(row[0])
+        return (" OR ".join(clauses), params) if clauses else (None, [])
+
+    def _copy_chunk(self, conn: sqlite3.Connection, where: str, params: List[Any]):
+        """Commit the chunk's rows into the attached archive."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(f"INSERT OR IGNORE INTO archive.executions SELECT * FROM main.executions WHERE {where}", params)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _delete_chunk(self, conn: sqlite3.Connection, where: str, params: List[Any]) -> int:
+        """Fold the archived rows' aggregates and delete them from the live table."""
+        where = f"{where} AND id IN (SELECT id FROM archive.executions)"
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(_ARCHIVE_STATS_SQL.format(dimension="'status'", key="status", where=where), params)
+            conn.execute(
+                _ARCHIVE_STATS_SQL.format(dimension="'improvement_type'",
+                                          key="COALESCE(improvement_type, '')", where=where),
+                params
+            )
+            moved = conn.execute(f"DELETE FROM main.executions WHERE {where}", params).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return moved
+
+    def _move_chunk(self, month: str, where: str, params: List[Any]) -> Optional[int]:
+        """Move the next chunk of ``month``; None once the month has nothing left."""
+        with self.log.pool.writer() as conn:
+            last_id = conn.execute(
+                f"SELECT MAX(id) FROM (SELECT id FROM executions WHERE {where} ORDER BY id LIMIT ?)",
+                [*params, self.chunk_size]
+            ).fetchone()[0]
+            if last_id is None:
+                return None
+            chunk_where, chunk_params = f"{where} AND id <= ?", [*params, last_id]
+            conn.execute("ATTACH DATABASE ? AS archive", (str(self.archive_dir / f"{ARCHIVE_PREFIX}{month}.db"),))
+            try:
+                conn.execute(_ARCHIVE_TABLE_SQL)
+                self._copy_chunk(conn, chunk_where, chunk_params)
+                return self._delete_chunk(conn, chunk_where, chunk_params)
+            finally:
+                conn.execute("DETACH DATABASE archive")
+
+    def apply(self) -> int:
+        """
+        Archive every row outside the policy.
+
+        Returns:
+            int: Number of rows moved out of the live table.
+        """
+        if not self.policy.enabled or self.archive_dir is None:
+            return 0
+        self.log.flush()
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        with self.log.pool.reader() as conn:
+            where, params = self._where(conn)
+            if where is None:
+                return 0
+            months = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT substr(timestamp, 1, 7) FROM executions WHERE {where}", params
+            )]
+        moved = 0
+        for month in months:
+            month_where = f"({where}) AND timestamp >= ? AND timestamp < ?"
+            month_params = [*params, month, _next_month(month)]
+            while True:
+                count = self._move_chunk(month, month_where, month_params)
+                if not count:
+                    break
+                moved += count
+        if moved:
+            logger.info("Archived %d executions into %s", moved, self.archive_dir)
+        return moved
+
+    def vacuum(self) -> bool:
+        """
+        Release free pages with PRAGMA incremental_vacuum.
+
+        Returns False when the database was created without auto_vacuum=INCREMENTAL;
+        such files need a one-off ``VACUUM`` after setting the pragma.
+        """
+        with self.log.pool.writer() as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                return False
+            conn.execute(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})").fetchall()
+        return True
+
+    def run_once(self) -> int:
+        moved = self.apply()
+        if moved:
+            self.vacuum()
+        return moved
+
+    def _run(self):
+        while True:
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("Execution log retention pass failed")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        """Run a pass immediately and then every ``interval`` seconds on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="execution-log-retention", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,153 @@
+import sqlite3
+from typing import List, Tuple
+
+# Each migration is (version, statements). Versions must be strictly increasing and
+# a migration must never be edited once released; add a new one instead.
+MIGRATIONS: List[Tuple[int, List[str]]] = [
+    (1, [
+        """
+        CREATE TABLE IF NOT EXISTS executions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp TEXT NOT NULL,
+            status TEXT NOT NULL,
+            files_changed TEXT,
+            improvement_type TEXT,
+            copilot_response_time REAL,
+            error_message TEXT
+        )
+        """,
+    ]),
+    (2, [
+        "CREATE INDEX IF NOT EXISTS idx_executions_status ON executions (status)",
+        "CREATE INDEX IF NOT EXISTS idx_executions_timestamp ON executions (timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_executions_improvement_type ON executions (improvement_type)",
+    ]),
+    (3, [
+        # Running aggregates per (dimension, key), e.g. ('status', 'success') or
+        # ('improvement_type', 'refactor'). NULL improvement types are stored as ''.
+        """
+        CREATE TABLE IF NOT EXISTS execution_stats (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            response_count INTEGER NOT NULL DEFAULT 0,
+            response_sum REAL NOT NULL DEFAULT 0,
+            response_min REAL,
+            response_max REAL,
+            PRIMARY KEY (dimension, key)
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_executions_stats_insert
+        AFTER INSERT ON executions
+        BEGIN
+            INSERT INTO execution_stats (dimension, key, count, response_count, response_sum, response_min, response_max)
+            VALUES
+                ('status', NEW.status, 1, NEW.copilot_response_time IS NOT NULL,
+                 COALESCE(NEW.copilot_response_time, 0), NEW.copilot_response_time, NEW.copilot_response_time),
+                ('improvement_type', COALESCE(NEW.improvement_type, ''), 1, NEW.copilot_response_time IS NOT NULL,
+                 COALESCE(NEW.copilot_response_time, 0), NEW.copilot_response_time, NEW.copilot_response_time)
+            ON CONFLICT (dimension, key) DO UPDATE SET
+                count = count + 1,
+                response_count = response_count + excluded.response_count,
+                response_sum = response_sum + excluded.response_sum,
+                response_min = MIN(COALESCE(response_min, excluded.response_min), COALESCE(excluded.response_min, response_min)),
+                response_max = MAX(COALESCE(response_max, excluded.response_max), COALESCE(excluded.response_max, response_max));
+        END
+        """,
+        # Backfill from rows written before the rollup existed.
+        """
+        INSERT INTO execution_stats (dimension, key, count, response_count, response_sum, response_min, response_max)
+        SELECT 'status', status, COUNT(*), COUNT(copilot_response_time), COALESCE(SUM(copilot_response_time), 0),
+               MIN(copilot_response_time), MAX(copilot_response_time)
+        FROM executions GROUP BY status
+        """,
+        """
+        INSERT INTO execution_stats (dimension, key, count, response_count, response_sum, response_min, response_max)
+        SELECT 'improvement_type', COALESCE(improvement_type, ''), COUNT(*), COUNT(copilot_response_time),
+               COALESCE(SUM(copilot_response_time), 0), MIN(copilot_response_time), MAX(copilot_response_time)
+        FROM executions GROUP BY COALESCE(improvement_type, '')
+        """,
+    ]),
+    (4, [
+        # Keep the live rollup in step when retention moves rows out. min/max can't be
+        # un-applied incrementally, so they remain bounds over every row ever inserted.
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_executions_stats_delete
+        AFTER DELETE ON executions
+        BEGIN
+            UPDATE execution_stats SET
+                count = count - 1,
+                response_count = response_count - (OLD.copilot_response_time IS NOT NULL),
+                response_sum = response_sum - COALESCE(OLD.copilot_response_time, 0)
+            WHERE (dimension = 'status' AND key = OLD.status)
+               OR (dimension = 'improvement_type' AND key = COALESCE(OLD.improvement_type, ''));
+        END
+        """,
+        # Same shape as execution_stats, accumulating the rows moved to archive databases.
+        """
+        CREATE TABLE IF NOT EXISTS execution_stats_archived (
+            dimension TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            response_count INTEGER NOT NULL DEFAULT 0,
+            response_sum REAL NOT NULL DEFAULT 0,
+            response_min REAL,
+            response_max REAL,
+            PRIMARY KEY (dimension, key)
+        ) WITHOUT ROWID
+        """,
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Return the applied schema version, or 0 for a database without a version table."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not exists:
+        return 0
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Bring the database up to LATEST_VERSION, one transaction per migration.
+
+    Databases created before versioning existed report version 0; the first
+    migration only uses IF NOT EXISTS so they upgrade in place. Each migration
+    runs under BEGIN IMMEDIATE and re-reads the version, so two processes
+    opening the same file can't apply a migration twice.
+
+    Args:
+        conn (sqlite3.Connection): Writable connection, not inside a transaction.
+
+    Returns:
+        int: The schema version after migrating.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    current = get_schema_version(conn)
+    for version, statements in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if get_schema_version(conn) < version:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute("INSERT INTO schema_version (version) VALUES (?)", (version,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        current = version
+    return current
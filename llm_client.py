@@ -0,0 +1,296 @@
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from metrics import REGISTRY, timed
+
+DEFAULT_API_BASE = "https://api.openai.com/v1"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+LLM_SECONDS = REGISTRY.histogram(
+    "llm_request_duration_seconds",
+    "Upstream chat-completion latency including slot wait and retries (time to first byte for streams).",
+    ("operation",)
+)
+LLM_ERRORS = REGISTRY.counter("llm_request_errors_total", "Upstream calls that raised.", ("operation",))
+
+
+class Overloaded(Exception):
+    """Raised when the client's wait queue is full; callers should answer 429 with Retry-After."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMError(Exception):
+    """Upstream returned an error that retries did not resolve."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+def _error_message(response: requests.Response) -> str:
+    try:
+        return response.json()["error"]["message"]
+    except (ValueError, KeyError, TypeError):
+        return f"HTTP {response.status_code}"
+
+
+class _DeltaStream:
+    """
+    Iterator of text deltas from a streaming response that owns an LLMClient slot.
+
+    Unlike a generator, close() (or garbage collection) releases the slot and the
+    response even when iteration never started.
+    """
+
+    def __init__(self, response: requests.Response, release: Callable[[], None]):
+        self._closed = False
+        self._response = response
+        self._release = release
+        self._lines = response.iter_lines(decode_unicode=True)
+
+    def __iter__(self) -> "_DeltaStream":
+        return self
+
+    def __next__(self) -> str:
+        if self._closed:
+            raise StopIteration
+        try:
+            for raw in self._lines:
+                if not raw or not raw.startswith("data:"):
+                    continue
+                data = raw[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                token = json.loads(data)["choices"][0].get("delta", {}).get("content")
+                if token:
+                    return token
+        except BaseException:
+            self.close()
+            raise
+        self.close()
+        raise StopIteration
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._response.close()
+        finally:
+            self._release()
+
+    def __del__(self):
+        self.close()
+
+
+class LLMClient:
+    """
+    Chat-completions client shared by every request thread.
+
+    One keep-alive requests.Session with a sized connection pool is reused for all
+    calls. At most ``max_concurrency`` calls are in flight; up to ``max_queue`` more
+    wait for a slot (at most ``queue_timeout`` seconds) and anything beyond that is
+    rejected at once with Overloaded, so a traffic spike sheds load instead of
+    parking every worker thread on upstream. 429 and 5xx responses and connection
+    errors are retried with exponential backoff and full jitter, honoring
+    Retry-After when upstream sends it.
+
+    Args:
+        api_key (Optional[str]): Bearer token; checked at call time.
+        base_url (str): API root, e.g. a local mock server in tests.
+        timeout (float): Seconds to wait for connect and for each read.
+        max_concurrency (int): Calls allowed in flight at once.
+        max_queue (int): Calls allowed to wait for a slot.
+        queue_timeout (float): Seconds a queued call waits before giving up.
+        max_retries (int): Retries after the first attempt.
+        backoff_base (float): Backoff cap for the first retry, doubled each attempt.
+        backoff_max (float): Upper bound for any single backoff.
+        sleep (Callable): Sleep function, injectable for tests.
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = DEFAULT_API_BASE,
+        timeout: float = 60.0,
+        max_concurrency: int = 8,
+        max_queue: int = 32,
+        queue_timeout: float = 10.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.in_flight = 0
+        self.rejected = 0
+        self.retries = 0
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    @classmethod
+    def from_env(cls) -> "LLMClient":
+        """Build a client from OPENAI_API_KEY, OPENAI_API_BASE and the LLM_* tuning variables."""
+        return cls(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_API_BASE", DEFAULT_API_BASE),
+            timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+            max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+            max_queue=int(os.getenv("LLM_MAX_QUEUE", "32")),
+            queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT", "10")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "3"))
+        )
+
+    def _acquire(self):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    self.rejected += 1
+                    raise Overloaded(f"{self._waiting} upstream calls already queued", self.queue_timeout)
+                self._waiting += 1
+            try:
+                acquired = self._slots.acquire(timeout=self.queue_timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected += 1
+                raise Overloaded("Timed out waiting for an upstream slot", self.queue_timeout)
+        with self._lock:
+            self.in_flight += 1
+
+    def _release(self):
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    @contextmanager
+    def slot(self):
+        """Hold one concurrency slot for the duration of the block."""
+        self._acquire()
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _post(self, payload: Dict[str, Any], stream: bool = False) -> requests.Response:
+        """POST to /chat/completions, retrying rate limits, 5xx and connection failures."""
+        if not self.api_key:
+            raise ValueError("OpenAI API key not set.")
+        url = f"{self.base_url}/chat/completions"
+        headers = {"Authorization": f"Bearer {self.api_key}"}
+        attempt = 0
+        while True:
+            try:
+                response = self.session.post(url, json=payload, headers=headers, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise LLMError(f"Upstream unreachable: {e}")
+                delay = self._backoff(attempt, None)
+            else:
+                if response.status_code < 400:
+                    return response
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    message = _error_message(response)
+                    response.close()
+                    raise LLMError(message, response.status_code)
+                delay = self._backoff(attempt, _retry_after_seconds(response))
+                response.close()
+            attempt += 1
+            with self._lock:
+                self.retries += 1
+            self._sleep(delay)
+
+    def chat(self, messages: List[Dict[str, str]], **params: Any) -> str:
+        """
+        Run a chat completion and return the stripped reply text.
+
+        Raises:
+            Overloaded: If no slot frees up (respond 429).
+            LLMError: If upstream keeps failing.
+        """
+        with timed(LLM_SECONDS, LLM_ERRORS, operation="chat"), self.slot():
+            response = self._post({"messages": messages, **params})
+            try:
+                return response.json()["choices"][0]["message"]["content"].strip()
+            except (ValueError, KeyError, IndexError, TypeError):
+                raise LLMError("Malformed completion response", response.status_code)
+
+    def stream_chat(self, messages: List[Dict[str, str]], **params: Any) -> Iterator[str]:
+        """
+        Start a streaming chat completion and return an iterator of text deltas.
+
+        The slot is taken and the upstream response opened before this returns, so
+        Overloaded and upstream errors surface while the caller can still send a
+        proper status code. The slot is released when the iterator is exhausted, closed
+        or garbage collected, whether or not it was ever iterated.
+        """
+        with timed(LLM_SECONDS, LLM_ERRORS, operation="stream"):
+            self._acquire()
+            try:
+                response = self._post({"messages": messages, "stream": True, **params}, stream=True)
+            except BaseException:
+                self._release()
+                raise
+        return _DeltaStream(response, self._release)
+
+    def complete(self, prompt: str, **params: Any) -> str:
+        """Single-message shortcut for chat()."""
+        return self.chat([{"role": "user", "content": prompt}], **params)
+
+    def stream(self, prompt: str, **params: Any) -> Iterator[str]:
+        """Single-message shortcut for stream_chat()."""
+        return self.stream_chat([{"role": "user", "content": prompt}], **params)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": self._waiting,
+            "rejected": self.rejected,
+            "retries": self.retries
+        }
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,217 @@
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+RUN_MARKER = "AUTONOMOUS COMMIT AGENT - EXECUTION STARTED"
+
+
+def _parse_run_time(line: str) -> Optional[str]:
+    if RUN_MARKER not in line:
+        return None
+    try:
+        return line.split("Time:")[1].strip()
+    except Exception:
+        return None
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n")
+
+
+class LogIndex:
+    """
+    Incremental reader for an append-only log file shared by dashboard requests.
+
+    Tails are read by seeking backwards from the end of the file. The latest
+    "EXECUTION STARTED" timestamp is found once by a backwards scan and afterwards
+    kept current by parsing only bytes appended since the previous call, so the cost
+    of a request depends on how much the log grew, not on its total size. A changed
+    inode or a file smaller than the last scanned offset is treated as rotation or
+    truncation and triggers a rescan.
+
+    Args:
+        path (Path): Log file to index.
+        block_size (int): Bytes read per seek when scanning backwards.
+        history (int): Appended lines kept in memory for lines_since().
+    """
+
+    def __init__(self, path: Path, block_size: int = 64 * 1024, history: int = 1000):
+        self.path = Path(path)
+        self.block_size = block_size
+        self.generation = 0
+        self._history: deque = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._offset = 0
+        self._size = 0
+        self._mtime = 0.0
+        self._last_run: Optional[str] = None
+        self._tail_cache: dict = {}
+
+    def _reset(self, file_id: Optional[Tuple[int, int]]):
+        if file_id != self._file_id or self._offset:
+            self.generation += 1
+        self._history.clear()
+        self._file_id = file_id
+        self._offset = 0
+        self._size = 0
+        self._mtime = 0.0
+        self._last_run = None
+        self._tail_cache.clear()
+
+    def _reverse_blocks(self, f, end: int) -> Iterator[Tuple[int, bytes]]:
+        position = end
+        while position > 0:
+            start = max(position - self.block_size, 0)
+            f.seek(start)
+            yield start, f.read(position - start)
+            position = start
+
+    def _scan_backwards_for_run(self, f, end: int) -> Optional[str]:
+        marker = RUN_MARKER.encode("utf-8")
+        carry = b""
+        for start, block in self._reverse_blocks(f, end):
+            data = block + carry
+            lines = data.split(b"\n")
+            # The first piece may be the tail of a line that started in an earlier block.
+            carry = lines[0] if start > 0 else b""
+            complete = lines[1:] if start > 0 else lines
+            for raw in reversed(complete):
+                if marker in raw:
+                    run = _parse_run_time(_decode(raw))
+                    if run is not None:
+                        return run
+        return None
+
+    def _end_of_last_line(self, f, end: int) -> int:
+        for start, block in self._reverse_blocks(f, end):
+            index = block.rfind(b"\n")
+            if index >= 0:
+                return start + index + 1
+        return 0
+
+    def _scan_forward(self, f, start: int, end: int) -> int:
+        """Parse complete lines in [start, end) and return the offset after the last one."""
+        marker = RUN_MARKER.encode("utf-8")
+        f.seek(start)
+        offset = start
+        carry = b""
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(self.block_size, remaining))
+            if not block:
+                break
+            remaining -= len(block)
+            data = carry + block
+            last_newline = data.rfind(b"\n")
+            if last_newline < 0:
+                carry = data
+                continue
+            for raw in data[:last_newline].split(b"\n"):
+                offset += len(raw) + 1
+                line = _decode(raw).rstrip("\r")
+                self._history.append((offset, line))
+                if marker in raw:
+                    run = _parse_run_time(line)
+                    if run is not None:
+                        self._last_run = run
+            carry = data[last_newline + 1:]
+        return offset
+
+    def refresh(self) -> bool:
+        """
+        Bring the index up to date with the file on disk.
+
+        Returns:
+            bool: True if the log exists.
+        """
+        with self._lock:
+            return self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._reset(None)
+            return False
+
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._offset:
+            self._reset(file_id)
+            with open(self.path, "rb") as f:
+                self._last_run = self._scan_backwards_for_run(f, st.st_size)
+                # Later refreshes only parse what is appended after the last complete line.
+                self._offset = self._end_of_last_line(f, st.st_size)
+        elif st.st_size > self._offset:
+            with open(self.path, "rb") as f:
+                self._offset = self._scan_forward(f, self._offset, st.st_size)
+
+        if (st.st_size, st.st_mtime) != (self._size, self._mtime):
+            self._size, self._mtime = st.st_size, st.st_mtime
+            self._tail_cache.clear()
+        return True
+
+    def last_run_time(self) -> Optional[str]:
+        """Timestamp from the most recent "EXECUTION STARTED" line, if any."""
+        with self._lock:
+            self._refresh_locked()
+            return self._last_run
+
+    def tail_lines(self, lines: int = 10) -> Optional[List[str]]:
+        """
+        Return the last ``lines`` lines (with their newlines), or None if the log is missing.
+        """
+        with self._lock:
+            if not self._refresh_locked():
+                return None
+            cached = self._tail_cache.get(lines)
+            if cached is not None:
+                return cached
+            result = self._read_tail(lines)
+            self._tail_cache[lines] = result
+            return result
+
+    def _read_tail(self, lines: int) -> List[str]:
+        if lines <= 0:
+            return []
+        chunks: List[bytes] = []
+        newlines = 0
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+            for start, block in self._reverse_blocks(f, end):
+                chunks.append(block)
+                newlines += block.count(b"\n")
+                # One extra newline guarantees the earliest wanted line is complete.
+                if newlines > lines:
+                    break
+        data = _decode(b"".join(reversed(chunks)))
+        pieces = data.split("\n")
+        result = [piece + "\n" for piece in pieces[:-1]]
+        if pieces[-1]:
+            result.append(pieces[-1])
+        return result[-lines:]
+
+    def lines_since(self, generation: int, offset: int) -> Tuple[int, int, List[Tuple[int, str]]]:
+        """
+        Return lines appended after ``offset`` without touching the file.
+
+        Call refresh() first to pick up new data. If ``generation`` is stale (the file
+        was rotated or truncated since) every buffered line is returned. Lines older
+        than the in-memory history are not replayed.
+
+        Returns:
+            Tuple: (generation, offset to resume from, [(end_offset, line), ...]).
+        """
+        with self._lock:
+            if generation != self.generation:
+                offset = -1
+            lines = [item for item in self._history if item[0] > offset]
+            return self.generation, max(offset, self._offset), lines
+
+    @property
+    def offset(self) -> int:
+        """Byte offset up to which complete lines have been parsed."""
+        return self._offset
@@ -0,0 +1,159 @@
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from log_index import LogIndex
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(data: str, event: Optional[str] = None, event_id: Optional[str] = None) -> str:
+    """Format one server-sent event; multi-line data becomes several data: fields."""
+    parts = []
+    if event_id is not None:
+        parts.append(f"id: {event_id}")
+    if event is not None:
+        parts.append(f"event: {event}")
+    parts.extend(f"data: {line}" for line in data.split("\n"))
+    return "\n".join(parts) + "\n\n"
+
+
+def parse_event_id(value: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parse a "<generation>-<offset>" Last-Event-ID, or return None."""
+    if not value:
+        return None
+    try:
+        generation, offset = value.split("-", 1)
+        return int(generation), int(offset)
+    except ValueError:
+        return None
+
+
+class LogBroadcaster:
+    """
+    Fan out appended log lines and status changes to any number of SSE clients.
+
+    A single daemon thread polls the shared LogIndex and the status callback, so N
+    open dashboards cost one tail and one status probe rather than N. The thread
+    starts with the first subscriber and idles while nobody is connected.
+
+    Event ids are "<generation>-<byte offset>"; a reconnecting EventSource sends the
+    last one back as Last-Event-ID and resumes after that offset.
+
+    Args:
+        index (LogIndex): Index over the log file to follow.
+        status_fn (Callable): Returns the current status dict.
+        poll_interval (float): Seconds between log file checks.
+        status_interval (float): Seconds between status_fn calls.
+        heartbeat_interval (float): Seconds of silence before a heartbeat comment.
+    """
+
+    def __init__(
+        self,
+        index: LogIndex,
+        status_fn: Callable[[], Dict[str, Any]],
+        poll_interval: float = 0.5,
+        status_interval: float = 5.0,
+        heartbeat_interval: float = 15.0
+    ):
+        self.index = index
+        self.status_fn = status_fn
+        self.poll_interval = poll_interval
+        self.status_interval = status_interval
+        self.heartbeat_interval = heartbeat_interval
+        self._cond = threading.Condition()
+        self._version = 0
+        self._status: Optional[Dict[str, Any]] = None
+        self._status_version = 0
+        self._subscribers = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def subscribers(self) -> int:
+        return self._subscribers
+
+    def _publish(self):
+        with self._cond:
+            self._version += 1
+            self._cond.notify_all()
+
+    def _poll_status(self):
+        try:
+            status = self.status_fn()
+        except Exception:
+            logger.exception("Status probe failed")
+            return
+        if status != self._status:
+            with self._cond:
+                self._status = status
+                self._status_version += 1
+                self._version += 1
+                self._cond.notify_all()
+
+    def _run(self):
+        next_status = 0.0
+        offset = None
+        while True:
+            with self._cond:
+                while self._subscribers == 0:
+                    self._cond.wait()
+            self.index.refresh()
+            if self.index.offset != offset:
+                offset = self.index.offset
+                self._publish()
+            now = time.monotonic()
+            if now >= next_status:
+                self._poll_status()
+                next_status = now + self.status_interval
+            time.sleep(self.poll_interval)
+
+    def _ensure_started(self):
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-broadcaster", daemon=True)
+                self._thread.start()
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Iterator[str]:
+        """
+        Yield SSE frames for one client until the generator is closed.
+
+        Without a Last-Event-ID the stream starts at the current end of the log.
+        """
+        self._ensure_started()
+        with self._cond:
+            self._subscribers += 1
+            self._cond.notify_all()
+        try:
+            if self._status is None:
+                self._poll_status()
+            self.index.refresh()
+            cursor = parse_event_id(last_event_id)
+            if cursor is None:
+                cursor = (self.index.generation, self.index.offset)
+            seen_status = 0
+            seen_version = -1
+
+            yield "retry: 3000\n\n"
+            while True:
+                generation, offset, lines = self.index.lines_since(*cursor)
+                cursor = (generation, offset)
+                if lines:
+                    yield format_event(
+                        "\n".join(line for _, line in lines), event="log", event_id=f"{generation}-{lines[-1][0]}"
+                    )
+                if self._status_version != seen_status:
+                    seen_status = self._status_version
+                    yield format_event(json.dumps(self._status), event="status")
+
+                with self._cond:
+                    if self._version == seen_version:
+                        self._cond.wait(self.heartbeat_interval)
+                    idle = self._version == seen_version
+                    seen_version = self._version
+                if idle:
+                    yield ": heartbeat\n\n"
+        finally:
+            with self._cond:
+                self._subscribers -= 1
@@ -1,45 +1,231 @@
+import atexit
+import datetime
+import json
 import logging
-from typing import Optional
+import os
+import queue
+import random
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Callable, Dict, List, Optional, Tuple
+
+_listeners: Dict[str, QueueListener] = {}
+_listeners_lock = threading.Lock()
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a random ``rate`` fraction of records at or below ``max_level``; more
+    severe records always pass.
+
+    Args:
+        rate (float): Fraction of low-severity records to keep, 0..1.
+        max_level (int): Most severe level that is sampled.
+        rng (Callable): Returns a float in [0, 1); injectable for tests.
+    """
+
+    def __init__(self, rate: float, max_level: int = logging.INFO, rng: Callable[[], float] = random.random):
+        super().__init__()
+        self.rate = rate
+        self.max_level = max_level
+        self._rng = rng
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno > self.max_level or self._rng() < self.rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token-bucket limit per message template (the unformatted ``msg``) and level.
+
+    Each template may emit ``per_second`` records on average with bursts of up to
+    ``burst``. Records over the limit are dropped; the next one let through notes
+    how many similar messages were suppressed. Templates are only distinct when
+    callers use lazy %-style arguments rather than pre-formatted strings.
+
+    Args:
+        per_second (float): Sustained records per second per template.
+        burst (Optional[int]): Bucket size; defaults to max(1, per_second).
+        clock (Callable): Time source, injectable for tests.
+    """
+
+    def __init__(self, per_second: float, burst: Optional[int] = None, clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst if burst is not None else max(1, int(per_second))
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buckets: Dict[Tuple[str, int], List[float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (str(record.msg), record.levelno)
+        now = self._clock()
+        with self._lock:
+            # bucket = [tokens, last refill time, suppressed count]
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= 10000:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.per_second)
+            bucket[1] = now
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+            bucket[0] -= 1
+            suppressed, bucket[2] = bucket[2], 0
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar messages suppressed]"
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking or erroring when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _file_handler(log_file: str, max_bytes: int, when: Optional[str], backup_count: int) -> logging.Handler:
+    if max_bytes > 0:
+        return RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+    if when:
+        return TimedRotatingFileHandler(log_file, when=when, backupCount=backup_count, encoding="utf-8")
+    return logging.FileHandler(log_file, encoding="utf-8")
+
 
 def setup_logger(
     name: str,
     log_file: Optional[str] = None,
     level: int = logging.INFO,
-    fmt: str = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
+    fmt: str = "%(asctime)s - %(levelname)s - %(name)s - %(message)s",
+    async_mode: Optional[bool] = None,
+    max_bytes: Optional[int] = None,
+    when: Optional[str] = None,
+    backup_count: Optional[int] = None,
+    json_format: Optional[bool] = None,
+    sample_rate: Optional[float] = None,
+    rate_limit: Optional[float] = None,
+    queue_size: int = 10000
 ) -> logging.Logger:
     """
     Sets up and returns a logger with the specified name, log file, and level.
 
+    Options left as None fall back to environment variables, so deployments can
+    change logging without code changes.
+
     Args:
         name (str): Name of the logger.
         log_file (Optional[str]): If provided, logs will be written to this file.
         level (int): Logging level (e.g., logging.INFO, logging.DEBUG).
         fmt (str): Log message format.
+        async_mode (Optional[bool]): Hand records to a background listener thread
+            through a bounded queue so callers never wait on console or disk I/O
+            (LOG_ASYNC). Records are dropped, not blocked on, if the queue fills.
+        max_bytes (Optional[int]): Rotate the log file at this size (LOG_MAX_BYTES).
+        when (Optional[str]): Time-based rotation interval, e.g. "midnight" (LOG_ROTATE_WHEN).
+        backup_count (Optional[int]): Rotated files to keep (LOG_BACKUP_COUNT, default 5).
+        json_format (Optional[bool]): Emit one JSON object per line (LOG_JSON).
+        sample_rate (Optional[float]): Keep this fraction of INFO/DEBUG records (LOG_SAMPLE_RATE).
+        rate_limit (Optional[float]): Max records per second per message template (LOG_RATE_LIMIT).
+        queue_size (int): Capacity of the async queue.
 
     Returns:
         logging.Logger: Configured logger instance.
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    formatter = logging.Formatter(fmt)
+    if logger.handlers:
+        return logger
+
+    if async_mode is None:
+        async_mode = _env_flag("LOG_ASYNC")
+    if json_format is None:
+        json_format = _env_flag("LOG_JSON")
+    if max_bytes is None:
+        max_bytes = int(os.getenv("LOG_MAX_BYTES", "0"))
+    if when is None:
+        when = os.getenv("LOG_ROTATE_WHEN") or None
+    if backup_count is None:
+        backup_count = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    if sample_rate is None and os.getenv("LOG_SAMPLE_RATE"):
+        sample_rate = float(os.getenv("LOG_SAMPLE_RATE"))
+    if rate_limit is None and os.getenv("LOG_RATE_LIMIT"):
+        rate_limit = float(os.getenv("LOG_RATE_LIMIT"))
+
+    formatter = JsonFormatter() if json_format else logging.Formatter(fmt)
+
+    # Console handler
+    handlers: List[logging.Handler] = [logging.StreamHandler()]
+    # File handler if log_file is specified
+    if log_file:
+        handlers.append(_file_handler(log_file, max_bytes, when, backup_count))
+    for handler in handlers:
+        handler.setFormatter(formatter)
 
-    if not logger.handlers:
-        # Console handler
-        ch = logging.StreamHandler()
-        ch.setFormatter(formatter)
-        logger.addHandler(ch)
+    # Filters run in the calling thread, before anything is formatted or queued.
+    if sample_rate is not None and sample_rate < 1:
+        logger.addFilter(SamplingFilter(sample_rate))
+    if rate_limit:
+        logger.addFilter(RateLimitFilter(rate_limit))
 
-        # File handler if log_file is specified
-        if log_file:
-            fh = logging.FileHandler(log_file)
-            fh.setFormatter(formatter)
-            logger.addHandler(fh)
+    if async_mode:
+        queue_handler = _DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        logger.addHandler(queue_handler)
+        listener = QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+        listener.start()
+        with _listeners_lock:
+            _listeners[name] = listener
+    else:
+        for handler in handlers:
+            logger.addHandler(handler)
 
     return logger
 
+
+def shutdown_logging():
+    """Flush and stop every async listener; registered to run at interpreter exit."""
+    with _listeners_lock:
+        listeners = list(_listeners.values())
+        _listeners.clear()
+    for listener in listeners:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(shutdown_logging)
+
 # Example usage:
 if __name__ == "__main__":
     log = setup_logger("test_logger", "test.log", logging.DEBUG)
     log.info("Logger initialized.")
     log.debug("This is a debug message.")
-    log.error("This is an error message.")
\ No newline at end of file
+    log.error("This is an error message.")
@@ -0,0 +1,259 @@
+import heapq
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlite_pool import ConnectionPool
+
+EVICTION_POLICIES = ("lru", "importance")
+_TERM = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+_STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its me my of on or our so that the "
+    "this to was we were what when which who will with you your".split()
+)
+
+
+def terms(text: str) -> List[str]:
+    """Lower-cased word tokens of ``text`` minus common stopwords."""
+    return [term for term in _TERM.findall(text.lower()) if term not in _STOPWORDS]
+
+
+class _Entry:
+    __slots__ = ("id", "text", "importance", "tf", "length", "last_used")
+
+    def __init__(self, entry_id: int, text: str, importance: float, last_used: int):
+        self.id = entry_id
+        self.text = text
+        self.importance = importance
+        self.tf = Counter(terms(text))
+        self.length = max(1, sum(self.tf.values()))
+        self.last_used = last_used
+
+
+class MemoryStore(list):
+    """
+    Bounded agent memory that is still a plain list of strings, oldest first.
+
+    Alongside the list it keeps an inverted index (term -> {entry id: term count}),
+    so search() only scores memories sharing a term with the query and ranks them
+    by TF-IDF instead of scanning everything. Once ``capacity`` is exceeded the
+    least recently used memory is evicted ("lru"), or with "importance" the least
+    important one, ties going to the least recently used. Victims come from a heap
+    with lazy invalidation, so adding a memory costs O(log n) plus its terms.
+
+    With ``db_path`` every memory is also written to an ``agent_memory`` table and
+    reloaded on construction, so an agent keeps its memory across restarts. The
+    database can be execution_log.db itself; each ``namespace`` (agent) has its own
+    rows. Recency is not persisted: reloaded memories start in insertion order.
+
+    Append, extend, remove, pop, del and clear keep the index (and database) in
+    step; reordering or overwriting items in place is not supported.
+
+    Args:
+        capacity (int): Most memories kept; 0 means unbounded.
+        eviction (str): "lru" or "importance".
+        db_path (Optional[str]): SQLite file to persist to.
+        namespace (str): Owner of the rows in ``db_path``.
+    """
+
+    def __init__(self, capacity: int = 1000, eviction: str = "lru", db_path: Optional[str] = None,
+                 namespace: str = "default"):
+        super().__init__()
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"eviction must be one of {', '.join(EVICTION_POLICIES)}")
+        self.capacity = capacity
+        self.eviction = eviction
+        self.namespace = namespace
+        self._lock = threading.RLock()
+        self._ids: List[int] = []  # parallel to the list; ascending, so positions are found by bisect
+        self._entries: Dict[int, _Entry] = {}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._heap: List[Tuple[float, int, int]] = []
+        self._next_id = 1
+        self._clock = 0
+        self.evicted = 0
+        self.pool: Optional[ConnectionPool] = None
+        if db_path:
+            self.pool = ConnectionPool(db_path)
+            self._load()
+
+    # -- persistence -------------------------------------------------------
+
+    def _load(self):
+        with self.pool.writer() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS agent_memory (
+                    id INTEGER PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    importance REAL NOT NULL DEFAULT 1.0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_agent_memory_namespace ON agent_memory (namespace, id)")
+        with self.pool.reader() as conn:
+            rows = conn.execute(
+                "SELECT id, text, importance FROM agent_memory WHERE namespace = ? ORDER BY id",
+                (self.namespace,)
+            ).fetchall()
+        for entry_id, text, importance in rows:
+            self._index(entry_id, text, importance)
+        self._persist_delete(self._evict())
+
+    def _persist_delete(self, ids: List[int]):
+        if self.pool is not None and ids:
+            with self.pool.writer() as conn:
+                conn.executemany("DELETE FROM agent_memory WHERE id = ?", [(entry_id,) for entry_id in ids])
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+    # -- bookkeeping -------------------------------------------------------
+
+    def _priority(self, entry: _Entry) -> float:
+        return entry.importance if self.eviction == "importance" else 0.0
+
+    def _index(self, entry_id: int, text: str, importance: float) -> _Entry:
+        self._clock += 1
+        entry = _Entry(entry_id, text, importance, self._clock)
+        self._entries[entry_id] = entry
+        for term, count in entry.tf.items():
+            self._postings.setdefault(term, {})[entry_id] = count
+        heapq.heappush(self._heap, (self._priority(entry), entry.last_used, entry_id))
+        list.append(self, text)
+        self._ids.append(entry_id)
+        return entry
+
+    def _unindex(self, position: int) -> int:
+        entry_id = self._ids.pop(position)
+        list.__delitem__(self, position)
+        entry = self._entries.pop(entry_id)
+        for term in entry.tf:
+            postings = self._postings[term]
+            del postings[entry_id]
+            if not postings:
+                del self._postings[term]
+        return entry_id
+
+    def _touch(self, entry: _Entry):
+        self._clock += 1
+        entry.last_used = self._clock
+        heapq.heappush(self._heap, (self._priority(entry), entry.last_used, entry.id))
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(self._priority(e), e.last_used, e.id) for e in self._entries.values()]
+            heapq.heapify(self._heap)
+
+    def _evict(self) -> List[int]:
+        removed = []
+        while self.capacity and len(self._entries) > self.capacity:
+            _, last_used, entry_id = heapq.heappop(self._heap)
+            entry = self._entries.get(entry_id)
+            if entry is None or entry.last_used != last_used:
+                continue  # stale heap item: forgotten or touched since it was pushed
+            removed.append(self._unindex(bisect_left(self._ids, entry_id)))
+        self.evicted += len(removed)
+        return removed
+
+    # -- public API --------------------------------------------------------
+
+    def add(self, text: str, importance: float = 1.0) -> int:
+        """Store ``text`` and return its id, evicting if over capacity."""
+        with self._lock:
+            if self.pool is not None:
+                # Rowids are shared by every namespace but still ascend, which is all _ids needs.
+                with self.pool.writer() as conn:
+                    entry_id = conn.execute(
+                        "INSERT INTO agent_memory (namespace, text, importance) VALUES (?, ?, ?)",
+                        (self.namespace, text, importance)
+                    ).lastrowid
+            else:
+                entry_id = self._next_id
+                self._next_id += 1
+            self._index(entry_id, text, importance)
+            self._persist_delete(self._evict())
+            return entry_id
+
+    def search(self, query: str, k: int = 5) -> List[str]:
+        """
+        Return up to ``k`` memories most relevant to ``query``, best first.
+
+        Only memories sharing a term with the query are scored. Returned memories
+        count as used for LRU eviction.
+        """
+        query_terms = Counter(terms(query))
+        with self._lock:
+            total = len(self._entries)
+            scores: Dict[int, float] = {}
+            for term, query_count in query_terms.items():
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log((1 + total) / (1 + len(postings))) + 1
+                for entry_id, count in postings.items():
+                    scores[entry_id] = scores.get(entry_id, 0.0) + query_count * count * idf
+            best = heapq.nlargest(
+                k, scores.items(),
+                key=lambda item: (item[1] / math.sqrt(self._entries[item[0]].length), item[0])
+            )
+            results = []
+            for entry_id, _ in best:
+                entry = self._entries[entry_id]
+                self._touch(entry)
+                results.append(entry.text)
+            return results
+
+    def append(self, text: str):
+        self.add(text)
+
+    def extend(self, texts: Iterable[str]):
+        for text in texts:
+            self.add(text)
+
+    def __iadd__(self, texts: Iterable[str]) -> "MemoryStore":
+        self.extend(texts)
+        return self
+
+    def __delitem__(self, index: Any):
+        with self._lock:
+            positions = range(len(self))[index] if isinstance(index, slice) else [range(len(self))[index]]
+            removed = [self._unindex(position) for position in sorted(positions, reverse=True)]
+            self._persist_delete(removed)
+
+    def pop(self, index: int = -1) -> str:
+        with self._lock:
+            text = self[index]
+            del self[index]
+            return text
+
+    def remove(self, text: str):
+        with self._lock:
+            del self[self.index(text)]
+
+    def clear(self):
+        with self._lock:
+            list.clear(self)
+            self._ids.clear()
+            self._entries.clear()
+            self._postings.clear()
+            self._heap.clear()
+            if self.pool is not None:
+                with self.pool.writer() as conn:
+                    conn.execute("DELETE FROM agent_memory WHERE namespace = ?", (self.namespace,))
+
+    def _unsupported(self, *args, **kwargs):
+        raise TypeError("MemoryStore items cannot be reordered or replaced in place")
+
+    __setitem__ = insert = sort = reverse = __imul__ = _unsupported
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self),
+            "capacity": self.capacity,
+            "eviction": self.eviction,
+            "terms": len(self._postings),
+            "evicted": self.evicted,
+            "persistent": self.pool is not None
+        }
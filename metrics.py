@@ -0,0 +1,408 @@
+import functools
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from flask import Blueprint, Response, g, request
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Latency buckets in seconds, from sub-millisecond SQLite reads to multi-second LLM calls.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _ThreadToken:
+    """Lives in a thread's local storage; its finalizer runs when the thread exits."""
+    __slots__ = ("__weakref__",)
+
+
+class _Shards:
+    """
+    Per-thread arrays of floats that are summed on read.
+
+    Each thread increments only its own preallocated list, so the hot path takes no
+    lock; the lock is used once per thread to register its list and on collection.
+    When a thread exits its list is folded into a base total and dropped, so the
+    number of lists tracks live threads, not every thread ever seen.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._base = [0.0] * size
+        self._cells: Dict[int, List[float]] = {}
+
+    def cell(self) -> List[float]:
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = [0.0] * self.size
+            token = _ThreadToken()
+            with self._lock:
+                self._cells[id(token)] = cell
+            weakref.finalize(token, self._retire, id(token))
+            self._local.cell = cell
+            self._local.token = token
+            return cell
+
+    def _retire(self, key: int):
+        with self._lock:
+            cell = self._cells.pop(key)
+            for i, value in enumerate(cell):
+                self._base[i] += value
+
+    def totals(self) -> List[float]:
+        with self._lock:
+            totals = list(self._base)
+            cells = list(self._cells.values())
+        for cell in cells:
+            for i, value in enumerate(cell):
+                totals[i] += value
+        return totals
+
+
+class _CounterChild:
+    __slots__ = ("_shards",)
+
+    def __init__(self):
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1.0):
+        self._shards.cell()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "_shards")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self._bounds = bounds
+        # One slot per bucket, one for +Inf, one for the running sum.
+        self._shards = _Shards(len(bounds) + 2)
+
+    def observe(self, value: float):
+        cell = self._shards.cell()
+        cell[bisect_left(self._bounds, value)] += 1
+        cell[-1] += value
+
+    def snapshot(self) -> Tuple[List[float], float, float]:
+        """Return (cumulative bucket counts incl. +Inf, sum, count)."""
+        totals = self._shards.totals()
+        cumulative, running = [], 0.0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, totals[-1], running
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values: Any, **kwargs: Any):
+        """Return the child for one label combination (cache it on hot paths)."""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}")
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def children(self) -> List[Tuple[Tuple[str, ...], Any]]:
+        with self._lock:
+            return list(self._children.items())
+
+
+class Counter(_Metric):
+    """Monotonic counter, optionally labelled."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self._default.inc(amount)
+
+
+class Histogram(_Metric):
+    """Bucketed distribution (e.g. latencies in seconds), optionally labelled."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+
+class CallbackMetric:
+    """
+    Metric whose samples are read from a callback at scrape time, for values another
+    component already counts (e.g. cache hits).
+
+    Args:
+        fn (Callable): Returns {label value tuple: value}, or a single number if unlabelled.
+    """
+
+    def __init__(self, name: str, documentation: str, kind: str, fn: Callable[[], Any],
+                 labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.fn = fn
+
+
+class Registry:
+    """Named collection of metrics rendered together by /metrics."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+
+    def _get_or_add(self, name: str, factory: Callable[[], Any], kind: type):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            elif not isinstance(metric, kind):
+                raise ValueError(f"Metric {name} already registered as {type(metric).__name__}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_add(name, lambda: Counter(name, documentation, labelnames), Counter)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_add(name, lambda: Histogram(name, documentation, labelnames, buckets), Histogram)
+
+    def callback(self, name: str, documentation: str, kind: str, fn: Callable[[], Any],
+                 labelnames: Sequence[str] = ()) -> CallbackMetric:
+        """Register (or replace) a callback metric."""
+        metric = CallbackMetric(name, documentation, kind, fn, labelnames)
+        with self._lock:
+            self._metrics[name] = metric
+        return metric
+
+    def metrics(self) -> List[Any]:
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def get(self, name: str) -> Optional[Any]:
+        return self._metrics.get(name)
+
+
+REGISTRY = Registry()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _render_metric(metric: Any) -> Iterator[str]:
+    yield f"# HELP {metric.name} {metric.documentation}"
+    yield f"# TYPE {metric.name} {metric.kind}"
+    if isinstance(metric, CallbackMetric):
+        samples = metric.fn()
+        if not isinstance(samples, dict):
+            samples = {(): samples}
+        for values, value in samples.items():
+            if value is not None:
+                yield f"{metric.name}{_labels(metric.labelnames, values)} {_number(value)}"
+        return
+    for values, child in sorted(metric.children()):
+        if isinstance(metric, Counter):
+            yield f"{metric.name}{_labels(metric.labelnames, values)} {_number(child.value)}"
+            continue
+        cumulative, total, count = child.snapshot()
+        for bound, running in zip(metric.buckets + (float("inf"),), cumulative):
+            le = f'le="{_number(bound)}"'
+            yield f"{metric.name}_bucket{_labels(metric.labelnames, values, le)} {_number(running)}"
+        yield f"{metric.name}_sum{_labels(metric.labelnames, values)} {_number(total)}"
+        yield f"{metric.name}_count{_labels(metric.labelnames, values)} {_number(count)}"
+
+
+def render(registry: Registry = REGISTRY) -> str:
+    """Prometheus text exposition (version 0.0.4) of every metric in ``registry``."""
+    lines = []
+    for metric in registry.metrics():
+        lines.extend(_render_metric(metric))
+    return "\n".join(lines) + "\n"
+
+
+def _bind(metric: Any, labels: Dict[str, Any]) -> Any:
+    if not isinstance(metric, _Metric):
+        return metric
+    return metric.labels(**labels) if metric.labelnames else metric._default
+
+
+class timed:
+    """
+    Record elapsed seconds into a histogram, as a context manager or a decorator.
+
+        with timed(DB_QUERY_SECONDS, query="get_stats"):
+            ...
+
+        @timed(LLM_SECONDS, operation="chat", errors=LLM_ERRORS)
+        def chat(...): ...
+
+    The labelled child is resolved once when the timer is created. As a decorator
+    each call keeps its start time in a local, so one decorated function is safe
+    to call from many threads. On hot paths pass an already labelled child
+    (``HIST.labels(...)``) to skip the label lookup per ``with`` block.
+
+    Args:
+        histogram: A Histogram, or a child returned by its labels().
+        errors (Optional[Counter]): Incremented (same labels) when the block raises;
+            also accepts a labelled child.
+        **labels: Label values for both metrics.
+    """
+
+    __slots__ = ("_child", "_errors", "_start")
+
+    def __init__(self, histogram: Any, errors: Optional[Any] = None, **labels: Any):
+        self._child = _bind(histogram, labels)
+        self._errors = _bind(errors, labels) if errors is not None else None
+        self._start = 0.0
+
+    def __enter__(self) -> "timed":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(time.perf_counter() - self._start)
+        if exc_type is not None and self._errors is not None:
+            self._errors.inc()
+
+    def __call__(self, fn: Callable) -> Callable:
+        child, errors = self._child, self._errors
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                if errors is not None:
+                    errors.inc()
+                raise
+            finally:
+                child.observe(time.perf_counter() - start)
+        return wrapper
+
+
+HTTP_REQUESTS = REGISTRY.counter("http_requests_total", "HTTP requests handled.", ("endpoint", "method", "status"))
+HTTP_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "Time to produce a response (headers for streams).", ("endpoint",)
+)
+
+
+def instrument(target: Any):
+    """
+    Count and time every request routed to ``target`` (a Flask app or Blueprint),
+    labelled by endpoint name, method and status code.
+    """
+    @target.before_request
+    def _start_timer():
+        g._metrics_start = time.perf_counter()
+
+    @target.after_request
+    def _record(response):
+        start = g.pop("_metrics_start", None)
+        endpoint = request.endpoint or "unknown"
+        if start is not None:
+            HTTP_SECONDS.labels(endpoint).observe(time.perf_counter() - start)
+        HTTP_REQUESTS.labels(endpoint, request.method, response.status_code).inc()
+        return response
+
+    return target
+
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Prometheus scrape endpoint."""
+    return Response(render(), content_type=CONTENT_TYPE)
+
+
+def _benchmark(iterations: int = 200000) -> Dict[str, float]:
+    """Nanoseconds per call for each instrumentation primitive."""
+    registry = Registry()
+    counter = registry.counter("bench_total", "bench", ("route",)).labels("x")
+    histogram = registry.histogram("bench_seconds", "bench", ("route",))
+    child = histogram.labels("x")
+
+    def bare():
+        return None
+
+    decorated = timed(histogram, route="x")(bare)
+
+    def run(fn: Callable[[], Any]) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        return (time.perf_counter() - start) / iterations * 1e9
+
+    def context():
+        with timed(child):
+            pass
+
+    def context_labelled():
+        with timed(histogram, route="x"):
+            pass
+
+    baseline = run(bare)
+    return {
+        "counter.inc": run(counter.inc) - baseline,
+        "histogram.observe": run(lambda: child.observe(0.003)) - baseline,
+        "timed decorator": run(decorated) - baseline,
+        "timed context manager": run(context) - baseline,
+        "timed + label lookup": run(context_labelled) - baseline,
+    }
+
+
+if __name__ == "__main__":
+    for name, ns in _benchmark().items():
+        print(f"{name:24s} {ns / 1000:.2f} us/call")
@@ -1,40 +1,40 @@
 import os
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, request, jsonify
 from pathlib import Path
 from logging_utils import setup_logger
-from textblob import TextBlob
+import sentiment_service
+
+LOG_PATH = Path(os.getenv("TARGET_REPO_PATH", os.getcwd())) / "sentiment_analysis.log"
+logger = setup_logger("sentiment_analysis_api", str(LOG_PATH), level=os.getenv("API_LOG_LEVEL", "INFO"))
+bp = Blueprint("sentiment", __name__)
 
 def analyze_sentiment(text: str) -> dict:
-    """Analyze sentiment of the provided text using TextBlob."""
-    blob = TextBlob(text)
-    polarity = blob.sentiment.polarity
-    subjectivity = blob.sentiment.subjectivity
-    sentiment = "positive" if polarity > 0 else "negative" if polarity < 0 else "neutral"
+    """Analyze sentiment of the provided text using the shared sentiment engine."""
+    result = sentiment_service.get_engine().analyze(text, threshold=0)
     return {
-        "sentiment": sentiment,
-        "polarity": polarity,
-        "subjectivity": subjectivity
+        "sentiment": result["sentiment"],
+        "polarity": result["polarity"],
+        "subjectivity": result["subjectivity"]
     }
 
+@bp.route("/api/sentiment", methods=["POST"])
+def sentiment():
+    data = request.get_json()
+    if not data or "text" not in data:
+        logger.warning("No text provided for sentiment analysis.")
+        return jsonify({"error": "Missing 'text' in request body."}), 400
+    text = data["text"]
+    logger.info("Analyzing sentiment for text: %.100s...", text)
+    result = analyze_sentiment(text)
+    logger.info("Sentiment result: %s", result)
+    return jsonify(result)
+
 def new_feature():
-    '''Adds a Flask API endpoint for sentiment analysis of user-provided text.'''
+    '''Runs a standalone Flask app serving the sentiment analysis endpoint.'''
     app = Flask(__name__)
-    LOG_PATH = Path(os.getenv("TARGET_REPO_PATH", os.getcwd())) / "sentiment_analysis.log"
-    logger = setup_logger("sentiment_analysis_api", str(LOG_PATH), level=os.getenv("API_LOG_LEVEL", "INFO"))
-
-    @app.route("/api/sentiment", methods=["POST"])
-    def sentiment():
-        data = request.get_json()
-        if not data or "text" not in data:
-            logger.warning("No text provided for sentiment analysis.")
-            return jsonify({"error": "Missing 'text' in request body."}), 400
-        text = data["text"]
-        logger.info(f"Analyzing sentiment for text: {text[:100]}...")
-        result = analyze_sentiment(text)
-        logger.info(f"Sentiment result: {result}")
-        return jsonify(result)
-
+    app.register_blueprint(bp)
+    sentiment_service.preload()
     app.run(host="0.0.0.0", port=5050)
 
 if __name__ == "__main__":
-    new_feature()
\ No newline at end of file
+    new_feature()
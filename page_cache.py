@@ -0,0 +1,81 @@
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from flask import Response, current_app, render_template, request, session
+from jinja2 import Template
+
+_EXTENSION = "page_cache"
+
+
+class PageCache:
+    """
+    A dashboard page compiled once and re-rendered only when its data changes.
+
+    The template source is compiled on the first request of each app (compilation
+    needs the app's Jinja environment for url_for and get_flashed_messages) and kept
+    in ``app.extensions``. The rendered page is cached with a caller-supplied change
+    token: while the token is the same, requests get the cached HTML, or a bodiless
+    304 when their If-None-Match carries its ETag. Pages are sent with
+    ``Cache-Control: no-cache`` so browsers always revalidate.
+
+    Requests with pending flash messages bypass the cache; those messages belong in
+    this one response only.
+
+    Args:
+        source (str): Jinja template source.
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.not_modified = 0
+        self.renders = 0
+
+    def _state(self) -> Dict[str, Any]:
+        app = current_app._get_current_object()
+        pages = app.extensions.setdefault(_EXTENSION, {})
+        state = pages.get(id(self))
+        if state is None:
+            with self._lock:
+                state = pages.get(id(self))
+                if state is None:
+                    state = pages[id(self)] = {"template": app.jinja_env.from_string(self.source), "page": None}
+        return state
+
+    @property
+    def template(self) -> Template:
+        """The compiled template for the current app."""
+        return self._state()["template"]
+
+    def respond(self, token: Hashable, context: Callable[[], Dict[str, Any]]) -> Response:
+        """
+        Serve the page for ``token``, rendering it with ``context()`` only when needed.
+
+        Args:
+            token: Cheap value that changes whenever the rendered page would.
+            context (Callable): Builds the template variables; not called on a cache hit.
+        """
+        state = self._state()
+        if "_flashes" in session:
+            self.renders += 1
+            response = Response(render_template(state["template"], **context()), mimetype="text/html")
+            response.headers["Cache-Control"] = "no-store"
+            return response
+
+        page: Optional[Tuple[Hashable, str, str]] = state["page"]
+        if page is None or page[0] != token:
+            html = render_template(state["template"], **context())
+            etag = '"' + hashlib.sha1(html.encode("utf-8")).hexdigest()[:20] + '"'
+            page = state["page"] = (token, html, etag)
+            self.renders += 1
+        else:
+            self.hits += 1
+
+        _, html, etag = page
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in {tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")}:
+            self.not_modified += 1
+            return Response(status=304, headers=headers)
+        return Response(html, mimetype="text/html", headers=headers)
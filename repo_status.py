@@ -0,0 +1,254 @@
+import datetime
+import json
+import os
+import subprocess
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Tuple
+
+HEARTBEAT_FILENAME = "autonomous_agent.heartbeat"
+# Target repository used by the agent and the dashboard when TARGET_REPO_PATH is unset.
+DEFAULT_REPO_PATH = "C:\\Users\\ylax\\source\\repos\\testgreengithub\\test"
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _find_git_dirs(repo_path: Path) -> Tuple[Path, Path]:
+    """Return (git_dir, common_dir), following worktree "gitdir:" files."""
+    git_dir = repo_path / ".git"
+    if git_dir.is_file():
+        content = git_dir.read_text(encoding="utf-8").strip()
+        if content.startswith("gitdir:"):
+            git_dir = (repo_path / content[len("gitdir:"):].strip()).resolve()
+    common_dir = git_dir
+    commondir_file = git_dir / "commondir"
+    if commondir_file.is_file():
+        common_dir = (git_dir / commondir_file.read_text(encoding="utf-8").strip()).resolve()
+    return git_dir, common_dir
+
+
+def _format_commit(sha: str, raw: bytes) -> Optional[str]:
+    """Render a commit object like `git log -1 --pretty=format:"%h %ad %s" --date=short`."""
+    header, _, body = raw.partition(b"\x00")
+    if not header.startswith(b"commit "):
+        return None
+    text = body.decode("utf-8", errors="replace")
+    headers, _, message = text.partition("\n\n")
+    date = None
+    for line in headers.split("\n"):
+        if line.startswith("author "):
+            # author Name <email> 1700000000 +0200
+            _, timestamp, tz = line.rsplit(" ", 2)
+            sign = -1 if tz.startswith("-") else 1
+            offset = datetime.timedelta(hours=int(tz[1:3]), minutes=int(tz[3:5])) * sign
+            date = datetime.datetime.fromtimestamp(int(timestamp), datetime.timezone(offset)).date().isoformat()
+            break
+    if date is None:
+        return None
+    subject_lines = []
+    for line in message.split("\n"):
+        if not line.strip():
+            if subject_lines:
+                break
+            continue
+        subject_lines.append(line.strip())
+    return f"{sha[:7]} {date} {' '.join(subject_lines)}"
+
+
+class RepoStatus:
+    """
+    Last-commit summary for a repository, read from .git without forking git.
+
+    HEAD and the branch ref are resolved from their files (or packed-refs) and the
+    commit is read from its zlib-compressed loose object. The result is cached until
+    the mtime of HEAD, the loose ref or packed-refs changes, so repeated calls cost a
+    few stat() calls. Commits that only exist inside a pack file fall back to a single
+    `git log -1`, which is likewise cached until HEAD moves.
+
+    Args:
+        repo_path (str): Working tree root of the repository.
+    """
+
+    def __init__(self, repo_path: str):
+        self.repo_path = Path(repo_path)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._summary: Optional[str] = None
+
+    def _head_ref(self, git_dir: Path) -> Tuple[Optional[str], Optional[str]]:
+        """Return (ref name, sha); sha is set directly for a detached HEAD."""
+        head = (git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if head.startswith("ref:"):
+            return head[len("ref:"):].strip(), None
+        return None, head
+
+    def _resolve_ref(self, common_dir: Path, ref: str) -> Optional[str]:
+        loose = common_dir / ref
+        if loose.is_file():
+            return loose.read_text(encoding="utf-8").strip()
+        packed = common_dir / "packed-refs"
+        if packed.is_file():
+            with open(packed, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(("#", "^")):
+                        continue
+                    parts = line.strip().split(" ", 1)
+                    if len(parts) == 2 and parts[1] == ref:
+                        return parts[0]
+        return None
+
+    def _read_loose_commit(self, common_dir: Path, sha: str) -> Optional[str]:
+        path = common_dir / "objects" / sha[:2] / sha[2:]
+        try:
+            with open(path, "rb") as f:
+                return _format_commit(sha, zlib.decompress(f.read()))
+        except (OSError, zlib.error, ValueError):
+            return None
+
+    def _git_log(self) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                ["git", "-C", str(self.repo_path), "log", "-1", "--pretty=format:%h %ad %s", "--date=short"],
+                capture_output=True, text=True, check=True
+            )
+            return result.stdout.strip()
+        except Exception:
+            return None
+
+    def last_commit(self) -> Optional[str]:
+        """Return "<short sha> <YYYY-MM-DD> <subject>" for HEAD, or None."""
+        with self._lock:
+            try:
+                git_dir, common_dir = _find_git_dirs(self.repo_path)
+                ref, sha = self._head_ref(git_dir)
+            except OSError:
+                self._stamp, self._summary = None, None
+                return None
+
+            stamp = (
+                _mtime(git_dir / "HEAD"),
+                _mtime(common_dir / ref) if ref else None,
+                _mtime(common_dir / "packed-refs"),
+            )
+            if stamp == self._stamp:
+                return self._summary
+
+            if ref:
+                sha = self._resolve_ref(common_dir, ref)
+            summary = None
+            if sha:
+                summary = self._read_loose_commit(common_dir, sha) or self._git_log()
+            self._stamp, self._summary = stamp, summary
+            return summary
+
+
+class AgentHeartbeat:
+    """
+    Periodically touches a heartbeat file so dashboards can tell the agent is alive.
+
+    The file holds {"pid": ..., "time": ...} and is replaced atomically; it is removed
+    when the heartbeat stops. Use as a context manager around the agent's run loop.
+
+    Args:
+        path (Path): Heartbeat file, usually HEARTBEAT_FILENAME in the target repo.
+        interval (float): Seconds between writes.
+    """
+
+    def __init__(self, path: Path, interval: float = 5.0):
+        self.path = Path(path)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def beat(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(json.dumps({"pid": os.getpid(), "time": time.time()}), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.beat()
+            except OSError:
+                pass
+
+    def start(self):
+        self.beat()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="agent-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill on Windows terminates the target; trust the heartbeat age instead.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class AgentLiveness:
+    """
+    Cross-platform "is the agent running" check based on an AgentHeartbeat file.
+
+    The agent counts as running while the heartbeat is younger than ``stale_after``
+    and, where it can be checked, its pid still exists. Answers are cached for
+    ``cache_ttl`` seconds so status endpoints pay at most one stat() per window.
+
+    Args:
+        path (Path): Heartbeat file written by the agent.
+        stale_after (float): Seconds without a heartbeat before the agent counts as stopped.
+        cache_ttl (float): Seconds a computed answer is reused.
+    """
+
+    def __init__(self, path: Path, stale_after: float = 30.0, cache_ttl: float = 1.0):
+        self.path = Path(path)
+        self.stale_after = stale_after
+        self.cache_ttl = cache_ttl
+        self._checked_at = float("-inf")
+        self._running = False
+
+    def _check(self) -> bool:
+        try:
+            if time.time() - os.stat(self.path).st_mtime > self.stale_after:
+                return False
+            pid = json.loads(self.path.read_text(encoding="utf-8")).get("pid")
+        except (OSError, ValueError):
+            return False
+        return _pid_alive(int(pid)) if pid else True
+
+    def is_running(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at >= self.cache_ttl:
+            self._running = self._check()
+            self._checked_at = now
+        return self._running
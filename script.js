@@ -32,6 +32,8 @@ function initChat() {
     const chatInput = document.getElementById('chatInput');
     const sendButton = document.getElementById('sendButton');
     const chatMessages = document.getElementById('chatMessages');
+    // Returned by the server on the first reply; sent back so follow-ups keep their context.
+    let conversationId = null;
 
     async function sendMessage() {
         const message = chatInput.value.trim();
@@ -54,12 +56,19 @@ function initChat() {
         try {
             const response = await fetch('/api/chat', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ message })
+                headers: { 'Content-Type': 'application/json', 'Accept': 'text/event-stream, application/json' },
+                body: JSON.stringify({ message, stream: true, conversation_id: conversationId })
             });
+            const contentType = response.headers.get('Content-Type') || '';
+            if (contentType.includes('text/event-stream') && response.body) {
+                await renderStream(response, typingDiv);
+                return;
+            }
+            // Non-streaming fallback: wait for the full JSON reply.
             const data = await response.json();
             // Remove typing indicator
             chatMessages.removeChild(typingDiv);
+            if (data.conversation_id) conversationId = data.conversation_id;
             if (data.response) {
                 addMessage(data.response, 'assistant');
             } else if (data.error) {
@@ -68,11 +77,64 @@ function initChat() {
                 addMessage("Sorry, I didn't understand that.", 'assistant');
             }
         } catch (err) {
-            chatMessages.removeChild(typingDiv);
+            if (typingDiv.parentNode) chatMessages.removeChild(typingDiv);
             addMessage("Network error. Please try again.", 'assistant');
         }
     }
 
+    // Read server-sent events from the response body and append tokens as they arrive.
+    async function renderStream(response, typingDiv) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let content = null;
+        let finished = false;
+
+        function ensureMessage() {
+            if (!content) {
+                chatMessages.removeChild(typingDiv);
+                content = addMessage('', 'assistant');
+            }
+            return content;
+        }
+
+        function handleEvent(frame) {
+            let event = 'message';
+            const dataLines = [];
+            frame.split('\n').forEach(line => {
+                if (line.startsWith('event:')) event = line.slice(6).trim();
+                else if (line.startsWith('data:')) dataLines.push(line.slice(5).replace(/^ /, ''));
+            });
+            if (!dataLines.length) return;
+            const payload = JSON.parse(dataLines.join('\n'));
+            if (event === 'token') {
+                ensureMessage().textContent += payload.token;
+            } else if (event === 'done') {
+                if (payload.conversation_id) conversationId = payload.conversation_id;
+                ensureMessage().textContent = payload.response || "Sorry, I didn't understand that.";
+                finished = true;
+            } else if (event === 'error') {
+                ensureMessage().textContent = "Error: " + payload.error;
+                finished = true;
+            }
+            chatMessages.scrollTop = chatMessages.scrollHeight;
+        }
+
+        while (!finished) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            let boundary;
+            while ((boundary = buffer.indexOf('\n\n')) >= 0) {
+                handleEvent(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+            }
+        }
+        if (!content) {
+            ensureMessage().textContent = "Network error. Please try again.";
+        }
+    }
+
     function addMessage(text, sender) {
         const messageDiv = document.createElement('div');
         messageDiv.className = `message ${sender}`;
@@ -91,6 +153,7 @@ function initChat() {
         
         // Scroll to bottom
         chatMessages.scrollTop = chatMessages.scrollHeight;
+        return content;
     }
 
     // Event listeners
@@ -115,4 +178,3 @@ window.addEventListener('load', () => {
     console.log('AI Assistant Hub loaded successfully!');
     console.log('This application is autonomously developed by GitHub Copilot SDK Agent');
 });
-This change upgrades the chat to use real AI responses from your backend, making the feature truly useful and impressive.
\ No newline at end of file
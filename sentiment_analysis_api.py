@@ -1,14 +1,33 @@
 import os
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, request, jsonify
 from pathlib import Path
+from batch_processing import BatchError, batch_response, parse_documents
 from logging_utils import setup_logger
-from textblob import TextBlob
+import metrics
+import sentiment_service
 
-app = Flask(__name__)
+bp = Blueprint("sentiment_api", __name__)
 LOG_PATH = Path(os.getenv("TARGET_REPO_PATH", os.getcwd())) / "sentiment_analysis_api.log"
 logger = setup_logger("sentiment_api", str(LOG_PATH), level=os.getenv("API_LOG_LEVEL", "INFO"))
+SENTIMENT_THRESHOLD = 0.1
+sentiment_service.preload()
+metrics.instrument(bp)
+metrics.REGISTRY.callback(
+    "sentiment_memo_lookups_total", "Shared sentiment memo lookups by outcome.", "counter",
+    lambda: {(outcome,): value for outcome, value in sentiment_service.get_engine().cache_info().items()
+             if outcome in ("hits", "misses")},
+    ("outcome",)
+)
+
+def sentiment_scores(text: str) -> dict:
+    """Polarity, subjectivity and a positive/neutral/negative label for one text."""
+    return sentiment_service.get_engine().analyze(text, SENTIMENT_THRESHOLD)
+
+def sentiment_scores_many(texts: list) -> list:
+    """sentiment_scores for a batch, through the shared engine's memo in one pass."""
+    return sentiment_service.get_engine().analyze_many(texts, SENTIMENT_THRESHOLD)
 
-@app.route("/api/sentiment-analysis", methods=["POST"])
+@bp.route("/api/sentiment-analysis", methods=["POST"])
 def sentiment_analysis():
     """
     Analyze the sentiment of the provided text.
@@ -22,24 +41,37 @@ def sentiment_analysis():
 
     text = data["text"]
     try:
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
-        subjectivity = blob.sentiment.subjectivity
-        if polarity > 0.1:
-            sentiment = "positive"
-        elif polarity < -0.1:
-            sentiment = "negative"
-        else:
-            sentiment = "neutral"
-        logger.info(f"Sentiment analysis performed. Polarity: {polarity}, Subjectivity: {subjectivity}, Sentiment: {sentiment}")
-        return jsonify({
-            "polarity": polarity,
-            "subjectivity": subjectivity,
-            "sentiment": sentiment
-        })
+        result = sentiment_scores(text)
+        logger.info(
+            "Sentiment analysis performed. Polarity: %s, Subjectivity: %s, Sentiment: %s",
+            result["polarity"], result["subjectivity"], result["sentiment"]
+        )
+        return jsonify(result)
     except Exception as e:
-        logger.error(f"Error during sentiment analysis: {e}")
+        logger.error("Error during sentiment analysis: %s", e)
         return jsonify({"error": "Failed to analyze sentiment."}), 500
 
+@bp.route("/api/sentiment-analysis/batch", methods=["POST"])
+def sentiment_analysis_batch():
+    """
+    Analyze the sentiment of many texts in one request. Scored in this process by the
+    shared engine, so repeated and duplicate texts hit its memo instead of a pool
+    worker's cold copy.
+    Expects a JSON array (or NDJSON lines) of strings or { "id": ..., "text": "..." }.
+    Returns: { "results": [{ "index", "id"?, "polarity", "subjectivity", "sentiment" } | { "index", "error" }] }
+    or NDJSON in input order.
+    """
+    try:
+        documents = parse_documents()
+    except BatchError as e:
+        logger.warning("Rejected sentiment batch: %s", e)
+        return jsonify({"error": str(e)}), e.status
+    logger.info("Sentiment analysis batch of %d texts", len(documents))
+    return batch_response(sentiment_scores_many, documents, many=True)
+
+app = Flask(__name__)
+app.register_blueprint(bp)
+app.register_blueprint(metrics.bp)
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5050, debug=False)
\ No newline at end of file
@@ -0,0 +1,158 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+POSITIVE = "positive"
+NEGATIVE = "negative"
+NEUTRAL = "neutral"
+
+Scores = Tuple[float, float]
+
+
+def label(polarity: float, threshold: float = 0.1) -> str:
+    """"positive" above ``threshold``, "negative" below ``-threshold``, otherwise "neutral"."""
+    if polarity > threshold:
+        return POSITIVE
+    elif polarity < -threshold:
+        return NEGATIVE
+    return NEUTRAL
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.sha1(text.encode("utf-8", errors="surrogatepass")).digest()
+
+
+class SentimentEngine:
+    """
+    Shared TextBlob/pattern sentiment scorer with a content-hash LRU memo.
+
+    One analyzer is used for every call instead of a TextBlob per request, and
+    the pattern lexicon (normally parsed on the first request) can be loaded up
+    front with warm_up(). Scores are memoized by the SHA-1 of the text, so the
+    cache holds 20-byte keys rather than the documents themselves.
+
+    Args:
+        cache_size (int): Memoized texts kept; 0 disables the memo.
+        analyzer (Optional[Callable]): Returns (polarity, subjectivity) for a text;
+            defaults to TextBlob's pattern analyzer, imported on first use.
+    """
+
+    def __init__(self, cache_size: int = 4096, analyzer: Optional[Callable[[str], Any]] = None):
+        self.cache_size = cache_size
+        self._analyzer = analyzer
+        self._lock = threading.Lock()
+        self._warm_lock = threading.Lock()
+        self._warm = False
+        self._memo: "OrderedDict[bytes, Scores]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_analyzer(self) -> Callable[[str], Any]:
+        if self._analyzer is None:
+            # Same function TextBlob(text).sentiment delegates to, minus the per-call
+            # blob and namedtuple construction.
+            from textblob.en import sentiment as pattern_sentiment
+            self._analyzer = pattern_sentiment
+        return self._analyzer
+
+    def warm_up(self) -> "SentimentEngine":
+        """Import TextBlob and load its lexicon now rather than on the first request."""
+        with self._warm_lock:
+            if not self._warm:
+                self._get_analyzer()("good")
+                self._warm = True
+        return self
+
+    def _compute(self, text: str) -> Scores:
+        if not self._warm:
+            self.warm_up()
+        polarity, subjectivity = self._analyzer(text)
+        return polarity, subjectivity
+
+    def scores(self, text: str) -> Scores:
+        """Return (polarity, subjectivity) for ``text``."""
+        if not self.cache_size:
+            return self._compute(text)
+        key = _digest(text)
+        with self._lock:
+            cached = self._memo.get(key)
+            if cached is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        result = self._compute(text)
+        self._remember(key, result)
+        return result
+
+    def _remember(self, key: bytes, result: Scores):
+        with self._lock:
+            self._memo[key] = result
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+
+    def score_many(self, texts: Sequence[str]) -> List[Scores]:
+        """
+        Score a batch: each distinct text is analyzed once and the memo is consulted
+        under a single lock acquisition, so duplicates and repeats are free.
+        """
+        keys = [_digest(text) for text in texts]
+        results: Dict[bytes, Scores] = {}
+        with self._lock:
+            for key in keys:
+                if key in results:
+                    continue
+                cached = self._memo.get(key)
+                if cached is not None:
+                    self._memo.move_to_end(key)
+                    results[key] = cached
+            self.hits += sum(1 for key in keys if key in results)
+        for key, text in zip(keys, texts):
+            if key not in results:
+                results[key] = self._compute(text)
+                with self._lock:
+                    self.misses += 1
+                if self.cache_size:
+                    self._remember(key, results[key])
+        return [results[key] for key in keys]
+
+    def analyze(self, text: str, threshold: float = 0.1) -> Dict[str, Any]:
+        """Return {"polarity", "subjectivity", "sentiment"} using ``threshold`` for the label."""
+        polarity, subjectivity = self.scores(text)
+        return {"polarity": polarity, "subjectivity": subjectivity, "sentiment": label(polarity, threshold)}
+
+    def analyze_many(self, texts: Sequence[str], threshold: float = 0.1) -> List[Dict[str, Any]]:
+        return [
+            {"polarity": polarity, "subjectivity": subjectivity, "sentiment": label(polarity, threshold)}
+            for polarity, subjectivity in self.score_many(texts)
+        ]
+
+    def cache_info(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._memo), "max_size": self.cache_size}
+
+
+_engine: Optional[SentimentEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> SentimentEngine:
+    """Process-wide engine (SENTIMENT_CACHE_SIZE sets its memo size)."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = SentimentEngine(cache_size=int(os.getenv("SENTIMENT_CACHE_SIZE", "4096")))
+        return _engine
+
+
+def preload() -> SentimentEngine:
+    """
+    Warm the shared engine unless SENTIMENT_PRELOAD=0; call at app startup so the
+    first request does not pay for loading the lexicon.
+    """
+    engine = get_engine()
+    if os.getenv("SENTIMENT_PRELOAD", "1") != "0":
+        engine.warm_up()
+    return engine
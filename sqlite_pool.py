@@ -0,0 +1,137 @@
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+AUTO_VACUUM_MODES = ("NONE", "FULL", "INCREMENTAL")
+
+
+class ConnectionPool:
+    """
+    SQLite connection pool with one serialized writer and many read-only readers.
+
+    The database is switched to WAL journaling so readers never wait on the writer.
+    Writes go through a single shared connection guarded by a lock; reads check out
+    a dedicated ``mode=ro`` connection from a bounded pool and return it afterwards.
+
+    Args:
+        db_path (str): Path to the SQLite database file.
+        synchronous (str): PRAGMA synchronous (OFF, NORMAL, FULL or EXTRA).
+        cache_size (int): PRAGMA cache_size; negative values are KiB, positive are pages.
+        mmap_size (int): PRAGMA mmap_size in bytes; 0 disables memory-mapped I/O.
+        busy_timeout (float): Seconds a connection waits on a lock before failing.
+        max_readers (int): Maximum number of idle reader connections kept open.
+        auto_vacuum (Optional[str]): PRAGMA auto_vacuum applied when the database is
+            still empty (it cannot be changed afterwards without a full VACUUM).
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        synchronous: str = "NORMAL",
+        cache_size: int = -8000,
+        mmap_size: int = 0,
+        busy_timeout: float = 5.0,
+        max_readers: int = 8,
+        auto_vacuum: Optional[str] = "INCREMENTAL"
+    ):
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {', '.join(SYNCHRONOUS_MODES)}")
+        if auto_vacuum and auto_vacuum.upper() not in AUTO_VACUUM_MODES:
+            raise ValueError(f"auto_vacuum must be one of {', '.join(AUTO_VACUUM_MODES)}")
+        self.db_path = db_path
+        self.synchronous = synchronous
+        self.cache_size = int(cache_size)
+        self.mmap_size = int(mmap_size)
+        self.busy_timeout = busy_timeout
+        self._memory = db_path == ":memory:"
+        self._write_lock = threading.RLock()
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max_readers)
+        self._closed = False
+
+        self._writer = sqlite3.connect(db_path, timeout=busy_timeout, check_same_thread=False)
+        if auto_vacuum and not self._writer.execute("SELECT 1 FROM sqlite_master").fetchone():
+            # Must precede journal_mode=WAL, which initializes the file header.
+            self._writer.execute(f"PRAGMA auto_vacuum={auto_vacuum.upper()}")
+        if not self._memory:
+            self._writer.execute("PRAGMA journal_mode=WAL")
+        self._configure(self._writer)
+
+    def _configure(self, conn: sqlite3.Connection):
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        conn.execute(f"PRAGMA cache_size={self.cache_size}")
+        conn.execute(f"PRAGMA mmap_size={self.mmap_size}")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout * 1000)}")
+
+    def _open_reader(self) -> sqlite3.Connection:
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, timeout=self.busy_timeout, check_same_thread=False)
+        self._configure(conn)
+        return conn
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """
+        Serialize access to the shared writer connection.
+
+        The block runs inside a transaction that commits on success and rolls back
+        on error.
+        """
+        with self._write_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Connection pool is closed")
+            with self._writer:
+                yield self._writer
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection for the duration of the block."""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+        if self._memory:
+            # In-memory databases are private to one connection; share the writer.
+            with self._write_lock:
+                yield self._writer
+            return
+
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._open_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            if self._closed:
+                conn.close()
+            else:
+                try:
+                    self._readers.put_nowait(conn)
+                except queue.Full:
+                    conn.close()
+
+    def close(self):
+        """Close the writer and every idle reader connection."""
+        with self._write_lock:
+            self._closed = True
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._writer.close()
+
+    def checkpoint(self, mode: str = "PASSIVE") -> Optional[tuple]:
+        """Run a WAL checkpoint and return (busy, log_frames, checkpointed_frames)."""
+        mode = mode.upper()
+        if mode not in ("PASSIVE", "FULL", "RESTART", "TRUNCATE"):
+            raise ValueError(f"Unknown checkpoint mode: {mode}")
+        if self._memory:
+            return None
+        with self._write_lock:
+            return self._writer.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
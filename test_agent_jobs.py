@@ -0,0 +1,120 @@
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from agent_jobs import CANCELLED, FAILED, QUEUED, RUNNING, SUCCEEDED, TIMED_OUT, JobManager, JobQueueFull
+
+
+def python(code: str):
+    return [sys.executable, "-c", code]
+
+
+def wait_for(predicate, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached in time")
+        time.sleep(0.01)
+
+
+class TestJobManager(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.gate = self.tmpdir / "gate"
+        self.mirror = self.tmpdir / "agent.log"
+        self.manager = JobManager(self.tmpdir / "jobs", max_workers=1, max_pending=1, timeout=10,
+                                  mirror_log=self.mirror)
+
+    def tearDown(self):
+        self.manager.shutdown()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def gated(self, key: str):
+        """Submit a job that runs until the gate file exists."""
+        code = f"import os, time\nwhile not os.path.exists({str(self.gate)!r}): time.sleep(0.01)"
+        return self.manager.submit(key, python(code))
+
+    def test_same_key_is_single_flight(self):
+        job, created = self.gated("repo")
+        again, created_again = self.gated("repo")
+        self.assertTrue(created)
+        self.assertFalse(created_again)
+        self.assertEqual(again.id, job.id)
+
+        self.gate.touch()
+        wait_for(lambda: job.finished)
+        fresh, created = self.manager.submit("repo", python("pass"))
+        self.assertTrue(created)
+        self.assertNotEqual(fresh.id, job.id)
+
+    def test_status_and_duration_transitions(self):
+        job, _ = self.gated("repo")
+        wait_for(lambda: job.status == RUNNING)
+        self.assertIsNotNone(job.started_at)
+        first = job.duration
+        time.sleep(0.05)
+        self.assertGreater(job.duration, first)
+
+        self.gate.touch()
+        wait_for(lambda: job.finished)
+        self.assertEqual((job.status, job.exit_code), (SUCCEEDED, 0))
+        self.assertEqual(job.duration, job.finished_at - job.started_at)
+        self.assertEqual(self.manager.get(job.id).to_dict()["status"], SUCCEEDED)
+
+    def test_non_zero_exit_fails(self):
+        job, _ = self.manager.submit("repo", python("import sys; sys.exit(3)"))
+        wait_for(lambda: job.finished)
+        self.assertEqual((job.status, job.exit_code), (FAILED, 3))
+
+    def test_timeout_kills_the_process(self):
+        manager = JobManager(self.tmpdir / "slow", timeout=0.2)
+        try:
+            job, _ = manager.submit("repo", python("import time; time.sleep(30)"))
+            wait_for(lambda: job.finished)
+            self.assertEqual(job.status, TIMED_OUT)
+            self.assertIn("Timed out", job.error)
+            self.assertLess(job.duration, 10)
+        finally:
+            manager.shutdown()
+
+    def test_cancel_terminates_running_process(self):
+        job, _ = self.gated("repo")
+        wait_for(lambda: job.status == RUNNING)
+        self.assertTrue(self.manager.cancel(job.id))
+        wait_for(lambda: job.finished)
+        self.assertEqual(job.status, CANCELLED)
+        self.assertNotEqual(job.exit_code, 0)
+        self.assertFalse(self.manager.cancel(job.id))
+
+    def test_each_job_has_its_own_log(self):
+        code = "import sys; print('out line'); print('err line', file=sys.stderr)"
+        first, _ = self.manager.submit("one", python(code))
+        wait_for(lambda: first.finished)
+        second, _ = self.manager.submit("two", python("print('second job')"))
+        wait_for(lambda: second.finished)
+        self.assertEqual(sorted(self.manager.read_log(first.id).splitlines()), ["err line", "out line"])
+        self.assertEqual(self.manager.read_log(second.id), "second job\n")
+        self.assertIsNone(self.manager.read_log("missing"))
+        self.assertIn("second job", self.mirror.read_text(encoding="utf-8"))
+
+    def test_pool_queues_then_rejects_beyond_its_size(self):
+        running, _ = self.gated("one")
+        wait_for(lambda: running.status == RUNNING)
+        queued, _ = self.manager.submit("two", python("pass"))
+        with self.assertRaises(JobQueueFull):
+            self.manager.submit("three", python("pass"))
+        time.sleep(0.05)
+        self.assertEqual(queued.status, QUEUED)
+
+        self.assertTrue(self.manager.cancel(queued.id))
+        self.gate.touch()
+        wait_for(lambda: queued.finished)
+        self.assertEqual(queued.status, CANCELLED)
+        self.assertIsNone(queued.started_at)
+        self.assertEqual([job.id for job in self.manager.list()], [queued.id, running.id])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import threading
+import unittest
+from unittest import mock
+import api_server
+
+
+def parse_events(body):
+    events = []
+    for frame in body.strip().split("\n\n"):
+        event, data = "message", []
+        for line in frame.split("\n"):
+            if line.startswith("event: "):
+                event = line[len("event: "):]
+            elif line.startswith("data: "):
+                data.append(line[len("data: "):])
+        events.append((event, json.loads("\n".join(data))))
+    return events
+
+
+def fake_stream(*tokens):
+    def stream(prompt, **params):
+        yield from tokens
+    return stream
+
+
+class TestStreamingEndpoints(unittest.TestCase):
+    def setUp(self):
+        api_server.CONTENT_CACHE.memory.clear()
+        self.client = api_server.app.test_client()
+
+    def test_chat_streams_tokens_then_done(self):
+        with mock.patch.object(api_server, "stream_messages", fake_stream("Hel", "lo", " there")):
+            response = self.client.post("/api/chat", json={"message": "hi", "stream": True})
+            body = response.get_data(as_text=True)
+        self.assertEqual(response.mimetype, "text/event-stream")
+        events = parse_events(body)
+        self.assertEqual(events[:3], [
+            ("token", {"token": "Hel"}),
+            ("token", {"token": "lo"}),
+            ("token", {"token": " there"}),
+        ])
+        self.assertEqual(events[3][0], "done")
+        self.assertEqual(events[3][1]["response"], "Hello there")
+        conversation = api_server.CONVERSATIONS.get(events[3][1]["conversation_id"])
+        self.assertEqual(conversation.memory, ["hi", "Hello there"])
+
+    def test_accept_header_selects_stream_and_json_stays_default(self):
+        with mock.patch.object(api_server, "stream_messages", fake_stream("ok")), \
+                mock.patch.object(api_server, "complete_messages", return_value="full reply"):
+            streamed = self.client.post("/api/chat", json={"message": "hi"}, headers={"Accept": "text/event-stream"})
+            self.assertEqual(streamed.mimetype, "text/event-stream")
+            plain = self.client.post("/api/chat", json={"message": "hi"})
+        self.assertEqual(plain.get_json()["response"], "full reply")
+
+    def test_first_token_sent_before_generation_finishes(self):
+        release = threading.Event()
+
+        def slow_stream(messages, **params):
+            yield "first"
+            release.wait(5)
+            yield " second"
+
+        with mock.patch.object(api_server, "stream_messages", slow_stream):
+            response = self.client.post("/api/chat", json={"message": "hi", "stream": True})
+            chunks = iter(response.response)
+            first = next(chunks)
+            self.assertIn("first", first.decode() if isinstance(first, bytes) else first)
+            self.assertFalse(release.is_set())
+            release.set()
+            rest = b"".join(c if isinstance(c, bytes) else c.encode() for c in chunks).decode()
+            response.close()
+        self.assertIn('"response": "first second"', rest)
+
+    def test_upstream_error_becomes_error_event(self):
+        def broken(messages, **params):
+            yield "partial"
+            raise RuntimeError("upstream reset")
+
+        with mock.patch.object(api_server, "stream_messages", broken):
+            body = self.client.post("/api/chat", json={"message": "hi", "stream": True}).get_data(as_text=True)
+        self.assertEqual(parse_events(body)[-1], ("error", {"error": "upstream reset"}))
+
+    def test_generate_content_stream_fills_and_uses_cache(self):
+        request = {"type": "headline", "topic": "Streams", "stream": True}
+        with mock.patch.object(api_server, "stream_prompt", fake_stream("Big ", "news")):
+            first = parse_events(self.client.post("/api/generate-content", json=request).get_data(as_text=True))
+        self.assertEqual(first[-1], ("done", {"result": "Big news"}))
+
+        with mock.patch.object(api_server, "stream_prompt", side_effect=AssertionError("not cached")), \
+                mock.patch.object(api_server, "complete_prompt", side_effect=AssertionError("not cached")):
+            replay = parse_events(self.client.post("/api/generate-content", json=request).get_data(as_text=True))
+            plain = self.client.post("/api/generate-content", json={"type": "headline", "topic": "Streams"})
+        self.assertEqual(replay, [("token", {"token": "Big news"}), ("done", {"result": "Big news"})])
+        self.assertEqual(plain.get_json(), {"result": "Big news"})
+
+
+if __name__ == "__main__":
+    unittest.main()
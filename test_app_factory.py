@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from app_factory import COMPONENTS, create_app
+
+
+class TestAppFactory(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.env = mock.patch.dict(os.environ, {"TARGET_REPO_PATH": cls.tmpdir})
+        cls.env.start()
+        from autonomous_agent import ExecutionLog
+        cls.log = ExecutionLog(os.path.join(cls.tmpdir, "execution_log.db"))
+        cls.app = create_app()
+        cls.client = cls.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.log.close()
+        cls.env.stop()
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+    def test_all_blueprints_mounted(self):
+        self.assertEqual(set(self.app.blueprints),
+                         {"api", "sentiment_api", "sentiment", "dashboard", "executions", "metrics", "assets"})
+        rules = {rule.rule for rule in self.app.url_map.iter_rules()}
+        for rule in ("/", "/api/chat", "/api/analyze-text/batch", "/api/sentiment-analysis", "/api/sentiment",
+                     "/api/stream", "/executions/", "/executions/api/executions", "/metrics"):
+            self.assertIn(rule, rules)
+
+    def test_routes_respond_in_one_app(self):
+        text = {"text": "What a wonderful day."}
+        self.assertEqual(self.client.post("/api/sentiment-analysis", json=text).get_json()["sentiment"], "positive")
+        self.assertEqual(self.client.post("/api/sentiment", json=text).get_json()["sentiment"], "positive")
+        self.assertEqual(self.client.post("/api/analyze-text", json=text).get_json()["sentiment"], "Positive")
+        self.assertEqual(self.client.get("/executions/api/executions").status_code, 200)
+        page = self.client.get("/").get_data(as_text=True)
+        self.assertIn('action="/run"', page)
+        self.assertIn("fetch('/api/status')", page)
+
+    def test_component_subset_and_unknown_names(self):
+        app = create_app(["sentiment"])
+        self.assertEqual(set(app.blueprints), {"sentiment_api"})
+        with self.assertRaises(ValueError):
+            create_app(["nope"])
+        self.assertIn("executions", COMPONENTS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import gzip
+import json
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+from flask import Flask
+import assets
+from assets import AssetStore, build, choose_encoding, minify_css, minify_js
+
+
+class TestMinify(unittest.TestCase):
+    def test_css_keeps_strings_and_drops_comments(self):
+        css = "/* c */\nbody {\n    font-family: 'Segoe UI', Tahoma;\n    width: calc(100% - 20px);\n}\na::after { content: \"a, b\"; }\n"
+        self.assertEqual(minify_css(css),
+                         "body{font-family:'Segoe UI',Tahoma;width:calc(100% - 20px)}a::after{content:\"a, b\"}")
+
+    def test_js_keeps_lines_strings_and_regexes(self):
+        js = ("// header\nfunction f(a) {\n    const url = 'http://x/y'; // trailing\n"
+              "    /* block */ return a.replace(/\\/\\//g, `  two  `) / 2;\n}\n\n\n")
+        self.assertEqual(minify_js(js),
+                         "function f(a) {\nconst url = 'http://x/y';\n"
+                         "return a.replace(/\\/\\//g, `  two  `) / 2;\n}\n")
+
+
+class TestAssetPipeline(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = Path(tempfile.mkdtemp())
+        cls.dist = cls.tmpdir / "dist"
+        cls.manifest = build(out_dir=cls.dist)
+        cls.store = AssetStore(cls.dist)
+        cls.patch = mock.patch.object(assets, "STORE", cls.store)
+        cls.patch.start()
+        app = Flask(__name__)
+        app.register_blueprint(assets.bp, url_prefix="/app")
+        cls.client = app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.patch.stop()
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+    def test_build_fingerprints_minifies_and_precompresses(self):
+        files = self.manifest["files"]
+        css = files["styles.css"]
+        self.assertRegex(css["path"], r"^styles\.[0-9a-f]{10}\.css$")
+        self.assertLess(css["size"], len(Path(assets.ROOT, "styles.css").read_bytes()))
+        minified = (self.dist / css["path"]).read_bytes()
+        self.assertEqual(gzip.decompress((self.dist / css["encodings"]["gzip"]).read_bytes()), minified)
+        self.assertNotIn("gzip", files["screenshots/about-page.png"]["encodings"])
+        page = (self.dist / "index.html").read_text(encoding="utf-8")
+        self.assertIn(f'href="{css["path"]}"', page)
+        self.assertIn(f'src="{files["script.js"]["path"]}"', page)
+        self.assertEqual(json.loads((self.dist / "manifest.json").read_text())["files"], files)
+
+    def test_hashed_asset_is_immutable_and_precompressed(self):
+        entry = self.manifest["files"]["styles.css"]
+        response = self.client.get(f"/app/{entry['path']}", headers={"Accept-Encoding": "gzip, deflate"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Cache-Control"], assets.IMMUTABLE)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(response.mimetype, "text/css")
+        self.assertEqual(gzip.decompress(response.get_data()), (self.dist / entry["path"]).read_bytes())
+
+        plain = self.client.get(f"/app/{entry['path']}", headers={"Accept-Encoding": "gzip;q=0"})
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertNotEqual(plain.headers["ETag"], response.headers["ETag"])
+
+        cached = self.client.get(f"/app/{entry['path']}", headers={"Accept-Encoding": "gzip",
+                                                                   "If-None-Match": response.headers["ETag"]})
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached.get_data(), b"")
+
+    def test_page_and_logical_names_revalidate(self):
+        page = self.client.get("/app/")
+        self.assertEqual(page.status_code, 200)
+        self.assertEqual(page.headers["Cache-Control"], "no-cache")
+        self.assertIn(self.manifest["files"]["script.js"]["path"], page.get_data(as_text=True))
+        self.assertEqual(self.client.get("/app/styles.css").headers["Cache-Control"], "no-cache")
+        self.assertEqual(self.client.get("/app/missing.js").status_code, 404)
+
+    def test_has_build(self):
+        self.assertTrue(self.store.has_build)
+        self.assertFalse(AssetStore(self.tmpdir / "missing").has_build)
+
+    def test_choose_encoding(self):
+        both = {"gzip": "a.gz", "br": "a.br"}
+        self.assertEqual(choose_encoding("gzip, br", both), "br")
+        self.assertEqual(choose_encoding("br;q=0.5, gzip", both), "gzip")
+        self.assertEqual(choose_encoding("*", {"gzip": "a.gz"}), "gzip")
+        self.assertIsNone(choose_encoding("", both))
+        self.assertIsNone(choose_encoding("identity", both))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,15 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest import mock
+from pathlib import Path
+import autonomous_agent
 from autonomous_agent import AutonomousAgent
+from log_index import LogIndex
+from repo_status import AgentLiveness
 
 class TestAutonomousAgent(unittest.TestCase):
     def setUp(self):
@@ -33,5 +43,64 @@ class TestAutonomousAgent(unittest.TestCase):
         self.assertEqual(len(self.agent.memory), initial_len + 1)
         self.assertIn("Remember this", self.agent.memory[-1])
 
+    def test_act_recalls_related_memories(self):
+        self.agent.add_to_memory("The deploy failed because the database migration timed out")
+        self.agent.add_to_memory("Lunch is at noon")
+        result = self.agent.act("Why did the database migration fail?")
+        self.assertIn("database migration timed out", result)
+        self.assertNotIn("Lunch", result)
+
+    def test_memory_is_bounded(self):
+        agent = AutonomousAgent(name="Small", goal="g", memory_capacity=3)
+        for i in range(10):
+            agent.add_to_memory(f"step {i}")
+        self.assertEqual(agent.memory, ["step 7", "step 8", "step 9"])
+
+    def test_memory_persists_per_agent(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "execution_log.db")
+            first = AutonomousAgent(name="A", goal="g", memory_db=path)
+            first.act("remember the build cache")
+            AutonomousAgent(name="B", goal="g", memory_db=path).add_to_memory("other agent")
+            first.memory.close()
+            reloaded = AutonomousAgent(name="A", goal="g", memory_db=path)
+            self.assertEqual(reloaded.memory, ["remember the build cache"])
+            self.assertEqual(reloaded.recall("build cache"), ["remember the build cache"])
+            reloaded.memory.close()
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+    def test_once_keeps_heartbeat_while_running(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = Path(tmpdir) / "agent.heartbeat"
+            liveness = AgentLiveness(path, cache_ttl=0)
+            seen = []
+            act = self.agent.act
+            self.agent.act = lambda observation: seen.append(liveness.is_running()) or act(observation)
+            log = mock.Mock()
+            with mock.patch.dict(os.environ, {"AGENT_HEARTBEAT_PATH": str(path)}), \
+                    self.assertLogs("autonomous_agent") as logs:
+                autonomous_agent.once(self.agent, log)
+            self.assertEqual(seen, [True])
+            self.assertFalse(path.exists())
+            self.assertIn(autonomous_agent.RUN_MARKER, logs.output[0])
+            self.assertEqual(log.log_execution.call_args[0][0], "success")
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    def test_cli_run_is_logged_where_the_dashboard_reads(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            env = dict(os.environ, TARGET_REPO_PATH=tmpdir, AGENT_HEARTBEAT_PATH=os.path.join(tmpdir, "hb"))
+            script = os.path.join(os.path.dirname(os.path.abspath(autonomous_agent.__file__)), "autonomous_agent.py")
+            subprocess.run([sys.executable, script, "once"], cwd=tmpdir, env=env, check=True,
+                           capture_output=True, timeout=60)
+            log_path = Path(tmpdir) / "autonomous_agent.log"
+            self.assertIn(autonomous_agent.RUN_MARKER, log_path.read_text(encoding="utf-8"))
+            self.assertIsNotNone(LogIndex(log_path).last_run_time())
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
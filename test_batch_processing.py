@@ -0,0 +1,97 @@
+import json
+import os
+import unittest
+from unittest import mock
+import api_server
+import batch_processing
+import sentiment_analysis_api
+import sentiment_service
+
+
+class TestBatchEndpoints(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.env = mock.patch.dict(os.environ, {"BATCH_WORKERS": "2"})
+        cls.env.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        batch_processing.shutdown_executor()
+        cls.env.stop()
+
+    def setUp(self):
+        self.client = api_server.app.test_client()
+        self.texts = [
+            "I love this wonderful library. It is great!",
+            "This is terrible.\n\nI hate waiting for slow code.",
+            "Plain words here",
+        ]
+
+    def test_json_batch_matches_single_requests_in_order(self):
+        body = [self.texts[0], {"id": "b", "text": self.texts[1]}, {"id": "bad"}, self.texts[2]]
+        response = self.client.post("/api/analyze-text/batch", json=body)
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()["results"]
+        self.assertEqual([r["index"] for r in results], [0, 1, 2, 3])
+        self.assertEqual(results[1]["id"], "b")
+        self.assertEqual(results[2], {"index": 2, "id": "bad", "error": "Missing text."})
+        for result, text in zip([results[0], results[1], results[3]], self.texts):
+            single = self.client.post("/api/analyze-text", json={"text": text}).get_json()
+            self.assertEqual({k: v for k, v in result.items() if k not in ("index", "id")}, single)
+
+    def test_ndjson_in_streams_ndjson_out(self):
+        body = "\n".join(json.dumps({"id": i, "text": t}) for i, t in enumerate(self.texts)) + "\nnot json\n"
+        response = self.client.post("/api/analyze-text/batch", data=body, content_type="application/x-ndjson")
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([line["index"] for line in lines], [0, 1, 2, 3])
+        self.assertEqual(lines[3]["error"], "Missing text.")
+        self.assertIn("word_count", lines[2])
+
+    def test_limits(self):
+        with mock.patch.object(batch_processing, "MAX_BATCH_ITEMS", 2):
+            response = self.client.post("/api/analyze-text/batch", json=self.texts)
+        self.assertEqual(response.status_code, 413)
+        with mock.patch.object(batch_processing, "MAX_BATCH_BYTES", 10):
+            response = self.client.post("/api/analyze-text/batch", json=self.texts)
+        self.assertEqual(response.status_code, 413)
+        response = self.client.post("/api/analyze-text/batch", json={"text": "not a batch"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_sentiment_batch(self):
+        client = sentiment_analysis_api.app.test_client()
+        results = client.post("/api/sentiment-analysis/batch", json=self.texts).get_json()["results"]
+        for result, text in zip(results, self.texts):
+            single = client.post("/api/sentiment-analysis", json={"text": text}).get_json()
+            self.assertEqual({k: v for k, v in result.items() if k != "index"}, single)
+        self.assertEqual([r["sentiment"] for r in results[:2]], ["positive", "negative"])
+
+    def test_pool_does_not_fork(self):
+        executor = batch_processing.get_executor()
+        self.assertEqual(executor._mp_context.get_start_method(), "spawn")
+
+    def test_batches_share_the_engine_memo(self):
+        engine = sentiment_service.get_engine()
+        texts = ["A uniquely cheerful sentence for the memo test!"] * 3
+        client = sentiment_analysis_api.app.test_client()
+        client.post("/api/sentiment-analysis/batch", json=texts)
+        hits = engine.hits
+        results = client.post("/api/sentiment-analysis/batch", json=texts).get_json()["results"]
+        self.assertEqual(engine.hits - hits, 3)
+        self.client.post("/api/analyze-text/batch", json=texts)
+        self.assertEqual(engine.hits - hits, 6)
+        self.assertEqual(results[0]["sentiment"], "positive")
+
+    def test_apply_many_reports_missing_texts_and_errors(self):
+        self.assertEqual(batch_processing.apply_many(lambda texts: [{"n": len(t)} for t in texts], ["ab", None]),
+                         [{"n": 2}, {"error": "Missing text."}])
+
+        def boom(texts):
+            raise ValueError("bad batch")
+
+        self.assertEqual(batch_processing.apply_many(boom, ["a", 1]),
+                         [{"error": "bad batch"}, {"error": "Missing text."}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+from unittest import mock
+import benchmark
+from autonomous_agent import ExecutionLog
+
+
+class TestBenchmark(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_summarize_percentiles(self):
+        summary = benchmark.summarize([i / 1e6 for i in range(1, 101)], elapsed=0.5)
+        self.assertEqual(summary["n"], 100)
+        self.assertAlmostEqual(summary["p50_us"], 50)
+        self.assertAlmostEqual(summary["p99_us"], 99)
+        self.assertAlmostEqual(summary["max_us"], 100)
+        self.assertEqual(summary["ops_per_sec"], 200)
+        self.assertEqual(benchmark.summarize([]), {"n": 0})
+
+    def test_compare_flags_only_slowdowns_beyond_tolerance(self):
+        baseline = {"a": {"p50_us": 100, "p99_us": 200}, "b": {"p50_us": 100, "p99_us": 100}}
+        current = {"a": {"p50_us": 105, "p99_us": 300}, "b": {"p50_us": 50, "p99_us": 60}, "new": {"p50_us": 1}}
+        regressions = benchmark.compare(current, baseline, tolerance=0.1)
+        self.assertEqual([(r["name"], r["metric"]) for r in regressions], [("a", "p99_us")])
+        self.assertEqual(regressions[0]["change"], 0.5)
+
+    def test_db_suite_reports_each_row_count(self):
+        results = benchmark.run_db([50, 200], iterations=3, inserts=20)
+        for name in ("db.log_execution.direct", "db.log_execution.write_behind", "db.get_stats.50",
+                     "db.get_recent_executions.200"):
+            self.assertIn(name, results)
+        self.assertEqual(results["db.log_execution.direct"]["n"], 20)
+        self.assertEqual(results["db.seed.200"]["n"], 200)
+
+    def test_db_suite_leaves_shared_log_untouched(self):
+        shared = ExecutionLog(os.path.join(self.tmpdir, "shared.db"), write_behind=False)
+        try:
+            shared.log_execution("success", "a.py", "docs", 1.0, None)
+            benchmark.run_db([50], iterations=2, inserts=5)
+            self.assertIs(ExecutionLog._instance, shared)
+            self.assertEqual(len(shared.get_recent_executions()), 1)
+            shared.log_execution("success", "b.py", "docs", 1.0, None)
+            self.assertEqual(shared.get_stats()["success_count"], 2)
+        finally:
+            shared.close()
+
+    def test_http_suite_refuses_an_open_shared_log(self):
+        shared = ExecutionLog(os.path.join(self.tmpdir, "shared.db"), write_behind=False)
+        try:
+            with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "real"}):
+                with self.assertRaises(RuntimeError):
+                    benchmark.run_http(1, 1, 0.0)
+                self.assertEqual(os.environ["OPENAI_API_KEY"], "real")
+            self.assertIs(ExecutionLog._instance, shared)
+        finally:
+            shared.close()
+
+    def test_http_suite_restores_environment(self):
+        with mock.patch.dict(os.environ, {"OPENAI_API_KEY": "real"}):
+            os.environ.pop("OPENAI_API_BASE", None)
+            results = benchmark.run_http(2, 1, 0.0, endpoints=["status"])
+            self.assertEqual(results["http.status"]["errors"], 0)
+            self.assertEqual(os.environ["OPENAI_API_KEY"], "real")
+            self.assertNotIn("OPENAI_API_BASE", os.environ)
+        self.assertIsNone(ExecutionLog._instance)
+
+    def test_main_writes_json_and_fails_on_regression(self):
+        baseline_path = os.path.join(self.tmpdir, "baseline.json")
+        output_path = os.path.join(self.tmpdir, "out.json")
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({"results": {"text_stats.short": {"p50_us": 0.001, "p99_us": 0.001}}}, f)
+        with redirect_stderr(StringIO()) as err:
+            code = benchmark.main(["--suites", "micro", "--iterations", "5", "--output", output_path,
+                                   "--baseline", baseline_path])
+        self.assertEqual(code, 1)
+        self.assertIn("REGRESSION text_stats.short", err.getvalue())
+        with open(output_path, encoding="utf-8") as f:
+            report = json.load(f)
+        self.assertIn("sentiment.memoized.long", report["results"])
+        self.assertEqual(report["meta"]["suites"], ["micro"])
+        self.assertEqual({r["name"] for r in report["regressions"]}, {"text_stats.short"})
+
+
+if __name__ == "__main__":
+    unittest.main()
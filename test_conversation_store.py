@@ -0,0 +1,97 @@
+import unittest
+from unittest import mock
+from conversation_store import ConversationStore, Conversation, estimate_tokens
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestConversation(unittest.TestCase):
+    def test_memory_list_interface(self):
+        conversation = Conversation("c1")
+        self.assertEqual(conversation.memory, [])
+        conversation.add_to_memory("First memory")
+        conversation.add_to_memory("Second memory")
+        self.assertEqual(conversation.memory, ["First memory", "Second memory"])
+        conversation.clear_memory()
+        self.assertEqual(conversation.memory, [])
+
+    def test_ring_buffer_folds_oldest_turns_into_summary(self):
+        conversation = Conversation("c1", max_turns=4)
+        for i in range(6):
+            conversation.add_to_memory(f"Message number {i}. Some detail nobody needs.")
+        self.assertEqual(len(conversation.memory), 4)
+        self.assertEqual(conversation.summary, "User: Message number 0. User: Message number 1.")
+
+    def test_messages_fit_budget_and_keep_newest_turns(self):
+        conversation = Conversation("c1", max_turns=100, summary_tokens=50)
+        for i in range(40):
+            conversation.record_exchange(f"Question {i} " + "x" * 80, f"Answer {i} " + "y" * 80)
+        messages = conversation.build_messages("What now?", budget=300)
+        total = sum(estimate_tokens(m["content"]) for m in messages)
+        self.assertLessEqual(total, 300)
+        self.assertEqual(messages[0]["role"], "system")
+        self.assertTrue(messages[-2]["content"].startswith("Answer 39"))
+        self.assertEqual(messages[-1], {"role": "user", "content": "What now?"})
+        # Folded turns are compacted, so the verbatim buffer no longer holds them.
+        self.assertLess(len(conversation.memory), 80)
+
+
+class TestConversationStore(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.store = ConversationStore(max_sessions=2, idle_ttl=60, clock=self.clock)
+
+    def test_get_or_create(self):
+        conversation, created = self.store.get_or_create()
+        self.assertTrue(created)
+        again, created = self.store.get_or_create(conversation.id)
+        self.assertIs(again, conversation)
+        self.assertFalse(created)
+
+    def test_lru_eviction(self):
+        a, _ = self.store.get_or_create("a")
+        self.store.get_or_create("b")
+        self.store.get("a")
+        self.store.get_or_create("c")
+        self.assertIsNone(self.store.get("b"))
+        self.assertIs(self.store.get("a"), a)
+        self.assertEqual(self.store.evicted, 1)
+
+    def test_idle_sessions_expire(self):
+        self.store.get_or_create("a")
+        self.clock.now = 30
+        self.store.get_or_create("b")
+        self.clock.now = 70
+        self.assertIsNone(self.store.get("a"))
+        self.assertIsNotNone(self.store.get("b"))
+        self.assertEqual(len(self.store), 1)
+
+
+class TestChatConversation(unittest.TestCase):
+    def setUp(self):
+        import api_server
+        self.api_server = api_server
+        self.client = api_server.app.test_client()
+
+    def test_follow_up_carries_history(self):
+        with mock.patch.object(self.api_server, "complete_messages", side_effect=["Hi Dana!", "Your name is Dana."]) as stub:
+            first = self.client.post("/api/chat", json={"message": "My name is Dana."}).get_json()
+            second = self.client.post(
+                "/api/chat", json={"message": "What is my name?", "conversation_id": first["conversation_id"]}
+            ).get_json()
+        self.assertEqual(second["conversation_id"], first["conversation_id"])
+        sent = stub.call_args_list[1][0][0]
+        self.assertEqual([m["content"] for m in sent], ["My name is Dana.", "Hi Dana!", "What is my name?"])
+        response = self.client.delete(f"/api/conversations/{first['conversation_id']}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.delete(f"/api/conversations/{first['conversation_id']}").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,370 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from autonomous_agent import ExecutionLog, app
+from execution_analytics import ExecutionAnalytics
+from execution_retention import RetentionManager, RetentionPolicy, list_archives
+from execution_schema import LATEST_VERSION
+from sqlite_pool import ConnectionPool
+from write_behind import measure_insert_throughput
+
+
+class TestExecutionLogWriteBehind(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "execution_log.db")
+
+    def tearDown(self):
+        if ExecutionLog._instance is not None:
+            ExecutionLog._instance.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _log(self, log, count, status="success"):
+        for i in range(count):
+            log.log_execution(status, "a.py", "refactor", float(i), None)
+
+    def test_per_row_mode_is_immediately_visible(self):
+        log = ExecutionLog(self.db_path, write_behind=False)
+        self._log(log, 3)
+        self.assertEqual(len(log.get_recent_executions()), 3)
+
+    def test_flush_writes_queued_rows(self):
+        log = ExecutionLog(self.db_path, write_behind=True, batch_size=1000, flush_interval=60)
+        self._log(log, 25)
+        self.assertTrue(log.flush(timeout=5))
+        self.assertEqual(log.get_stats()["success_count"], 25)
+
+    def test_batches_are_bounded_by_batch_size(self):
+        log = ExecutionLog(self.db_path, write_behind=True, batch_size=10, flush_interval=60)
+        self._log(log, 35)
+        log.flush(timeout=5)
+        self.assertEqual(log._writer.rows_written, 35)
+        self.assertGreaterEqual(log._writer.batches_written, 4)
+
+    def test_time_threshold_flushes_without_explicit_flush(self):
+        log = ExecutionLog(self.db_path, write_behind=True, batch_size=1000, flush_interval=0.05)
+        self._log(log, 2)
+        writer = log._writer
+        for _ in range(100):
+            if writer.rows_written == 2:
+                break
+            writer._thread.join(0.02)
+        self.assertEqual(writer.rows_written, 2)
+
+    def test_close_persists_pending_rows(self):
+        log = ExecutionLog(self.db_path, write_behind=True, batch_size=1000, flush_interval=60)
+        self._log(log, 7, status="failure")
+        log.close()
+        reopened = ExecutionLog(self.db_path, write_behind=False)
+        self.assertEqual(reopened.get_stats()["failure_count"], 7)
+
+    def test_throughput_benchmark_leaves_shared_log_open(self):
+        log = ExecutionLog(self.db_path, write_behind=False)
+        self.assertGreater(measure_insert_throughput(50, write_behind=True), 0)
+        self.assertIs(ExecutionLog(), log)
+        self._log(log, 1)
+        self.assertEqual(log.get_stats()["success_count"], 1)
+
+
+class TestExecutionLogSchema(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "execution_log.db")
+
+    def tearDown(self):
+        if ExecutionLog._instance is not None:
+            ExecutionLog._instance.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_legacy_database_upgrades_in_place(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("""
+            CREATE TABLE executions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT NOT NULL,
+                status TEXT NOT NULL,
+                files_changed TEXT,
+                improvement_type TEXT,
+                copilot_response_time REAL,
+                error_message TEXT
+            )
+        """)
+        conn.executemany(
+            "INSERT INTO executions (timestamp, status, improvement_type, copilot_response_time) VALUES (?, ?, ?, ?)",
+            [("2024-01-01T00:00:00", "success", "docs", 2.0),
+             ("2024-01-01T00:01:00", "failure", None, None),
+             ("2024-01-01T00:02:00", "success", "docs", 4.0)]
+        )
+        conn.commit()
+        conn.close()
+
+        log = ExecutionLog(self.db_path)
+        self.assertEqual(log.schema_version, LATEST_VERSION)
+        stats = log.get_stats()
+        self.assertEqual(stats["success_count"], 2)
+        self.assertEqual(stats["failure_count"], 1)
+        self.assertAlmostEqual(stats["avg_copilot_response_time"], 3.0)
+        self.assertEqual(stats["by_improvement_type"]["docs"]["max_copilot_response_time"], 4.0)
+        with log.pool.reader() as conn:
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertIn("idx_executions_status", indexes)
+        self.assertIn("idx_executions_timestamp", indexes)
+        self.assertIn("idx_executions_improvement_type", indexes)
+
+    def test_rollup_matches_full_scan(self):
+        log = ExecutionLog(self.db_path)
+        samples = [("success", "feature", 1.0), ("success", "refactor", None),
+                   ("failure", "feature", 3.5), ("success", "feature", 0.5)]
+        for status, kind, rt in samples:
+            log.log_execution(status, None, kind, rt, None)
+        stats = log.get_stats()
+        self.assertEqual(stats["success_count"], 3)
+        self.assertEqual(stats["failure_count"], 1)
+        self.assertAlmostEqual(stats["avg_copilot_response_time"], 5.0 / 3)
+        feature = stats["by_improvement_type"]["feature"]
+        self.assertEqual(feature["count"], 3)
+        self.assertEqual(feature["min_copilot_response_time"], 0.5)
+        self.assertEqual(feature["max_copilot_response_time"], 3.5)
+        self.assertIsNone(stats["by_improvement_type"]["refactor"]["avg_copilot_response_time"])
+
+    def test_reopening_does_not_reapply_migrations(self):
+        ExecutionLog(self.db_path).close()
+        log = ExecutionLog(self.db_path)
+        with log.pool.reader() as conn:
+            versions = [row[0] for row in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        self.assertEqual(versions, list(range(1, LATEST_VERSION + 1)))
+
+
+class TestExecutionAnalytics(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.log = ExecutionLog(os.path.join(self.tmpdir, "execution_log.db"))
+        rows = []
+        for i in range(1, 101):
+            rows.append(("2024-05-01T10:%02d:00" % (i % 60), "success" if i % 10 else "failure",
+                         None, "feature", float(i), None))
+        rows.append(("2024-05-01T11:00:00", "success", None, "docs", 7.0, None))
+        rows.append(("2024-05-02T09:00:00", "failure", None, "feature", None, "boom"))
+        self.log.insert_many(rows)
+
+    def tearDown(self):
+        self.log.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_hourly_percentiles_use_nearest_rank(self):
+        buckets = ExecutionAnalytics(self.log).buckets("hour", improvement_type="feature")
+        self.assertEqual([b["bucket"] for b in buckets], ["2024-05-01T10", "2024-05-02T09"])
+        first = buckets[0]
+        self.assertEqual(first["total"], 100)
+        self.assertEqual(first["success_count"], 90)
+        self.assertEqual(first["failure_count"], 10)
+        self.assertEqual(first["p50_copilot_response_time"], 50.0)
+        self.assertEqual(first["p90_copilot_response_time"], 90.0)
+        self.assertEqual(first["p99_copilot_response_time"], 99.0)
+        self.assertIsNone(buckets[1]["p50_copilot_response_time"])
+
+    def test_daily_buckets_and_time_range(self):
+        analytics = ExecutionAnalytics(self.log)
+        days = analytics.buckets("day")
+        self.assertEqual([(b["bucket"], b["total"]) for b in days], [("2024-05-01", 101), ("2024-05-02", 1)])
+        ranged = analytics.buckets("day", since="2024-05-01T11:00:00", until="2024-05-02")
+        self.assertEqual([(b["bucket"], b["total"]) for b in ranged], [("2024-05-01", 1)])
+
+    def test_endpoint_rejects_unknown_granularity(self):
+        client = app.test_client()
+        self.assertEqual(client.get("/api/analytics?granularity=week").status_code, 400)
+        body = client.get("/api/analytics?granularity=day&improvement_type=docs").get_json()
+        self.assertEqual(body["buckets"][0]["p99_copilot_response_time"], 7.0)
+
+
+class TestExecutionPagination(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.log = ExecutionLog(os.path.join(self.tmpdir, "execution_log.db"))
+        self.log.insert_many([
+            ("2024-05-01T10:%02d:00" % i, "failure" if i % 3 == 0 else "success", "x.py", "feature", 1.0, None)
+            for i in range(25)
+        ])
+
+    def tearDown(self):
+        self.log.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_walks_backwards_and_forwards_with_cursors(self):
+        first = self.log.get_executions_page(limit=10)
+        self.assertEqual([r["id"] for r in first["executions"]], list(range(25, 15, -1)))
+        self.assertIsNone(first["prev_cursor"])
+        second = self.log.get_executions_page(limit=10, before=first["next_cursor"])
+        self.assertEqual([r["id"] for r in second["executions"]], list(range(15, 5, -1)))
+        last = self.log.get_executions_page(limit=10, before=second["next_cursor"])
+        self.assertEqual([r["id"] for r in last["executions"]], list(range(5, 0, -1)))
+        self.assertIsNone(last["next_cursor"])
+        back = self.log.get_executions_page(limit=10, after=last["prev_cursor"])
+        self.assertEqual(back["executions"], second["executions"])
+
+    def test_endpoint_validates_cursors(self):
+        client = app.test_client()
+        page = client.get("/api/executions?limit=5&before=10").get_json()
+        self.assertEqual([r["id"] for r in page["executions"]], [9, 8, 7, 6, 5])
+        bad_before = client.get("/api/executions?before=abc")
+        self.assertEqual(bad_before.status_code, 400)
+        self.assertEqual(bad_before.get_json(), {"error": "before must be an integer."})
+        bad_after = client.get("/api/executions?after=1.5")
+        self.assertEqual(bad_after.status_code, 400)
+        self.assertEqual(bad_after.get_json(), {"error": "after must be an integer."})
+        both = client.get("/api/executions?before=10&after=2")
+        self.assertEqual(both.status_code, 400)
+        self.assertIn("not both", both.get_json()["error"])
+
+    def test_filters_apply_to_pages_and_stream(self):
+        page = self.log.get_executions_page(limit=100, status="failure", since="2024-05-01T10:10:00")
+        self.assertEqual([r["id"] for r in page["executions"]], [25, 22, 19, 16, 13])
+        streamed = list(self.log.iter_executions(status="failure", chunk_size=2))
+        self.assertEqual([r["id"] for r in streamed], [1, 4, 7, 10, 13, 16, 19, 22, 25])
+
+    def test_export_endpoint_streams_csv(self):
+        response = app.test_client().get("/api/executions/export?format=csv&status=failure")
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(lines[0], ",".join(ExecutionLog.EXECUTION_FIELDS))
+        self.assertEqual(len(lines), 10)
+        bad = app.test_client().get("/api/executions/export?format=xml")
+        self.assertEqual(bad.status_code, 400)
+
+    def test_dashboard_is_cached_until_rows_change(self):
+        client = app.test_client()
+        first = client.get("/")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["Cache-Control"], "no-cache")
+        etag = first.headers["ETag"]
+        self.assertEqual(client.get("/", headers={"If-None-Match": etag}).status_code, 304)
+
+        self.log.log_execution("success", "y.py", "docs", 2.0, None)
+        changed = client.get("/", headers={"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed.headers["ETag"], etag)
+        self.assertIn("y.py", changed.get_data(as_text=True))
+        self.assertEqual(self.log.change_token(), (26, 26))
+
+
+class TestExecutionRetention(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.log = ExecutionLog(os.path.join(self.tmpdir, "execution_log.db"))
+        self.log.insert_many([
+            ("2024-01-15T00:00:00", "success", None, "docs", 1.0, None),
+            ("2024-01-20T00:00:00", "failure", None, "docs", 9.0, None),
+            ("2024-02-03T00:00:00", "success", None, "feature", 2.0, None),
+            ("2099-01-01T00:00:00", "success", None, "feature", 4.0, None),
+            ("2099-01-02T00:00:00", "success", None, "feature", 5.0, None),
+        ])
+
+    def tearDown(self):
+        self.log.close()
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_archives_by_age_into_monthly_partitions(self):
+        manager = RetentionManager(self.log, RetentionPolicy(max_age_days=30))
+        self.assertEqual(manager.run_once(), 3)
+        self.assertEqual(sorted(p.name for p in list_archives(self.log.archive_dir)),
+                         ["executions-2024-01.db", "executions-2024-02.db"])
+        self.assertEqual([r["id"] for r in self.log.get_recent_executions()], [5, 4])
+        self.assertEqual([r["id"] for r in self.log.get_recent_executions(include_archived=True)], [5, 4, 3, 2, 1])
+        self.assertEqual(manager.run_once(), 0)
+
+    def test_stats_span_archives_when_asked(self):
+        RetentionManager(self.log, RetentionPolicy(max_rows=2)).apply()
+        live = self.log.get_stats()
+        self.assertEqual(live["success_count"], 2)
+        self.assertEqual(live["failure_count"], 0)
+        self.assertAlmostEqual(live["avg_copilot_response_time"], 4.5)
+        self.assertNotIn("docs", live["by_improvement_type"])
+        everything = self.log.get_stats(include_archived=True)
+        self.assertEqual(everything["success_count"], 4)
+        self.assertEqual(everything["failure_count"], 1)
+        self.assertAlmostEqual(everything["avg_copilot_response_time"], 21.0 / 5)
+        self.assertEqual(everything["by_improvement_type"]["docs"]["max_copilot_response_time"], 9.0)
+
+    def test_moves_in_chunks(self):
+        manager = RetentionManager(self.log, RetentionPolicy(max_rows=1), chunk_size=1)
+        with mock.patch.object(manager, "_copy_chunk", wraps=manager._copy_chunk) as copy:
+            self.assertEqual(manager.apply(), 4)
+        self.assertEqual(copy.call_count, 4)
+        self.assertEqual(self.log.get_stats(include_archived=True)["success_count"], 4)
+
+    def test_crash_after_archive_commit_is_finished_by_next_pass(self):
+        manager = RetentionManager(self.log, RetentionPolicy(max_age_days=30))
+        with mock.patch.object(manager, "_delete_chunk", side_effect=sqlite3.OperationalError("disk I/O error")):
+            with self.assertRaises(sqlite3.OperationalError):
+                manager.apply()
+        self.assertEqual(len(self.log.get_recent_executions()), 5)
+        archive = sqlite3.connect(os.path.join(str(self.log.archive_dir), "executions-2024-01.db"))
+        self.assertEqual(archive.execute("SELECT id FROM executions ORDER BY id").fetchall(), [(1,), (2,)])
+        archive.close()
+
+        self.assertEqual(manager.apply(), 3)
+        self.assertEqual([r["id"] for r in self.log.get_recent_executions(include_archived=True)], [5, 4, 3, 2, 1])
+        everything = self.log.get_stats(include_archived=True)
+        self.assertEqual((everything["success_count"], everything["failure_count"]), (4, 1))
+
+    def test_new_databases_support_incremental_vacuum(self):
+        manager = RetentionManager(self.log, RetentionPolicy(max_rows=0))
+        manager.apply()
+        self.assertTrue(manager.vacuum())
+        self.assertEqual(self.log.get_recent_executions(), [])
+
+
+class TestConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmpdir, "pool.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_wal_and_pragmas_are_applied(self):
+        pool = ConnectionPool(self.db_path, synchronous="off", cache_size=-1234, mmap_size=4096)
+        with pool.reader() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            self.assertEqual(conn.execute("PRAGMA synchronous").fetchone()[0], 0)
+            self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -1234)
+        pool.close()
+
+    def test_readers_are_read_only(self):
+        pool = ConnectionPool(self.db_path)
+        with pool.writer() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+        with pool.reader() as conn:
+            with self.assertRaises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO t VALUES (1)")
+        pool.close()
+
+    def test_reader_not_blocked_by_open_write_transaction(self):
+        pool = ConnectionPool(self.db_path, busy_timeout=0.1)
+        with pool.writer() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+        result = []
+        with pool.writer() as conn:
+            conn.execute("INSERT INTO t VALUES (2)")
+            reader = threading.Thread(target=lambda: result.append(self._count(pool)))
+            reader.start()
+            reader.join(5)
+        self.assertEqual(result, [1])
+        self.assertEqual(self._count(pool), 2)
+        pool.close()
+
+    def _count(self, pool):
+        with pool.reader() as conn:
+            return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+
+    def test_rejects_unknown_synchronous_mode(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool(self.db_path, synchronous="sometimes")
+
+
+if __name__ == "__main__":
+    unittest.main()
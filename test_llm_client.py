@@ -0,0 +1,188 @@
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from llm_client import LLMClient, LLMError, Overloaded
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests.append(payload)
+            server.ports.add(self.client_address[1])
+            script = server.script.pop(0) if server.script else None
+        if script == "rate_limited":
+            self._send(429, {"error": {"message": "Rate limit"}}, {"Retry-After": "0.01"})
+            return
+        if script == "bad_request":
+            self._send(400, {"error": {"message": "Invalid model"}})
+            return
+        if server.gate is not None:
+            server.gate.wait(5)
+        prompt = payload["messages"][-1]["content"]
+        if payload.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for word in prompt.split():
+                chunk = {"choices": [{"delta": {"content": word + " "}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+            return
+        self._send(200, {"choices": [{"message": {"content": f" echo: {prompt} "}}]})
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), MockOpenAIHandler)
+        self.lock = threading.Lock()
+        self.requests = []
+        self.ports = set()
+        self.script = []
+        self.gate = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class TestLLMClient(unittest.TestCase):
+    def setUp(self):
+        self.server = MockOpenAIServer()
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.sleeps = []
+        self.client = LLMClient(api_key="test", base_url=self.server.url, timeout=5, sleep=self.sleeps.append)
+
+    def tearDown(self):
+        if self.server.gate is not None:
+            self.server.gate.set()
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_complete_reuses_one_connection(self):
+        for i in range(5):
+            self.assertEqual(self.client.complete(f"hi {i}", model="m"), f"echo: hi {i}")
+        self.assertEqual(len(self.server.ports), 1)
+        self.assertEqual(self.server.requests[0]["model"], "m")
+
+    def test_stream_yields_deltas(self):
+        self.assertEqual("".join(self.client.stream("one two three")), "one two three ")
+        self.assertEqual(self.client.in_flight, 0)
+
+    def test_unstarted_stream_releases_slot_on_close(self):
+        stream = self.client.stream_chat([{"role": "user", "content": "never read"}])
+        self.assertEqual(self.client.stats()["in_flight"], 1)
+        stream.close()
+        self.assertEqual(self.client.stats()["in_flight"], 0)
+        self.assertEqual(list(stream), [])
+        stream.close()
+        self.assertEqual(self.client.stats()["in_flight"], 0)
+
+        self.client.stream_chat([{"role": "user", "content": "dropped"}])
+        self.assertEqual(self.client.stats()["in_flight"], 0)
+
+    def test_rate_limit_retried_with_retry_after(self):
+        self.server.script = ["rate_limited", "rate_limited"]
+        self.assertEqual(self.client.complete("x"), "echo: x")
+        self.assertEqual(self.sleeps, [0.01, 0.01])
+        self.assertEqual(self.client.retries, 2)
+
+    def test_backoff_has_jitter_and_cap(self):
+        delays = [self.client._backoff(attempt, None) for attempt in range(10) for _ in range(20)]
+        self.assertTrue(all(0 <= d <= self.client.backoff_max for d in delays))
+        self.assertGreater(len(set(delays)), 1)
+
+    def test_gives_up_after_max_retries_and_on_client_errors(self):
+        self.server.script = ["rate_limited"] * 4
+        with self.assertRaises(LLMError) as ctx:
+            self.client.complete("x")
+        self.assertEqual(ctx.exception.status, 429)
+        self.server.script = ["bad_request"]
+        with self.assertRaises(LLMError) as ctx:
+            self.client.complete("x")
+        self.assertEqual((ctx.exception.status, str(ctx.exception)), (400, "Invalid model"))
+        self.assertEqual(self.client.in_flight, 0)
+
+    def test_missing_api_key(self):
+        client = LLMClient(api_key=None, base_url=self.server.url)
+        with self.assertRaises(ValueError):
+            client.complete("x")
+        self.assertEqual(client.in_flight, 0)
+
+    def test_queue_limit_sheds_load(self):
+        client = LLMClient(api_key="test", base_url=self.server.url, max_concurrency=1, max_queue=1,
+                           queue_timeout=5)
+        self.server.gate = threading.Event()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.complete("slow"))) for _ in range(2)]
+        for t in threads:
+            t.start()
+        while client.in_flight + client._waiting < 2:
+            threading.Event().wait(0.01)
+        with self.assertRaises(Overloaded) as ctx:
+            client.complete("rejected")
+        self.assertEqual(ctx.exception.retry_after, 5)
+        self.server.gate.set()
+        for t in threads:
+            t.join()
+        self.assertEqual(results, ["echo: slow", "echo: slow"])
+        self.assertEqual(client.rejected, 1)
+        client.close()
+
+
+class TestApiServerUpstream(unittest.TestCase):
+    def setUp(self):
+        import api_server
+        self.api_server = api_server
+        api_server.CONTENT_CACHE.memory.clear()
+        self.http = api_server.app.test_client()
+
+    def test_overloaded_returns_429_with_retry_after(self):
+        with mock.patch.object(self.api_server, "complete_messages", side_effect=Overloaded("busy", 2.5)):
+            response = self.http.post("/api/chat", json={"message": "hi"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["Retry-After"], "3")
+
+    def test_endpoints_use_client_against_mock_server(self):
+        server = MockOpenAIServer()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        client = LLMClient(api_key="test", base_url=server.url)
+        try:
+            with mock.patch.object(self.api_server, "LLM_CLIENT", client):
+                chat = self.http.post("/api/chat", json={"message": "hello"}).get_json()
+                content = self.http.post("/api/generate-content", json={"type": "summary", "topic": "tea"}).get_json()
+        finally:
+            client.close()
+            server.shutdown()
+            server.server_close()
+        self.assertEqual(chat["response"], "echo: hello")
+        self.assertEqual(content, {"result": "echo: Write a concise summary of: tea"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import os
+import shutil
+import tempfile
+import unittest
+from log_index import LogIndex, RUN_MARKER
+from log_stream import LogBroadcaster
+
+
+def _run_line(ts):
+    return f"2024-01-01 00:00:00 - INFO - agent - {RUN_MARKER} - Time: {ts}\n"
+
+
+class TestLogIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "autonomous_agent.log")
+        # A tiny block size exercises lines that straddle block boundaries.
+        self.index = LogIndex(self.path, block_size=16)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _append(self, text):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def _readlines(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return f.readlines()
+
+    def test_missing_log(self):
+        self.assertIsNone(self.index.tail_lines(10))
+        self.assertIsNone(self.index.last_run_time())
+
+    def test_tail_matches_readlines(self):
+        self._append("".join(f"line {i} with some padding\n" for i in range(50)) + "partial")
+        for n in (1, 3, 10, 51, 100):
+            self.assertEqual(self.index.tail_lines(n), self._readlines()[-n:])
+
+    def test_last_run_found_on_first_scan_and_after_appends(self):
+        self._append("noise\n" + _run_line("first") + "more noise\n" * 20)
+        self.assertEqual(self.index.last_run_time(), "first")
+        offset = self.index.offset
+        self._append(_run_line("second") + "tail\n")
+        self.assertEqual(self.index.last_run_time(), "second")
+        self.assertGreater(self.index.offset, offset)
+
+    def test_partial_line_is_parsed_once_complete(self):
+        self._append(_run_line("first"))
+        self.assertEqual(self.index.last_run_time(), "first")
+        line = _run_line("second")
+        self._append(line[:20])
+        self.assertEqual(self.index.last_run_time(), "first")
+        self._append(line[20:])
+        self.assertEqual(self.index.last_run_time(), "second")
+
+    def test_truncation_and_rotation_trigger_rescan(self):
+        self._append(_run_line("old") + "x\n" * 10)
+        self.assertEqual(self.index.last_run_time(), "old")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("fresh\n")
+        self.assertIsNone(self.index.last_run_time())
+        self.assertEqual(self.index.tail_lines(5), ["fresh\n"])
+
+        os.rename(self.path, self.path + ".1")
+        self._append(_run_line("rotated"))
+        self.assertEqual(self.index.last_run_time(), "rotated")
+
+
+class TestLogBroadcaster(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "autonomous_agent.log")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("existing\n")
+        self.broadcaster = LogBroadcaster(
+            LogIndex(self.path), lambda: {"running": False},
+            poll_interval=0.01, heartbeat_interval=0.05
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _append(self, text):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def _next_event(self, stream, kind):
+        for frame in stream:
+            if f"event: {kind}" in frame:
+                return frame
+        self.fail(f"stream ended before a {kind} event")
+
+    def test_streams_status_then_new_lines_with_resumable_ids(self):
+        stream = self.broadcaster.subscribe()
+        self.assertEqual(next(stream), "retry: 3000\n\n")
+        self.assertIn('data: {"running": false}', self._next_event(stream, "status"))
+        self._append("first\nsecond\n")
+        frame = self._next_event(stream, "log")
+        self.assertIn("data: first\ndata: second\n", frame)
+        self.assertNotIn("existing", frame)
+        event_id = frame.split("\n")[0][len("id: "):]
+        stream.close()
+        self.assertEqual(self.broadcaster.subscribers, 0)
+
+        self._append("third\n")
+        resumed = self.broadcaster.subscribe(event_id)
+        frame = self._next_event(resumed, "log")
+        self.assertIn("data: third", frame)
+        self.assertNotIn("second", frame)
+        resumed.close()
+
+    def test_idle_stream_sends_heartbeats(self):
+        stream = self.broadcaster.subscribe()
+        frames = [next(stream) for _ in range(4)]
+        stream.close()
+        self.assertIn(": heartbeat\n\n", frames)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import logging
+import logging.handlers
+import os
+import shutil
+import tempfile
+import time
+import unittest
+import uuid
+import logging_utils
+from logging_utils import RateLimitFilter, SamplingFilter, setup_logger
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _record(msg, level=logging.INFO, args=()):
+    return logging.LogRecord("t", level, __file__, 1, msg, args, None)
+
+
+class TestSetupLogger(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "app.log")
+        self.name = f"test-{uuid.uuid4().hex}"
+
+    def tearDown(self):
+        logging_utils.shutdown_logging()
+        logger = logging.getLogger(self.name)
+        for handler in list(logger.handlers):
+            handler.close()
+            logger.removeHandler(handler)
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _read(self):
+        with open(self.path, encoding="utf-8") as f:
+            return f.read()
+
+    def test_async_mode_writes_through_listener(self):
+        logger = setup_logger(self.name, self.path, async_mode=True)
+        self.assertIsInstance(logger.handlers[0], logging.handlers.QueueHandler)
+        logger.info("hello %s", "world")
+        logging_utils.shutdown_logging()
+        self.assertIn("hello world", self._read())
+
+    def test_async_caller_does_not_wait_for_slow_handler(self):
+        logger = setup_logger(self.name, self.path, async_mode=True)
+        listener = logging_utils._listeners[self.name]
+        original = listener.handlers[-1].emit
+        listener.handlers[-1].emit = lambda record: (time.sleep(0.05), original(record))
+        start = time.perf_counter()
+        for i in range(20):
+            logger.info("message %d", i)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        logging_utils.shutdown_logging()
+        self.assertEqual(self._read().count("message"), 20)
+
+    def test_size_rotation_and_json(self):
+        logger = setup_logger(self.name, self.path, max_bytes=200, backup_count=2, json_format=True)
+        for i in range(20):
+            logger.info("line %d", i)
+        self.assertTrue(os.path.exists(self.path + ".1"))
+        entry = json.loads(self._read().splitlines()[-1])
+        self.assertEqual((entry["level"], entry["logger"], entry["message"]), ("INFO", self.name, "line 19"))
+
+    def test_existing_logger_is_reused(self):
+        first = setup_logger(self.name, self.path)
+        second = setup_logger(self.name, self.path, async_mode=True)
+        self.assertIs(first, second)
+        self.assertEqual(len(second.handlers), 2)
+
+
+class TestFilters(unittest.TestCase):
+    def test_sampling_keeps_fraction_and_all_errors(self):
+        values = iter([0.1, 0.9, 0.2, 0.8])
+        sampler = SamplingFilter(0.5, rng=lambda: next(values))
+        kept = [sampler.filter(_record("x")) for _ in range(4)]
+        self.assertEqual(kept, [True, False, True, False])
+        self.assertTrue(sampler.filter(_record("boom", logging.ERROR)))
+
+    def test_rate_limit_per_template(self):
+        clock = FakeClock()
+        limiter = RateLimitFilter(per_second=2, burst=2, clock=clock)
+        results = [limiter.filter(_record("Analyzing %s", args=(i,))) for i in range(5)]
+        self.assertEqual(results, [True, True, False, False, False])
+        self.assertTrue(limiter.filter(_record("Other template")))
+        clock.now = 1.0
+        record = _record("Analyzing %s", args=("later",))
+        self.assertTrue(limiter.filter(record))
+        self.assertEqual(record.getMessage(), "Analyzing later [3 similar messages suppressed]")
+
+
+if __name__ == "__main__":
+    unittest.main()
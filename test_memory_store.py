@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+from memory_store import MemoryStore
+
+
+class TestMemoryStore(unittest.TestCase):
+    def test_behaves_like_a_list(self):
+        store = MemoryStore()
+        store.append("alpha beta")
+        store.extend(["gamma", "delta gamma"])
+        self.assertEqual(store, ["alpha beta", "gamma", "delta gamma"])
+        self.assertEqual(store.pop(0), "alpha beta")
+        store.remove("gamma")
+        self.assertEqual(store, ["delta gamma"])
+        self.assertEqual(store.search("gamma"), ["delta gamma"])
+        del store[0]
+        self.assertEqual(store.search("gamma"), [])
+        with self.assertRaises(TypeError):
+            store[0:0] = ["x"]
+        with self.assertRaises(TypeError):
+            store.sort()
+
+    def test_search_ranks_by_tf_idf_and_ignores_unrelated(self):
+        store = MemoryStore()
+        store.extend([
+            "database backup finished",
+            "database database index rebuilt",
+            "frontend styles updated",
+            "common database note",
+        ])
+        results = store.search("database index", k=2)
+        self.assertEqual(results[0], "database database index rebuilt")
+        self.assertEqual(len(results), 2)
+        self.assertNotIn("frontend styles updated", store.search("database"))
+        self.assertEqual(store.search("the"), [])
+
+    def test_lru_eviction_keeps_recently_recalled(self):
+        store = MemoryStore(capacity=3)
+        store.extend(["apples", "bananas", "cherries"])
+        store.search("apples")
+        store.append("dates")
+        self.assertEqual(store, ["apples", "cherries", "dates"])
+        self.assertEqual(store.search("bananas"), [])
+        self.assertEqual(store.stats()["evicted"], 1)
+
+    def test_importance_eviction(self):
+        store = MemoryStore(capacity=2, eviction="importance")
+        store.add("keep me", importance=5)
+        store.add("minor detail", importance=0.1)
+        store.add("also important", importance=3)
+        self.assertEqual(store, ["keep me", "also important"])
+        with self.assertRaises(ValueError):
+            MemoryStore(eviction="random")
+
+    def test_persistence_reloads_and_applies_capacity(self):
+        tmpdir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(tmpdir, "memory.db")
+            store = MemoryStore(db_path=path, namespace="agent")
+            store.extend(["one", "two", "three"])
+            store.remove("two")
+            store.close()
+            reloaded = MemoryStore(capacity=1, db_path=path, namespace="agent")
+            self.assertEqual(reloaded, ["three"])
+            reloaded.clear()
+            reloaded.close()
+            self.assertEqual(MemoryStore(db_path=path, namespace="agent"), [])
+        finally:
+            shutil.rmtree(tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from flask import Flask
+import metrics
+from metrics import Registry, render, timed
+
+
+class TestPrimitives(unittest.TestCase):
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_counter_sums_shards_across_threads(self):
+        counter = self.registry.counter("events_total", "Events.", ("kind",))
+        child = counter.labels(kind="a")
+
+        def work():
+            for _ in range(1000):
+                child.inc()
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(child.value, 8000)
+        self.assertIs(counter.labels("a"), child)
+        with self.assertRaises(ValueError):
+            counter.labels("a", "b")
+
+    def test_exited_threads_are_folded_into_totals(self):
+        counter = self.registry.counter("short_lived_total", "Events from short-lived threads.")
+        histogram = self.registry.histogram("short_lived_seconds", "Latency.", buckets=(0.1,))
+
+        def work():
+            counter.inc(2)
+            histogram.observe(0.05)
+
+        for _ in range(20):
+            threads = [threading.Thread(target=work) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        counter.inc()
+        self.assertLessEqual(len(counter.labels()._shards._cells), 1)
+        self.assertLessEqual(len(histogram.labels()._shards._cells), 1)
+        self.assertEqual(counter.labels().value, 401)
+        self.assertIn("short_lived_seconds_count 200", render(self.registry))
+
+    def test_histogram_buckets_are_cumulative_and_inclusive(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            histogram.observe(value)
+        text = render(self.registry)
+        self.assertIn('latency_seconds_bucket{le="0.1"} 2', text)
+        self.assertIn('latency_seconds_bucket{le="1"} 3', text)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4', text)
+        self.assertIn("latency_seconds_count 4", text)
+        self.assertIn("latency_seconds_sum 2.65", text)
+        self.assertIn("# TYPE latency_seconds histogram", text)
+
+    def test_registry_returns_existing_metric(self):
+        first = self.registry.counter("x_total", "X.")
+        self.assertIs(self.registry.counter("x_total", "X."), first)
+        with self.assertRaises(ValueError):
+            self.registry.histogram("x_total", "X.")
+
+    def test_timed_decorator_and_context_manager(self):
+        histogram = self.registry.histogram("op_seconds", "Op.", ("op",))
+        errors = self.registry.counter("op_errors_total", "Op errors.", ("op",))
+
+        @timed(histogram, errors, op="fn")
+        def fn(fail=False):
+            if fail:
+                raise RuntimeError("boom")
+            return 42
+
+        self.assertEqual(fn(), 42)
+        self.assertEqual(fn.__name__, "fn")
+        with self.assertRaises(RuntimeError):
+            fn(fail=True)
+        with timed(histogram.labels("block")):
+            pass
+        self.assertEqual(histogram.labels("fn").snapshot()[2], 2)
+        self.assertEqual(histogram.labels("block").snapshot()[2], 1)
+        self.assertEqual(errors.labels("fn").value, 1)
+
+    def test_callback_metric_and_label_escaping(self):
+        self.registry.callback("cache_entries", "Entries.", "gauge", lambda: {('a"b',): 3, ("skip",): None}, ("level",))
+        text = render(self.registry)
+        self.assertIn('cache_entries{level="a\\"b"} 3', text)
+        self.assertNotIn("skip", text)
+
+    def test_overhead_stays_in_microseconds(self):
+        for name, ns in metrics._benchmark(iterations=2000).items():
+            self.assertLess(ns, 50000, name)
+
+
+class TestEndpoint(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.mkdtemp()
+        cls.env = mock.patch.dict(os.environ, {"TARGET_REPO_PATH": cls.tmpdir})
+        cls.env.start()
+        import sentiment_analysis_api
+        cls.client = sentiment_analysis_api.app.test_client()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.stop()
+        shutil.rmtree(cls.tmpdir, ignore_errors=True)
+
+    def test_routes_are_counted_and_exposed(self):
+        child = metrics.HTTP_REQUESTS.labels("sentiment_api.sentiment_analysis", "POST", 200)
+        before = child.value
+        self.client.post("/api/sentiment-analysis", json={"text": "A lovely day."})
+        self.assertEqual(child.value, before + 1)
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain; version=0.0.4"))
+        text = response.get_data(as_text=True)
+        self.assertIn('http_requests_total{endpoint="sentiment_api.sentiment_analysis",method="POST",status="200"}', text)
+        self.assertIn('http_request_duration_seconds_bucket{endpoint="sentiment_api.sentiment_analysis",le="+Inf"}', text)
+        self.assertIn('sentiment_memo_lookups_total{outcome="misses"}', text)
+
+    def test_instrument_plain_app(self):
+        app = Flask(__name__)
+        metrics.instrument(app)
+
+        @app.route("/missing-thing")
+        def missing():
+            return "no", 404
+
+        app.test_client().get("/missing-thing")
+        self.assertGreaterEqual(metrics.HTTP_REQUESTS.labels("missing", "GET", 404).value, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from flask import Flask, flash, redirect
+from page_cache import PageCache
+
+
+class TestPageCache(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.secret_key = "test"
+        self.page = PageCache("{% for m in get_flashed_messages() %}[{{ m }}]{% endfor %}value={{ value }}")
+        self.state = {"token": 1, "value": "a", "calls": 0}
+
+        def context():
+            self.state["calls"] += 1
+            return {"value": self.state["value"]}
+
+        @self.app.route("/")
+        def index():
+            return self.page.respond(self.state["token"], context)
+
+        @self.app.route("/flash")
+        def with_flash():
+            flash("queued")
+            return redirect("/")
+
+        self.client = self.app.test_client()
+
+    def test_renders_once_per_token(self):
+        first = self.client.get("/")
+        self.assertEqual(first.get_data(as_text=True), "value=a")
+        self.state["value"] = "b"  # same token: served from cache
+        self.assertEqual(self.client.get("/").get_data(as_text=True), "value=a")
+        self.assertEqual(self.state["calls"], 1)
+        not_modified = self.client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.headers["ETag"], first.headers["ETag"])
+
+        self.state["token"] = 2
+        changed = self.client.get("/", headers={"If-None-Match": first.headers["ETag"]})
+        self.assertEqual(changed.status_code, 200)
+        self.assertEqual(changed.get_data(as_text=True), "value=b")
+        self.assertEqual((self.page.renders, self.page.hits, self.page.not_modified), (2, 2, 1))
+
+    def test_template_compiled_once_per_app(self):
+        with self.app.test_request_context("/"):
+            self.assertIs(self.page.template, self.page.template)
+        other = Flask("other")
+        with other.test_request_context("/"):
+            other_template = self.page.template
+        with self.app.test_request_context("/"):
+            self.assertIsNot(other_template, self.page.template)
+
+    def test_pending_flash_bypasses_cache(self):
+        self.client.get("/")
+        flashed = self.client.get("/flash", follow_redirects=True)
+        self.assertEqual(flashed.get_data(as_text=True), "[queued]value=a")
+        self.assertEqual(flashed.headers["Cache-Control"], "no-store")
+        self.assertNotIn("ETag", flashed.headers)
+        self.assertEqual(self.client.get("/").get_data(as_text=True), "value=a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from pathlib import Path
+from repo_status import AgentHeartbeat, AgentLiveness, RepoStatus
+
+
+def git(repo: Path, *args: str) -> str:
+    return subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=Test", "-c", "user.email=test@example.com", *args],
+        capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def expected(repo: Path) -> str:
+    return git(repo, "log", "-1", "--pretty=format:%h %ad %s", "--date=short")
+
+
+@unittest.skipUnless(shutil.which("git"), "git is not installed")
+class TestRepoStatus(unittest.TestCase):
+    def setUp(self):
+        self.repo = Path(tempfile.mkdtemp())
+        git(self.repo, "init", "-q", "-b", "main")
+        self.commit("first commit")
+        self.status = RepoStatus(str(self.repo))
+
+    def tearDown(self):
+        shutil.rmtree(self.repo, ignore_errors=True)
+
+    def commit(self, message: str):
+        git(self.repo, "commit", "-q", "--allow-empty", "-m", message)
+
+    def bump_mtime(self, path: Path):
+        # Guarantee a new stamp even on file systems with coarse timestamps.
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_loose_ref(self):
+        self.assertTrue((self.repo / ".git" / "refs" / "heads" / "main").is_file())
+        with mock.patch.object(RepoStatus, "_git_log") as git_log:
+            self.assertEqual(self.status.last_commit(), expected(self.repo))
+        git_log.assert_not_called()
+
+    def test_packed_refs(self):
+        git(self.repo, "pack-refs", "--all")
+        self.assertFalse((self.repo / ".git" / "refs" / "heads" / "main").exists())
+        with mock.patch.object(RepoStatus, "_git_log") as git_log:
+            self.assertEqual(self.status.last_commit(), expected(self.repo))
+        git_log.assert_not_called()
+
+    def test_detached_head(self):
+        self.commit("second commit")
+        git(self.repo, "checkout", "-q", "--detach", "HEAD~1")
+        self.assertTrue(self.status.last_commit().endswith(" first commit"))
+        self.assertEqual(self.status.last_commit(), expected(self.repo))
+
+    def test_falls_back_to_git_log_for_packed_objects(self):
+        git(self.repo, "gc", "-q")
+        sha = git(self.repo, "rev-parse", "HEAD")
+        self.assertFalse((self.repo / ".git" / "objects" / sha[:2] / sha[2:]).exists())
+        with mock.patch.object(RepoStatus, "_git_log", autospec=True, side_effect=RepoStatus._git_log) as git_log:
+            self.assertEqual(self.status.last_commit(), expected(self.repo))
+            self.assertEqual(self.status.last_commit(), expected(self.repo))
+        self.assertEqual(git_log.call_count, 1)
+
+    def test_cache_refreshes_when_ref_changes(self):
+        with mock.patch.object(RepoStatus, "_read_loose_commit", autospec=True,
+                               side_effect=RepoStatus._read_loose_commit) as read:
+            first = self.status.last_commit()
+            self.assertEqual(self.status.last_commit(), first)
+            self.assertEqual(read.call_count, 1)
+
+            self.commit("second commit")
+            self.bump_mtime(self.repo / ".git" / "refs" / "heads" / "main")
+            self.assertTrue(self.status.last_commit().endswith(" second commit"))
+            self.assertEqual(read.call_count, 2)
+
+    def test_cache_refreshes_when_head_changes(self):
+        git(self.repo, "checkout", "-q", "-b", "feature")
+        self.commit("feature commit")
+        self.assertTrue(self.status.last_commit().endswith(" feature commit"))
+        git(self.repo, "checkout", "-q", "main")
+        self.bump_mtime(self.repo / ".git" / "HEAD")
+        self.assertTrue(self.status.last_commit().endswith(" first commit"))
+
+    def test_not_a_repository(self):
+        self.assertIsNone(RepoStatus(tempfile.gettempdir() + "/missing-repo").last_commit())
+
+
+class TestAgentLiveness(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.path = self.tmpdir / "agent.heartbeat"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def write(self, pid: int, age: float = 0.0):
+        self.path.write_text(json.dumps({"pid": pid, "time": time.time() - age}), encoding="utf-8")
+        mtime = time.time() - age
+        os.utime(self.path, (mtime, mtime))
+
+    def test_fresh_heartbeat(self):
+        self.write(os.getpid())
+        self.assertTrue(AgentLiveness(self.path, cache_ttl=0).is_running())
+
+    def test_stale_heartbeat(self):
+        self.write(os.getpid(), age=60)
+        self.assertFalse(AgentLiveness(self.path, stale_after=30, cache_ttl=0).is_running())
+
+    @unittest.skipIf(os.name == "nt", "pid checks are skipped on Windows")
+    def test_dead_pid(self):
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        self.write(process.pid)
+        self.assertFalse(AgentLiveness(self.path, cache_ttl=0).is_running())
+
+    def test_missing_file(self):
+        self.assertFalse(AgentLiveness(self.path, cache_ttl=0).is_running())
+
+    def test_answer_is_cached(self):
+        liveness = AgentLiveness(self.path, cache_ttl=60)
+        self.assertFalse(liveness.is_running())
+        self.write(os.getpid())
+        self.assertFalse(liveness.is_running())
+
+    def test_heartbeat_context_manager(self):
+        liveness = AgentLiveness(self.path, cache_ttl=0)
+        with AgentHeartbeat(self.path, interval=0.05):
+            self.assertEqual(json.loads(self.path.read_text(encoding="utf-8"))["pid"], os.getpid())
+            self.assertTrue(liveness.is_running())
+        self.assertFalse(self.path.exists())
+        self.assertFalse(liveness.is_running())
+
+
+if __name__ == "__main__":
+    unittest.main()
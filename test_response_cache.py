@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from response_cache import MemoryCache, ResponseCache, SQLiteCache, make_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCacheBackends(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def test_key_normalizes_prompt_but_not_params(self):
+        self.assertEqual(make_key("Write  a Headline", model="m"), make_key("Write a Headline\n", model="m"))
+        self.assertNotEqual(make_key("Write a Headline", model="m"), make_key("write a headline", model="m"))
+        self.assertNotEqual(make_key("x", temperature=0.7), make_key("x", temperature=0.2))
+
+    def test_lru_eviction(self):
+        cache = MemoryCache(max_entries=2, clock=self.clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_ttl_expiry(self):
+        cache = MemoryCache(ttl=10, clock=self.clock)
+        cache.set("a", "value")
+        self.clock.now += 9
+        self.assertEqual(cache.get("a"), "value")
+        self.clock.now += 2
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(len(cache), 0)
+
+    def test_sqlite_survives_restart_and_expires(self):
+        path = os.path.join(self.tmpdir, "cache.db")
+        SQLiteCache(path, ttl=10, clock=self.clock).set("a", {"result": "hi"})
+        reopened = SQLiteCache(path, ttl=10, clock=self.clock)
+        self.assertEqual(reopened.get("a"), {"result": "hi"})
+        self.clock.now += 11
+        self.assertIsNone(reopened.get("a"))
+
+    def test_disk_hit_promoted_to_memory(self):
+        disk = SQLiteCache(os.path.join(self.tmpdir, "cache.db"))
+        disk.set("a", "from disk")
+        cache = ResponseCache(MemoryCache(), disk=disk)
+        self.assertEqual(cache.get_or_compute("a", lambda: self.fail("should not compute")), "from disk")
+        self.assertEqual(cache.memory.get("a"), "from disk")
+
+
+class TestRequestCoalescing(unittest.TestCase):
+    def test_concurrent_identical_requests_share_one_call(self):
+        cache = ResponseCache(MemoryCache())
+        calls = []
+        release = threading.Event()
+
+        def compute():
+            calls.append(1)
+            release.wait(5)
+            return "answer"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute)))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        while cache.coalesced + cache.misses < 8:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["answer"] * 8)
+        self.assertEqual(cache.get_or_compute("k", compute), "answer")
+        stats = cache.stats()
+        self.assertEqual((stats["misses"], stats["coalesced"], stats["hits"]), (1, 7, 1))
+
+    def test_errors_are_not_cached(self):
+        cache = ResponseCache(MemoryCache())
+
+        def boom():
+            raise RuntimeError("upstream down")
+
+        with self.assertRaises(RuntimeError):
+            cache.get_or_compute("k", boom)
+        self.assertEqual(cache.get_or_compute("k", lambda: "ok"), "ok")
+        self.assertEqual(cache.errors, 1)
+
+
+class TestGenerateContentCache(unittest.TestCase):
+    def setUp(self):
+        import api_server
+        self.api_server = api_server
+        self.api_server.CONTENT_CACHE.memory.clear()
+        self.client = api_server.app.test_client()
+
+    def test_identical_requests_hit_cache(self):
+        with mock.patch.object(self.api_server, "complete_prompt", return_value="A headline") as stub:
+            for _ in range(3):
+                response = self.client.post("/api/generate-content", json={"type": "headline", "topic": "Cats"})
+                self.assertEqual(response.get_json(), {"result": "A headline"})
+            self.client.post("/api/generate-content", json={"type": "headline", "topic": "  Cats "})
+        self.assertEqual(stub.call_count, 1)
+        stats = self.client.get("/api/cache-stats").get_json()
+        self.assertGreaterEqual(stats["hits"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from textblob import TextBlob
+import api_server
+import new_feature
+import sentiment_analysis_api
+from sentiment_service import SentimentEngine, label
+
+
+class TestSentimentEngine(unittest.TestCase):
+    TEXTS = [
+        "I love this wonderful library. It is great!",
+        "This is terrible. I hate waiting.",
+        "The meeting is on Tuesday.",
+        "",
+    ]
+
+    def setUp(self):
+        self.engine = SentimentEngine(cache_size=2).warm_up()
+
+    def test_scores_match_textblob(self):
+        for text in self.TEXTS:
+            blob = TextBlob(text).sentiment
+            self.assertEqual(self.engine.scores(text), (blob.polarity, blob.subjectivity))
+
+    def test_memo_hits_and_lru_bound(self):
+        calls = []
+
+        def analyzer(text):
+            calls.append(text)
+            return 0.5, 0.5
+
+        engine = SentimentEngine(cache_size=2, analyzer=analyzer).warm_up()
+        for text in ["a", "a", "b", "c", "a"]:
+            engine.scores(text)
+        self.assertEqual(calls, ["good", "a", "b", "c", "a"])
+        self.assertEqual(engine.cache_info(), {"hits": 1, "misses": 4, "size": 2, "max_size": 2})
+
+    def test_score_many_dedupes_and_keeps_order(self):
+        engine = SentimentEngine().warm_up()
+        texts = [self.TEXTS[0], self.TEXTS[1], self.TEXTS[0], self.TEXTS[2]]
+        results = engine.score_many(texts)
+        self.assertEqual(engine.misses, 3)
+        self.assertEqual(results, [engine.scores(t) for t in texts])
+        self.assertEqual(engine.misses, 3)
+
+    def test_thresholds_preserved_per_entry_point(self):
+        self.assertEqual([label(p, 0.2) for p in (0.25, 0.15, -0.25)], ["positive", "neutral", "negative"])
+        self.assertEqual([label(p, 0) for p in (0.05, 0.0, -0.05)], ["positive", "neutral", "negative"])
+        # Polarity 0.15 and -0.05: each entry point keeps its own threshold.
+        mild, slightly_negative = "It was a fairly normal day", "We had a long day"
+        self.assertEqual(api_server.text_statistics(mild)["sentiment"], "Neutral")
+        self.assertEqual(sentiment_analysis_api.sentiment_scores(mild)["sentiment"], "positive")
+        self.assertEqual(new_feature.analyze_sentiment(mild)["sentiment"], "positive")
+        self.assertEqual(sentiment_analysis_api.sentiment_scores(slightly_negative)["sentiment"], "neutral")
+        self.assertEqual(new_feature.analyze_sentiment(slightly_negative)["sentiment"], "negative")
+
+
+if __name__ == "__main__":
+    unittest.main()
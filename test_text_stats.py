@@ -0,0 +1,86 @@
+import random
+import re
+import unittest
+from text_stats import TextStats, analyze
+
+
+def legacy_stats(text):
+    """The multi-pass implementation analyze_text used before text_stats existed."""
+    words = re.findall(r'\b\w+\b', text)
+    word_count = len(words)
+    para_count = len([p for p in text.split('\n') if p.strip()])
+    sentences = re.split(r'[.!?]+', text)
+    sentences = [s for s in sentences if s.strip()]
+    syllable_count = sum(len(re.findall(r'[aeiouy]+', w, re.I)) for w in words)
+    sentence_count = max(len(sentences), 1)
+    flesch = 206.835 - 1.015 * (word_count / sentence_count) - 84.6 * (syllable_count / max(word_count,1))
+    if flesch >= 60:
+        complexity = "Easy"
+    elif flesch >= 30:
+        complexity = "Medium"
+    else:
+        complexity = "Hard"
+    return {
+        "word_count": word_count,
+        "char_count": len(text),
+        "para_count": para_count,
+        "read_time": round(word_count / 200, 2),
+        "complexity": complexity,
+        "flesch": flesch,
+        "sentence_count": len(sentences),
+        "syllable_count": syllable_count,
+    }
+
+
+ALPHABET = ["a", "e", "y", "b", "Q", "Ü", "é", "1", "_", " ", " ", "\t", "\n", "\n", "\r", ".", "!", "?", ",",
+            "-", "'", " ", " ", "日", "ı"]
+
+
+def random_text(rng, length):
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+class TestTextStats(unittest.TestCase):
+    SAMPLES = [
+        "",
+        "   \n\n  ",
+        "Hello world.",
+        "Hello world. This is a test!\n\nSecond paragraph?? Yes...",
+        "...",
+        "No terminator at the end",
+        "Queueing yearly beautiful rhythm\n- a list item\n- another one",
+        "Tabs\tand\r\nwindows line endings.\r\n",
+        "Ünïcödé wörds, naïve café! 日本語のテキスト。",
+    ]
+
+    def _check(self, text, stats):
+        expected = legacy_stats(text)
+        self.assertEqual({k: stats[k] for k in expected}, expected, repr(text))
+
+    def test_matches_legacy_on_samples(self):
+        for text in self.SAMPLES:
+            self._check(text, analyze(text))
+
+    def test_matches_legacy_on_random_text(self):
+        rng = random.Random(1234)
+        for _ in range(300):
+            text = random_text(rng, rng.randint(0, 200))
+            self._check(text, analyze(text))
+
+    def test_incremental_updates_match_one_shot(self):
+        rng = random.Random(99)
+        for _ in range(200):
+            text = random_text(rng, rng.randint(0, 200))
+            stats = TextStats()
+            position = 0
+            while position < len(text):
+                step = rng.randint(1, 12)
+                stats.update(text[position:position + step])
+                position += step
+                # Reading a result mid-stream must not disturb later updates.
+                self._check(text[:position], stats.result())
+            self._check(text, stats.result())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import copy
+import re
+from typing import Any, Dict, Optional
+
+WORDS_PER_MINUTE = 200
+
+# One scan classifies every non-whitespace run. Words (\w+) and sentence
+# terminators ([.!?]+) are the runs the legacy code split on; "other" covers the
+# remaining punctuation, which still makes a sentence or paragraph non-blank.
+_TOKEN = re.compile(r"(?P<word>\w+)|(?P<term>[.!?]+)|(?P<nl>\n)|(?P<other>[^\w\s.!?]+)")
+_VOWEL_RUN = re.compile(r"[aeiouy]+", re.I)
+
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
+    """Simple Flesch Reading Ease; ``sentences`` and the word divisor are floored at 1."""
+    sentence_count = max(sentences, 1)
+    return 206.835 - 1.015 * (words / sentence_count) - 84.6 * (syllables / max(words, 1))
+
+
+def complexity_label(flesch: float) -> str:
+    if flesch >= 60:
+        return "Easy"
+    elif flesch >= 30:
+        return "Medium"
+    return "Hard"
+
+
+class TextStats:
+    """
+    Word, character, paragraph, sentence and syllable counts gathered in one pass.
+
+    Counts match the previous analyze_text implementation: words are ``\\w+`` runs,
+    paragraphs are non-blank "\\n"-separated lines, sentences are non-blank pieces
+    between runs of ".", "!" or "?", and syllables are vowel groups.
+
+    update() may be called repeatedly with appended text; a token that touches the
+    end of a chunk is held back until the next chunk (or result()) so words split
+    across chunks are counted once. Each character is scanned once overall.
+
+    Args:
+        text (Optional[str]): Initial text.
+    """
+
+    def __init__(self, text: Optional[str] = None):
+        self.chars = 0
+        self.words = 0
+        self.syllables = 0
+        self._paragraphs = 0
+        self._sentences = 0
+        self._in_paragraph = False
+        self._in_sentence = False
+        self._carry = ""
+        if text:
+            self.update(text)
+
+    def _consume(self, text: str, final: bool) -> str:
+        """Apply every complete token in ``text``; return the unfinished tail unless ``final``."""
+        end = len(text)
+        tail = ""
+        for match in _TOKEN.finditer(text):
+            if not final and match.end() == end and match.lastgroup != "nl":
+                end = match.start()
+                tail = text[end:]
+                break
+            kind = match.lastgroup
+            if kind == "word":
+                self.words += 1
+                self._in_paragraph = self._in_sentence = True
+            elif kind == "nl":
+                if self._in_paragraph:
+                    self._paragraphs += 1
+                    self._in_paragraph = False
+            elif kind == "term":
+                self._in_paragraph = True
+                if self._in_sentence:
+                    self._sentences += 1
+                    self._in_sentence = False
+            else:
+                self._in_paragraph = self._in_sentence = True
+        # Vowel groups never cross a word boundary, so one C-level scan of the consumed
+        # text equals the per-word count.
+        self.syllables += len(_VOWEL_RUN.findall(text, 0, end))
+        return tail
+
+    def update(self, chunk: str) -> "TextStats":
+        """Add appended text."""
+        self.chars += len(chunk)
+        self._carry = self._consume(self._carry + chunk, final=False)
+        return self
+
+    def _finished(self) -> "TextStats":
+        if not self._carry:
+            return self
+        done = copy.copy(self)
+        done._consume(self._carry, final=True)
+        done._carry = ""
+        return done
+
+    @property
+    def paragraphs(self) -> int:
+        done = self._finished()
+        return done._paragraphs + done._in_paragraph
+
+    @property
+    def sentences(self) -> int:
+        done = self._finished()
+        return done._sentences + done._in_sentence
+
+    def result(self) -> Dict[str, Any]:
+        """Counts plus reading time, Flesch score and complexity label for the text so far."""
+        done = self._finished()
+        words = done.words
+        flesch = flesch_reading_ease(words, done.sentences, done.syllables)
+        return {
+            "word_count": words,
+            "char_count": done.chars,
+            "para_count": done.paragraphs,
+            "sentence_count": done.sentences,
+            "syllable_count": done.syllables,
+            "read_time": round(words / WORDS_PER_MINUTE, 2),
+            "flesch": flesch,
+            "complexity": complexity_label(flesch)
+        }
+
+
+def analyze(text: str) -> Dict[str, Any]:
+    """One-shot TextStats(text).result()."""
+    return TextStats(text).result()
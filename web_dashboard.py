@@ -1,14 +1,28 @@
 import os
-from flask import Flask, render_template_string, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, Flask, Response, request, redirect, url_for, flash, jsonify
 from pathlib import Path
-import subprocess
 from datetime import datetime
+from agent_jobs import JobManager
+from log_index import LogIndex
+from log_stream import LogBroadcaster
+from page_cache import PageCache
+from repo_status import DEFAULT_REPO_PATH, HEARTBEAT_FILENAME, AgentLiveness, RepoStatus
 
-app = Flask(__name__)
-app.secret_key = os.getenv("DASHBOARD_SECRET_KEY", "supersecret")
+bp = Blueprint("dashboard", __name__)
 
-REPO_PATH = os.getenv("TARGET_REPO_PATH", "C:\\Users\\ylax\\source\\repos\\testgreengithub\\test")
+REPO_PATH = os.getenv("TARGET_REPO_PATH", DEFAULT_REPO_PATH)
 LOG_PATH = Path(REPO_PATH) / "autonomous_agent.log"
+LOG_INDEX = LogIndex(LOG_PATH)
+REPO_STATUS = RepoStatus(REPO_PATH)
+# Not mirrored into LOG_PATH: the agent logs there itself, job output stays in per-job logs.
+# Every run is submitted under the repo path, so single-flight keeps at most one job
+# active and JobManager's max_pending limit never applies here.
+AGENT_JOBS = JobManager(
+    log_dir=Path(REPO_PATH) / "agent_jobs",
+    max_workers=int(os.getenv("AGENT_JOB_WORKERS", "1")),
+    timeout=float(os.getenv("AGENT_JOB_TIMEOUT", "300"))
+)
+AGENT_LIVENESS = AgentLiveness(os.getenv("AGENT_HEARTBEAT_PATH", str(Path(REPO_PATH) / HEARTBEAT_FILENAME)))
 
 DASHBOARD_TEMPLATE = """
 <!DOCTYPE html>
@@ -38,7 +52,7 @@ DASHBOARD_TEMPLATE = """
         <div class="flash">{{ messages[0] }}</div>
       {% endif %}
     {% endwith %}
-    <form method="post" action="{{ url_for('run_agent') }}">
+    <form method="post" action="{{ url_for('.run_agent') }}">
         <button class="btn" type="submit">Run Agent Now</button>
     </form>
     <h2>Recent Log</h2>
@@ -47,107 +61,176 @@ DASHBOARD_TEMPLATE = """
     <button class="btn" onclick="fetchStatus()">Refresh Status</button>
     <pre id="live-status" style="background:#222;color:#b6ffb6;padding:1em;border-radius:8px;"></pre>
     <script>
+        const TAIL_LINES = 10;
+        let liveStatus = {};
+
+        function renderStatus(data) {
+            liveStatus = Object.assign(liveStatus, data);
+            document.getElementById('live-status').textContent =
+                "Agent Running: " + liveStatus.running + "\\n" +
+                "Last Commit: " + liveStatus.last_commit + "\\n" +
+                "Last Run: " + liveStatus.last_run + "\\n" +
+                "Log Tail:\\n" + liveStatus.log_tail;
+        }
+
         function fetchStatus() {
-            fetch('/api/status')
+            fetch('{{ url_for('.api_status') }}')
                 .then(resp => resp.json())
-                .then(data => {
-                    document.getElementById('live-status').textContent =
-                        "Agent Running: " + data.running + "\\n" +
-                        "Last Commit: " + data.last_commit + "\\n" +
-                        "Last Run: " + data.last_run + "\\n" +
-                        "Log Tail:\\n" + data.log_tail;
-                });
+                .then(renderStatus);
         }
-        window.onload = fetchStatus;
+
+        function appendLog(text) {
+            const lines = ((liveStatus.log_tail || "") + text + "\\n").split("\\n");
+            lines.pop();
+            renderStatus({ log_tail: lines.slice(-TAIL_LINES).join("\\n") + "\\n" });
+        }
+
+        window.onload = function () {
+            fetchStatus();
+            if (!window.EventSource) return;
+            // The browser reconnects on its own and resumes via Last-Event-ID.
+            const stream = new EventSource('{{ url_for('.api_stream') }}');
+            stream.addEventListener('status', e => renderStatus(JSON.parse(e.data)));
+            stream.addEventListener('log', e => appendLog(e.data));
+        };
     </script>
 </body>
 </html>
 """
 
 def get_last_commit():
-    try:
-        result = subprocess.run(
-            ["git", "-C", REPO_PATH, "log", "-1", "--pretty=format:%h %ad %s", "--date=short"],
-            capture_output=True, text=True, check=True
-        )
-        return result.stdout.strip()
-    except Exception:
-        return None
+    return REPO_STATUS.last_commit()
 
 def get_last_run_time():
-    if LOG_PATH.exists():
-        with open(LOG_PATH, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-        for line in reversed(lines):
-            if "AUTONOMOUS COMMIT AGENT - EXECUTION STARTED" in line:
-                try:
-                    ts = line.split("Time:")[1].strip()
-                    return ts
-                except Exception:
-                    continue
-    return None
+    return LOG_INDEX.last_run_time()
 
 def get_log_content(lines=40):
-    if LOG_PATH.exists():
-        with open(LOG_PATH, "r", encoding="utf-8") as f:
-            log_lines = f.readlines()[-lines:]
+    log_lines = LOG_INDEX.tail_lines(lines)
+    if log_lines is not None:
         return "<br>".join(line.replace("<", "&lt;").replace(">", "&gt;") for line in log_lines)
     return "No log available."
 
 def get_agent_status():
-    # Check if agent process is running (simple check for demo)
-    try:
-        result = subprocess.run(
-            ["tasklist"], capture_output=True, text=True
-        )
-        running = "autonomous_agent.py" in result.stdout
-    except Exception:
-        running = False
-    return running
+    # The agent touches a heartbeat file while it runs (see repo_status.AgentHeartbeat).
+    return AGENT_LIVENESS.is_running()
 
 def get_log_tail(lines=10):
-    if LOG_PATH.exists():
-        with open(LOG_PATH, "r", encoding="utf-8") as f:
-            log_lines = f.readlines()[-lines:]
+    log_lines = LOG_INDEX.tail_lines(lines)
+    if log_lines is not None:
         return "".join(log_lines)
     return "No log available."
 
-@app.route("/", methods=["GET"])
+def get_live_status():
+    return {
+        "running": get_agent_status(),
+        "last_commit": get_last_commit() or "N/A",
+        "last_run": get_last_run_time() or "N/A"
+    }
+
+DASHBOARD_PAGE = PageCache(DASHBOARD_TEMPLATE)
+
+def dashboard_token():
+    """Log size and mtime plus the HEAD commit: everything the page shows, for a few stat() calls."""
+    try:
+        stat = os.stat(LOG_PATH)
+        log_stamp = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        log_stamp = None
+    return log_stamp, get_last_commit()
+
+@bp.route("/", methods=["GET"])
 def dashboard():
-    return render_template_string(
-        DASHBOARD_TEMPLATE,
-        repo_path=REPO_PATH,
-        last_commit=get_last_commit(),
-        last_run=get_last_run_time(),
-        log_content=get_log_content()
+    return DASHBOARD_PAGE.respond(
+        dashboard_token(),
+        lambda: {
+            "repo_path": REPO_PATH,
+            "last_commit": get_last_commit(),
+            "last_run": get_last_run_time(),
+            "log_content": get_log_content()
+        }
     )
 
-@app.route("/run", methods=["POST"])
+def submit_agent_run():
+    # Keyed on the target repo so two clicks never run the agent against it concurrently.
+    job, created = AGENT_JOBS.submit(
+        REPO_PATH,
+        ["python", "autonomous_agent.py", "once"],
+        cwd=str(Path(__file__).parent)
+    )
+    if created:
+        with open(LOG_PATH, "a", encoding="utf-8") as logf:
+            logf.write(f"\n\n=== Manual run at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} (job {job.id}) ===\n")
+    return job, created
+
+@bp.route("/run", methods=["POST"])
 def run_agent():
     try:
-        # Run the agent once, log output to file
-        with open(LOG_PATH, "a", encoding="utf-8") as logf:
-            logf.write(f"\n\n=== Manual run at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ===\n")
-            subprocess.run(
-                ["python", "autonomous_agent.py", "once"],
-                cwd=Path(__file__).parent,
-                stdout=logf, stderr=logf, timeout=300
-            )
-        flash("Agent run completed.")
+        job, created = submit_agent_run()
+        if created:
+            flash(f"Agent run queued (job {job.id}).")
+        else:
+            flash(f"Agent is already {job.status} (job {job.id}).")
     except Exception as e:
         flash(f"Error running agent: {e}")
-    return redirect(url_for("dashboard"))
+    return redirect(url_for(".dashboard"))
+
+@bp.route("/api/jobs", methods=["GET", "POST"])
+def api_jobs():
+    """
+    GET lists recent agent jobs. POST queues an agent run and returns 202 with the job;
+    if a run for this repo is already queued or running, that job is returned instead.
+    """
+    if request.method == "GET":
+        return jsonify({"jobs": [job.to_dict() for job in AGENT_JOBS.list()]})
+    job, created = submit_agent_run()
+    return jsonify({"job": job.to_dict(), "created": created}), 202
 
-@app.route("/api/status", methods=["GET"])
+@bp.route("/api/jobs/<job_id>", methods=["GET"])
+def api_job(job_id):
+    job = AGENT_JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job."}), 404
+    return jsonify(job.to_dict())
+
+@bp.route("/api/jobs/<job_id>/cancel", methods=["POST"])
+def api_job_cancel(job_id):
+    job = AGENT_JOBS.get(job_id)
+    if job is None:
+        return jsonify({"error": "Unknown job."}), 404
+    cancelled = AGENT_JOBS.cancel(job_id)
+    return jsonify({"cancelled": cancelled, "job": job.to_dict()})
+
+@bp.route("/api/jobs/<job_id>/log", methods=["GET"])
+def api_job_log(job_id):
+    log = AGENT_JOBS.read_log(job_id)
+    if log is None:
+        return jsonify({"error": "Unknown job."}), 404
+    return Response(log, mimetype="text/plain")
+
+@bp.route("/api/status", methods=["GET"])
 def api_status():
-    status = {
-        "running": get_agent_status(),
-        "last_commit": get_last_commit() or "N/A",
-        "last_run": get_last_run_time() or "N/A",
-        "log_tail": get_log_tail(10)
-    }
+    status = get_live_status()
+    status["log_tail"] = get_log_tail(10)
     return jsonify(status)
 
+LOG_BROADCASTER = LogBroadcaster(LOG_INDEX, get_live_status)
+
+@bp.route("/api/stream", methods=["GET"])
+def api_stream():
+    """
+    Server-sent events: "log" events carry newly appended log lines and "status"
+    events carry the live status whenever it changes. Supports Last-Event-ID resume.
+    """
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    return Response(
+        LOG_BROADCASTER.subscribe(last_event_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+app = Flask(__name__)
+app.secret_key = os.getenv("DASHBOARD_SECRET_KEY", "supersecret")
+app.register_blueprint(bp)
+
 if __name__ == "__main__":
-    app.run(port=5050, debug=True)
-This enhancement adds a live status API and dashboard section, allowing users to monitor agent activity, last commit, last run, and recent logs in real time.
\ No newline at end of file
+    app.run(port=5050, debug=True)
\ No newline at end of file
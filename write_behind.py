@@ -0,0 +1,180 @@
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class _FlushMarker:
+    __slots__ = ("event",)
+
+    def __init__(self):
+        self.event = threading.Event()
+
+
+class BatchWriter:
+    """
+    Bounded write-behind queue drained by a background thread.
+
+    Rows are handed to ``write_batch`` in lists of at most ``batch_size`` items.
+    A batch is written as soon as it is full or ``flush_interval`` seconds after
+    its first row was queued, whichever comes first. When ``max_queue`` rows are
+    pending, ``put`` blocks (backpressure) instead of growing memory.
+
+    Args:
+        write_batch (Callable): Called on the writer thread with a list of rows.
+        batch_size (int): Maximum rows per ``write_batch`` call.
+        flush_interval (float): Maximum seconds a queued row waits before being written.
+        max_queue (int): Maximum number of rows buffered in memory.
+        name (str): Name of the writer thread.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Sequence[Any]]], None],
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+        max_queue: int = 10000,
+        name: str = "batch-writer"
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        self._write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self.rows_written = 0
+        self.batches_written = 0
+        self.rows_failed = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def put(self, row: Sequence[Any], timeout: Optional[float] = None):
+        """
+        Queue a row for writing, blocking while the queue is full.
+
+        Raises:
+            RuntimeError: If the writer has been closed.
+            queue.Full: If ``timeout`` elapses before space frees up.
+        """
+        if self._closed:
+            raise RuntimeError("BatchWriter is closed")
+        self._queue.put(row, timeout=timeout)
+
+    def pending(self) -> int:
+        """Approximate number of rows waiting to be written."""
+        return self._queue.qsize()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until every row queued before this call has been written.
+
+        Returns:
+            bool: False if ``timeout`` elapsed first, True otherwise.
+        """
+        if self._closed or not self._thread.is_alive():
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.event.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Write all pending rows and stop the writer thread. Safe to call twice."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _write(self, batch: List[Sequence[Any]]):
+        if not batch:
+            return
+        try:
+            self._write_batch(batch)
+            self.rows_written += len(batch)
+            self.batches_written += 1
+        except Exception:
+            self.rows_failed += len(batch)
+            logger.exception("Failed to write batch of %d rows", len(batch))
+
+    def _run(self):
+        batch: List[Sequence[Any]] = []
+        deadline = 0.0
+        while True:
+            timeout = max(deadline - time.monotonic(), 0) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write(batch)
+                batch = []
+                continue
+
+            if item is _STOP:
+                self._write(batch)
+                return
+            if isinstance(item, _FlushMarker):
+                self._write(batch)
+                batch = []
+                item.event.set()
+                continue
+
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+
+
+def measure_insert_throughput(rows: int = 20000, write_behind: bool = True, db_path: Optional[str] = None) -> float:
+    """
+    Insert ``rows`` synthetic executions through ``ExecutionLog`` and return rows/sec.
+
+    Uses a fresh temporary database unless ``db_path`` is given, through a standalone
+    ExecutionLog so the shared instance is neither used nor closed.
+    """
+    import os
+    import tempfile
+    from autonomous_agent import ExecutionLog
+
+    tmpdir = None
+    if db_path is None:
+        tmpdir = tempfile.mkdtemp(prefix="execlog-bench-")
+        db_path = os.path.join(tmpdir, "execution_log.db")
+
+    log = ExecutionLog.standalone(db_path, write_behind=write_behind)
+    try:
+        start = time.perf_counter()
+        for i in range(rows):
+            log.log_execution(
+                status="success" if i % 5 else "failure",
+                files_changed="a.py,b.py",
+                improvement_type="refactor",
+                copilot_response_time=1.5,
+                error_message=None
+            )
+        log.flush()
+        elapsed = time.perf_counter() - start
+    finally:
+        log.close()
+        if tmpdir:
+            import shutil
+            shutil.rmtree(tmpdir, ignore_errors=True)
+    return rows / elapsed if elapsed else float("inf")
+
+
+# Example usage: compare the per-row path with the write-behind path.
+if __name__ == "__main__":
+    import sys
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    per_row = measure_insert_throughput(count, write_behind=False)
+    batched = measure_insert_throughput(count, write_behind=True)
+    print(f"per-row:      {per_row:,.0f} rows/sec")
+    print(f"write-behind: {batched:,.0f} rows/sec ({batched / per_row:.1f}x)")